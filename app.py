@@ -8,16 +8,34 @@ import eventlet
 eventlet.monkey_patch()
 
 from flask import Flask, render_template, request, jsonify, session, send_from_directory
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import hmac
 import json
 import os
-import threading
+import sys
+import signal
 import time
 from datetime import datetime
-from services.tls_monitor import TLSWebMonitor
+from functools import wraps
 from services.config_manager import ConfigManager
+from services.telemetry import TelemetrySampler
+from services.environment import get_environment
+from services.monitor_registry import MonitorRegistry, DEFAULT_MONITOR_ID, LEGACY_ROOM, monitor_room
+from services.event_feed import event_feed
+from services.checkpoint import save_checkpoint, load_checkpoint, clear_checkpoint
+from services.capture_store import get_capture_store
+from services.evidence_store import get_evidence_store, MIMETYPES
+from services.check_scheduler import CheckScheduler
+from services.browser_pool import get_browser_pool
+from services.browser_contexts import get_shared_chrome
+from services.rate_governor import get_rate_governor
+from services.static_assets import AssetManifest
+from services.profiler import sampling_profiler, collapsed, flamegraph_svg
+from services.memory_tracer import memory_tracer
+from services.temp_janitor import TempJanitor
+from services.network_waterfall import to_har
 
-app = Flask(__name__)
+app = Flask(__name__, static_folder=None)  # Static files are served from the asset manifest below
 app.config['SECRET_KEY'] = 'tls_monitor_secret_key_2024'
 
 # Improve static file serving for production
@@ -39,21 +57,64 @@ socketio = SocketIO(app,
                     socketio_logger=False,
                     async_mode='eventlet' if is_production else 'threading',
                     logger=False,
-                    allow_upgrades=True)
+                    allow_upgrades=True,
+                    http_compression=True,
+                    compression_threshold=512)  # Compress polling payloads; log batches are small
 
-# Global monitor instance and thread tracking
-monitor = None
-monitor_thread = None
+# Registry of monitors by ID; the legacy single-monitor routes use the "default" monitor
 config_manager = ConfigManager()
+check_scheduler = CheckScheduler(max_workers=int(os.environ.get('SCHEDULER_WORKERS', 4)))
+check_scheduler.start()
+monitor_registry = MonitorRegistry(config_manager, socketio, scheduler=check_scheduler)
 
-# Lock to prevent concurrent start/stop operations
-import threading
-monitor_lock = threading.Lock()
+# Background telemetry sampler (cheap fixed-rate samples instead of on-demand scans)
+telemetry_sampler = TelemetrySampler(
+    interval_seconds=float(os.environ.get('TELEMETRY_INTERVAL_SECONDS', 5)),
+    capacity=int(os.environ.get('TELEMETRY_CAPACITY', 720))
+)
+telemetry_sampler.start()
 
-@app.route('/static/<path:filename>')
+# Reclaim temp artifacts left behind by crashed or killed browsers (at startup, then periodically)
+janitor_config = config_manager.get_config().get('temp_janitor', {})
+temp_janitor = TempJanitor(
+    budget_bytes=int(janitor_config.get('budget_megabytes', 64) * 1024 * 1024),
+    interval_seconds=janitor_config.get('interval_minutes', 15) * 60,
+    min_age_seconds=janitor_config.get('min_age_minutes', 10) * 60
+)
+if janitor_config.get('enabled', True):
+    temp_janitor.start()
+
+# Fingerprinted, precompressed static assets (built once at startup)
+asset_manifest = AssetManifest(os.path.join(app.root_path, 'static'))
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """url_for('static', filename='css/style.css') -> /static/css/style.<hash>.css"""
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = asset_manifest.hashed(values['filename'])
+
+@app.route('/static/<path:filename>', endpoint='static')
 def serve_static(filename):
-    """Serve static files with proper MIME types"""
-    return send_from_directory('static', filename)
+    """Serve static files, preferring the precompressed variant the client accepts"""
+    asset, fingerprinted = asset_manifest.lookup(filename)
+    if asset is None:
+        return send_from_directory(os.path.join(app.root_path, 'static'), filename)
+
+    encoding, body, etag = asset.negotiate(request.headers.get('Accept-Encoding'))
+    # Parsed list with weak comparison: W/"x" matches, "x-br" does not match "x"
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(body, mimetype=asset.mimetype)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.headers['ETag'] = etag
+    response.headers['Vary'] = 'Accept-Encoding'
+    if fingerprinted:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # Name changes with content
+    else:
+        response.headers['Cache-Control'] = 'no-cache'  # Unversioned URL: revalidate with the ETag
+    return response
 
 @app.route('/')
 def index():
@@ -93,6 +154,9 @@ def update_config():
     try:
         data = request.get_json()
         config_manager.update_config(data)
+        
+        # Push the new base settings to running monitors
+        monitor_registry.push_config()
         return jsonify({'success': True, 'message': 'Configuration updated successfully'})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -106,10 +170,88 @@ def keep_alive():
         'message': 'TLS Monitor is running'
     })
 
+def require_debug_token(view):
+    """Protect expensive diagnostics with the DEBUG_TOKEN env var (disabled when it is not set)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        expected = os.environ.get('DEBUG_TOKEN')
+        if not expected:
+            return jsonify({'success': False, 'error': 'Set DEBUG_TOKEN to enable this endpoint'}), 403
+        provided = request.headers.get('X-Debug-Token') or request.args.get('token') or ''
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return jsonify({'success': False, 'error': 'Invalid debug token'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/debug/profile')
+@require_debug_token
+def debug_profile():
+    """Sample all thread stacks: ?seconds=10&hz=100&format=collapsed|svg|json"""
+    seconds = request.args.get('seconds', default=10, type=float)
+    hz = request.args.get('hz', default=100, type=float)
+    output_format = request.args.get('format', 'collapsed')
+    result = sampling_profiler.profile(seconds, hz)
+    if result is None:
+        return jsonify({'success': False, 'error': 'A profile is already running'}), 409
+
+    if output_format == 'json':
+        return jsonify({'success': True, **dict(result, stacks=dict(result['stacks'].most_common(500)))})
+    if output_format == 'svg':
+        title = f"{result['samples']} samples over {result['seconds']}s at {result['hz']:g} Hz"
+        response = app.response_class(flamegraph_svg(result['stacks'], title), mimetype='image/svg+xml')
+    else:
+        response = app.response_class(collapsed(result['stacks']), mimetype='text/plain')
+    response.headers['X-Profile-Samples'] = str(result['samples'])
+    response.headers['X-Profile-Overhead-Percent'] = str(result['overhead_percent'])
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/debug/memory', methods=['GET'])
+@require_debug_token
+def debug_memory_status():
+    """tracemalloc state, traced bytes and the snapshots taken so far"""
+    return jsonify({'success': True, 'stats': memory_tracer.get_stats()})
+
+@app.route('/debug/memory/start', methods=['POST'])
+@require_debug_token
+def debug_memory_start():
+    """Start tracemalloc: ?frames=1 (traceback depth per allocation)"""
+    success, message = memory_tracer.start(request.args.get('frames', default=1, type=int))
+    return jsonify({'success': success, 'message': message})
+
+@app.route('/debug/memory/stop', methods=['POST'])
+@require_debug_token
+def debug_memory_stop():
+    """Stop tracemalloc and discard its snapshots"""
+    success, message = memory_tracer.stop()
+    return jsonify({'success': success, 'message': message})
+
+@app.route('/debug/memory/snapshot', methods=['POST'])
+@require_debug_token
+def debug_memory_snapshot():
+    """Take a named snapshot: ?name=before"""
+    success, result = memory_tracer.snapshot(request.args.get('name'))
+    if not success:
+        return jsonify({'success': False, 'error': result}), 400
+    return jsonify({'success': True, 'name': result})
+
+@app.route('/debug/memory/diff', methods=['GET'])
+@require_debug_token
+def debug_memory_diff():
+    """Top allocation sites: ?base=before&other=current&top=25&group_by=lineno|filename|traceback"""
+    base = request.args.get('base')
+    if not base:
+        return jsonify({'success': False, 'error': 'base snapshot name is required'}), 400
+    success, result = memory_tracer.diff(base, request.args.get('other', 'current'),
+                                         request.args.get('top', default=25, type=int),
+                                         request.args.get('group_by', 'lineno'))
+    if not success:
+        return jsonify({'success': False, 'error': result}), 400
+    return jsonify({'success': True, **result})
+
 @app.route('/debug/chrome-discovery')
 def debug_chrome_discovery():
-    """Debug endpoint to discover Chrome installation paths"""
-    import subprocess
+    """Debug endpoint to discover Chrome installation paths (pass ?refresh=1 to re-probe)"""
     debug_info = {
         'timestamp': datetime.now().isoformat(),
         'platform_detection': {},
@@ -120,62 +262,14 @@ def debug_chrome_discovery():
     }
     
     try:
-        # Platform detection
-        debug_info['platform_detection'] = {
-            'RENDER_SERVICE_NAME': os.environ.get('RENDER_SERVICE_NAME'),
-            'KOYEB_SERVICE_NAME': os.environ.get('KOYEB_SERVICE_NAME'), 
-            'RAILWAY_ENVIRONMENT': os.environ.get('RAILWAY_ENVIRONMENT'),
-            'HEROKU_APP_NAME': os.environ.get('HEROKU_APP_NAME'),
-            'PORT': os.environ.get('PORT'),
-            'dockerenv_exists': os.path.exists('/.dockerenv')
-        }
-        
-        # Chrome-related environment variables
-        chrome_env_vars = ['CHROME_BIN', 'GOOGLE_CHROME_BIN', 'CHROME_EXECUTABLE', 'CHROMIUM_BIN']
-        for var in chrome_env_vars:
-            value = os.environ.get(var)
-            debug_info['environment_variables'][var] = {
-                'value': value,
-                'exists': os.path.exists(value) if value else None,
-                'executable': os.access(value, os.X_OK) if value and os.path.exists(value) else None
-            }
-        
-        # Test Chrome commands
-        chrome_commands = ['google-chrome', 'google-chrome-stable', 'chromium-browser', 'chromium', 'chrome']
-        for cmd in chrome_commands:
-            try:
-                # Test version command
-                result = subprocess.run([cmd, '--version'], capture_output=True, text=True, timeout=10)
-                # Find location
-                which_result = subprocess.run(['which', cmd], capture_output=True, text=True, timeout=5)
-                
-                debug_info['command_tests'][cmd] = {
-                    'version_works': result.returncode == 0,
-                    'version_output': result.stdout.strip() if result.returncode == 0 else result.stderr.strip(),
-                    'location': which_result.stdout.strip() if which_result.returncode == 0 else None
-                }
-            except Exception as e:
-                debug_info['command_tests'][cmd] = {'error': str(e)}
-        
-        # Search common Chrome paths
-        chrome_paths = [
-            '/usr/bin/google-chrome',
-            '/usr/bin/google-chrome-stable', 
-            '/usr/bin/chromium-browser',
-            '/usr/bin/chromium',
-            '/opt/google/chrome/chrome',
-            '/snap/bin/chromium',
-            '/app/.chrome-for-testing/chrome-linux64/chrome',
-            '/workspace/.chrome/chrome',
-            '/opt/chrome/chrome'
-        ]
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        environment = get_environment(refresh=refresh)
         
-        for path in chrome_paths:
-            debug_info['file_system_search'][path] = {
-                'exists': os.path.exists(path),
-                'executable': os.access(path, os.X_OK) if os.path.exists(path) else None,
-                'is_file': os.path.isfile(path) if os.path.exists(path) else None
-            }
+        debug_info['environment'] = environment.to_dict()
+        debug_info['platform_detection'] = environment.platform_detection
+        debug_info['environment_variables'] = environment.environment_variables
+        debug_info['command_tests'] = environment.command_tests
+        debug_info['file_system_search'] = environment.file_system_search
         
         # List contents of common directories
         common_dirs = ['/usr/bin', '/opt', '/usr/lib', '/app', '/workspace']
@@ -203,46 +297,33 @@ def debug_chrome_discovery():
 
 @app.route('/debug/system-info')
 def debug_system_info():
-    """Debug endpoint for system information and Chrome process analysis"""
+    """Debug endpoint for static system information plus the latest telemetry sample"""
     try:
         import psutil
         import platform
+        import tempfile
         
+        memory = psutil.virtual_memory()
         debug_info = {
             'system': {
                 'platform': platform.platform(),
                 'architecture': platform.architecture(),
                 'python_version': platform.python_version(),
                 'processor': platform.processor(),
-                'memory_total': psutil.virtual_memory().total,
-                'memory_available': psutil.virtual_memory().available,
+                'memory_total': memory.total,
+                'memory_available': memory.available,
                 'disk_usage': dict(psutil.disk_usage('/')._asdict()) if os.path.exists('/') else 'N/A'
             },
             'processes': {
-                'chrome_processes': [],
-                'total_processes': len(psutil.pids()),
                 'current_user': os.environ.get('USER', 'unknown'),
                 'current_uid': os.getuid() if hasattr(os, 'getuid') else 'N/A',
                 'current_gid': os.getgid() if hasattr(os, 'getgid') else 'N/A'
             },
             'temp_directories': {},
-            'running_services': []
+            'telemetry': telemetry_sampler.latest()
         }
         
-        # Find Chrome processes
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'username']):
-            try:
-                if 'chrome' in proc.info['name'].lower():
-                    debug_info['processes']['chrome_processes'].append({
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'username': proc.info['username'],
-                        'cmdline': ' '.join(proc.info['cmdline'][:5]) + '...' if len(proc.info['cmdline']) > 5 else ' '.join(proc.info['cmdline'])
-                    })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        
-        # Check temp directories
+        # Check temp directories (sizes come from the telemetry sampler)
         temp_dirs = ['/tmp', '/dev/shm', tempfile.gettempdir()]
         for temp_dir in temp_dirs:
             if os.path.exists(temp_dir):
@@ -253,20 +334,8 @@ def debug_system_info():
                         'writable': os.access(temp_dir, os.W_OK),
                         'permissions': oct(stat_info.st_mode),
                         'owner_uid': stat_info.st_uid,
-                        'owner_gid': stat_info.st_gid,
-                        'size': sum(os.path.getsize(os.path.join(temp_dir, f)) for f in os.listdir(temp_dir) if os.path.isfile(os.path.join(temp_dir, f)))
+                        'owner_gid': stat_info.st_gid
                     }
-                    
-                    # List chrome-related files
-                    chrome_files = []
-                    try:
-                        for item in os.listdir(temp_dir):
-                            if 'chrome' in item.lower():
-                                chrome_files.append(item)
-                        debug_info['temp_directories'][temp_dir]['chrome_files'] = chrome_files[:10]  # Limit to 10
-                    except:
-                        debug_info['temp_directories'][temp_dir]['chrome_files'] = 'access_denied'
-                        
                 except Exception as e:
                     debug_info['temp_directories'][temp_dir] = {'error': str(e)}
             else:
@@ -291,136 +360,239 @@ def debug_system_info():
             'message': 'System debug failed'
         })
 
+@app.route('/api/janitor', methods=['GET', 'POST'])
+def temp_janitor_endpoint():
+    """GET: janitor totals and the last sweep report; POST: sweep now"""
+    try:
+        if request.method == 'POST':
+            return jsonify({'success': True, 'report': temp_janitor.sweep()})
+        return jsonify({'success': True, 'stats': temp_janitor.get_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/telemetry', methods=['GET'])
+def get_telemetry():
+    """Get the telemetry time series, downsampled to at most `points` entries"""
+    try:
+        max_points = request.args.get('points', default=120, type=int)
+        since = request.args.get('since', default=None, type=float)
+        return jsonify({
+            'success': True,
+            'sampler': telemetry_sampler.get_info(),
+            'series': telemetry_sampler.get_series(max_points=max_points, since=since)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/api/start-monitoring', methods=['POST'])
 def start_monitoring():
     """Start the TLS monitoring process"""
-    global monitor, monitor_thread
-    
-    # Use lock to prevent concurrent start operations
-    with monitor_lock:
-        try:
-            # Check if monitoring is already running
-            if monitor and monitor.is_running():
-                return jsonify({'success': False, 'error': 'Monitoring is already running'})
-            
-            # Clean up any existing thread
-            if monitor_thread and monitor_thread.is_alive():
-                return jsonify({'success': False, 'error': 'Previous monitoring session is still stopping. Please wait a moment and try again.'})
-            
-            # Force cleanup any existing monitor instance
-            if monitor:
-                try:
-                    monitor.force_stop()
-                except:
-                    pass
-                monitor = None
-                
-            # Clean up thread reference
-            monitor_thread = None
-            
-            config = config_manager.get_config()
-            
-            # Validate configuration before starting
-            is_valid, error_message = config_manager.validate_config(config)
-            if not is_valid:
-                return jsonify({'success': False, 'error': error_message})
-        
-            # Specifically check TLS credentials
-            tls_email = config.get('login_credentials', {}).get('email', '').strip()
-            tls_password = config.get('login_credentials', {}).get('password', '').strip()
-            
-            if not tls_email or not tls_password:
-                return jsonify({
-                    'success': False, 
-                    'error': 'TLS email and password are required. Please fill in your TLS account credentials before starting monitoring.'
-                })
-            
-            monitor = TLSWebMonitor(config, socketio)
-            
-            # Start monitoring in a separate thread
-            monitor_thread = threading.Thread(target=monitor.start_monitoring, daemon=True, name="TLS-Monitor")
-            monitor_thread.start()
-            
-            return jsonify({'success': True, 'message': 'Monitoring started successfully'})
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e)})
+    try:
+        success, message = monitor_registry.start(DEFAULT_MONITOR_ID)
+        if success:
+            return jsonify({'success': True, 'message': message})
+        return jsonify({'success': False, 'error': message})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/api/stop-monitoring', methods=['POST'])
 def stop_monitoring():
     """Stop the TLS monitoring process"""
-    global monitor, monitor_thread
-    
-    try:
-        if not monitor:
-            return jsonify({'success': False, 'error': 'No monitoring process is running'})
-        
-        if not monitor.is_running():
-            return jsonify({'success': False, 'error': 'Monitoring is not currently running'})
-        
-        # Signal the monitor to stop
-        monitor.stop_monitoring()
-        
-        # Wait for the thread to finish (with timeout)
-        if monitor_thread and monitor_thread.is_alive():
-            monitor_thread.join(timeout=10.0)  # Wait up to 10 seconds
-            
-            # If thread is still alive after timeout, force cleanup
-            if monitor_thread.is_alive():
-                # Thread didn't stop gracefully, force cleanup
-                monitor.force_stop()
-                monitor_thread.join(timeout=5.0)  # Wait another 5 seconds
-                
-                if monitor_thread.is_alive():
-                    return jsonify({
-                        'success': False, 
-                        'error': 'Monitoring process is not responding. It may continue running in the background.'
-                    })
-        
-        # Clear references
-        monitor = None
-        monitor_thread = None
-        
-        return jsonify({'success': True, 'message': 'Monitoring stopped successfully'})
-    except Exception as e:
-        # Force cleanup on error
-        if monitor:
-            try:
-                monitor.force_stop()
-            except:
-                pass
-        monitor = None
-        monitor_thread = None
-        return jsonify({'success': False, 'error': f'Error stopping monitoring: {str(e)}'})
+    success, message = monitor_registry.stop(DEFAULT_MONITOR_ID)
+    if success:
+        return jsonify({'success': True, 'message': message})
+    return jsonify({'success': False, 'error': message})
 
 @app.route('/api/status', methods=['GET'])
 def get_status():
     """Get current monitoring status"""
     try:
-        if monitor:
-            instance_id = getattr(monitor, '_instance_id', 'unknown')
-            print(f"[DEBUG] Status check - Monitor instance: {instance_id}")
-            
-            status = {
-                'is_running': monitor.is_running(),
-                'last_check': monitor.get_last_check_time(),
-                'total_checks': monitor.get_total_checks(),
-                'error_count': monitor.get_error_count(),
-                'browser_port': monitor.get_browser_port(),
-                'instance_id': instance_id  # Debug info
-            }
-        else:
-            status = {
-                'is_running': False,
-                'last_check': None,
-                'total_checks': 0,
-                'error_count': 0,
-                'browser_port': None
-            }
-        
+        status = monitor_registry.get_status(DEFAULT_MONITOR_ID)
         return jsonify({'success': True, 'status': status})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/monitors', methods=['GET'])
+def list_monitors():
+    """List all registered monitors with their status"""
+    try:
+        return jsonify({'success': True, 'monitors': monitor_registry.list_status()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/monitors', methods=['POST'])
+def create_monitor():
+    """Create a monitor from {"id": ..., "config": {...overrides}}"""
+    try:
+        data = request.get_json() or {}
+        success, message = monitor_registry.create(data.get('id', ''), data.get('config', {}))
+        if success:
+            return jsonify({'success': True, 'message': message, 'status': monitor_registry.get_status(data['id'])})
+        return jsonify({'success': False, 'error': message})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/monitors/<monitor_id>', methods=['GET'])
+def get_monitor_status(monitor_id):
+    """Get the status of one monitor"""
+    status = monitor_registry.get_status(monitor_id)
+    if status is None:
+        return jsonify({'success': False, 'error': f"Monitor '{monitor_id}' not found"}), 404
+    return jsonify({'success': True, 'status': status})
+
+@app.route('/api/monitors/<monitor_id>', methods=['DELETE'])
+def delete_monitor(monitor_id):
+    """Stop and remove a monitor"""
+    success, message = monitor_registry.remove(monitor_id)
+    if success:
+        return jsonify({'success': True, 'message': message})
+    return jsonify({'success': False, 'error': message})
+
+@app.route('/api/monitors/<monitor_id>/config', methods=['POST'])
+def update_monitor_config(monitor_id):
+    """Merge configuration overrides into one monitor"""
+    try:
+        success, message = monitor_registry.update(monitor_id, request.get_json() or {})
+        if success:
+            return jsonify({'success': True, 'message': message})
+        return jsonify({'success': False, 'error': message})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/monitors/<monitor_id>/start', methods=['POST'])
+def start_monitor(monitor_id):
+    """Start one monitor"""
+    try:
+        success, message = monitor_registry.start(monitor_id)
+        if success:
+            return jsonify({'success': True, 'message': message})
+        return jsonify({'success': False, 'error': message})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/monitors/<monitor_id>/stop', methods=['POST'])
+def stop_monitor(monitor_id):
+    """Stop one monitor"""
+    success, message = monitor_registry.stop(monitor_id)
+    if success:
+        return jsonify({'success': True, 'message': message})
+    return jsonify({'success': False, 'error': message})
+
+@app.route('/api/scheduler', methods=['GET'])
+def get_scheduler_stats():
+    """Get central scheduler lag and throughput statistics"""
+    try:
+        return jsonify({'success': True, 'scheduler': check_scheduler.get_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/browser-pool', methods=['GET'])
+def get_browser_pool_stats():
+    """Get shared browser pool occupancy and reuse statistics"""
+    try:
+        pool = get_browser_pool()
+        if not pool:
+            return jsonify({'success': True, 'enabled': False, 'pool': None})
+        return jsonify({'success': True, 'enabled': True, 'pool': pool.get_stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/browser-contexts', methods=['GET'])
+def get_browser_context_stats():
+    """Get the shared Chrome used by context isolation and its active contexts"""
+    try:
+        chrome = get_shared_chrome()
+        return jsonify({'success': True, 'shared_chrome': chrome.get_stats() if chrome else None})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/rate-governor', methods=['GET'])
+def get_rate_governor_stats():
+    """Get per-host token bucket, concurrency and throttle backoff state"""
+    try:
+        governor = get_rate_governor()
+        return jsonify({'success': True, 'governor': governor.get_stats() if governor else None})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/event-feed', methods=['GET'])
+def get_event_feed_stats():
+    """Get event feed subscriptions and delivery counters"""
+    return jsonify({'success': True, 'feed': event_feed.get_stats()})
+
+@app.route('/api/captures', methods=['GET'])
+def get_captures():
+    """Get recent cycle records with their snapshot hashes"""
+    try:
+        limit = request.args.get('limit', default=50, type=int)
+        store = get_capture_store()
+        return jsonify({'success': True, 'stats': store.get_stats(), 'cycles': store.get_cycles(limit)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/captures/<snapshot_hash>', methods=['GET'])
+def get_capture(snapshot_hash):
+    """Get a stored page snapshot (served as plain text so captured scripts never run)"""
+    html = get_capture_store().get(snapshot_hash)
+    if html is None:
+        return jsonify({'success': False, 'error': 'Snapshot not found'}), 404
+    response = app.response_class(html, mimetype='text/plain')
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # Content-addressed
+    return response
+
+@app.route('/api/static-assets', methods=['GET'])
+def get_static_assets():
+    """Fingerprinted asset names and their sizes per encoding"""
+    return jsonify({'success': True, 'stats': asset_manifest.get_stats()})
+
+@app.route('/api/network', methods=['GET'])
+def get_network_summaries():
+    """Network waterfall summaries of recent check cycles (requires network_capture.enabled)"""
+    try:
+        limit = request.args.get('limit', default=20, type=int)
+        cycles = [cycle for cycle in get_capture_store().get_cycles(1000) if cycle.get('network')]
+        return jsonify({'success': True, 'cycles': [
+            {key: cycle.get(key) for key in ('instance_id', 'cycle', 'started_at', 'finished_at', 'success', 'network')}
+            for cycle in cycles[:limit]
+        ]})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/network/<waterfall_hash>.har', methods=['GET'])
+def get_network_har(waterfall_hash):
+    """A cycle's full request waterfall as a HAR 1.2 file"""
+    stored = get_capture_store().get(waterfall_hash, kind='waterfall')
+    if stored is None:
+        return jsonify({'success': False, 'error': 'Waterfall not found'}), 404
+    try:
+        entries = json.loads(stored)['entries']
+    except (ValueError, KeyError, TypeError):
+        return jsonify({'success': False, 'error': 'Not a network waterfall'}), 404
+    response = jsonify(to_har(entries, title=f"TLS check cycle {waterfall_hash[:12]}"))
+    response.headers['Content-Disposition'] = f'attachment; filename="cycle-{waterfall_hash[:12]}.har"'
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # Content-addressed
+    return response
+
+@app.route('/api/evidence', methods=['GET'])
+def get_evidence_list():
+    """List recent evidence screenshots"""
+    try:
+        limit = request.args.get('limit', default=50, type=int)
+        store = get_evidence_store()
+        return jsonify({'success': True, 'stats': store.get_stats(), 'screenshots': store.list(limit)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/evidence/<name>', methods=['GET'])
+def get_evidence(name):
+    """Get an evidence screenshot"""
+    image = get_evidence_store().get(name)
+    if image is None:
+        return jsonify({'success': False, 'error': 'Screenshot not found'}), 404
+    response = app.response_class(image, mimetype=MIMETYPES[name.rsplit('.', 1)[1]])
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # Content-addressed
+    return response
+
 @app.route('/api/test-notifications', methods=['POST'])
 def test_notifications():
     """Test notification system"""
@@ -428,7 +600,7 @@ def test_notifications():
         data = request.get_json()
         notification_type = data.get('type', 'both')
         
-        config = config_manager.get_config()
+        monitor = monitor_registry.get_monitor(data.get('monitor_id', DEFAULT_MONITOR_ID))
         
         if monitor:
             test_slots = [{
@@ -461,13 +633,74 @@ def test_notifications():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
+    join_room(LEGACY_ROOM)
     emit('connected', {'data': 'Connected to TLS Monitor'})
 
+@socketio.on('subscribe_events')
+def handle_subscribe_events(data):
+    """Switch a client to server-side filtered events: {monitor_ids, kinds, min_level, important_only, compact}"""
+    old_rooms, rooms = event_feed.subscribe(request.sid, data or {}, monitor_registry.ids())
+    leave_room(LEGACY_ROOM)
+    for room in old_rooms:
+        leave_room(room)
+    for room in rooms:
+        join_room(room)
+    emit('events_subscribed', {'rooms': len(rooms), 'compact': bool((data or {}).get('compact'))})
+
+@socketio.on('subscribe_monitor')
+def handle_subscribe_monitor(data):
+    """Join the room that receives one monitor's events"""
+    monitor_id = (data or {}).get('monitor_id')
+    if monitor_id in monitor_registry.ids():
+        join_room(monitor_room(monitor_id))
+        emit('subscribed', {'monitor_id': monitor_id})
+
+@socketio.on('unsubscribe_monitor')
+def handle_unsubscribe_monitor(data):
+    """Leave a monitor's event room"""
+    monitor_id = (data or {}).get('monitor_id')
+    if monitor_id:
+        leave_room(monitor_room(monitor_id))
+
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
+    event_feed.unsubscribe(request.sid)
     print('Client disconnected')
 
+_shutdown_started = False
+
+def drain_and_exit():
+    """Drain in-flight checks, checkpoint running monitors and exit the process"""
+    try:
+        states = monitor_registry.drain(float(os.environ.get('SHUTDOWN_DRAIN_SECONDS', 20)))
+        if states:
+            path = save_checkpoint(states)
+            print(f"[SHUTDOWN] Checkpointed {len(states)} monitor(s) to {path}")
+    except Exception as e:
+        print(f"[SHUTDOWN] Drain failed: {e}")
+    finally:
+        sys.stdout.flush()
+        os._exit(0)  # sys.exit would only end this green thread
+
+def handle_shutdown(signum, frame):
+    """SIGTERM: hand the drain to a green thread; blocking here would stall the eventlet hub"""
+    global _shutdown_started
+    if _shutdown_started:
+        return
+    _shutdown_started = True
+    print("[SHUTDOWN] Termination requested - draining monitors...")
+    eventlet.spawn(drain_and_exit)
+
+def resume_from_checkpoint():
+    """Restart the monitors that were running when the previous process was terminated"""
+    states = load_checkpoint(max_age_seconds=float(os.environ.get('CHECKPOINT_MAX_AGE_SECONDS', 3600)))
+    clear_checkpoint()
+    for monitor_id, state in (states or {}).items():
+        if state.get('running') and monitor_id in monitor_registry.ids():
+            success, message = monitor_registry.start(monitor_id, resume_state=state)
+            print(f"[RESUME] {monitor_id}: {message}")
+
 if __name__ == '__main__':
     print("Starting TLS Web Monitor...")
     
@@ -476,8 +709,16 @@ if __name__ == '__main__':
     host = '0.0.0.0'
     
     print(f"Access the dashboard at: http://localhost:{port}")
+    
+    # Probe the environment once so Chrome discovery and driver setup reuse the result
+    environment = get_environment()
+    print(f"Detected platform: {environment.platform} (Chrome: {environment.chrome_binary or 'not found'})")
     print("Using eventlet server for production compatibility")
     
+    # Checkpoint on redeploy/restart and pick up where the previous process left off
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    resume_from_checkpoint()
+    
     # Run with eventlet for production compatibility
     socketio.run(app, 
                 host=host, 
@@ -0,0 +1,749 @@
+"""
+Browser Backends for TLS Web Monitor
+Common selector-based interface over Selenium/SeleniumBase and native Chrome DevTools
+
+Selectors are CSS by default; pass by='xpath' for XPath. Scripts passed to
+evaluate() use Selenium's execute_script conventions (a function body that
+reads `arguments` and uses `return`) on every backend.
+"""
+
+import os
+import json
+import base64
+import time
+import itertools
+import threading
+import subprocess
+import urllib.request
+from urllib.parse import urlparse
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+# Check if websocket-client is available (installed as a Selenium dependency)
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+BACKEND_NAMES = ('auto', 'selenium', 'seleniumbase', 'cdp')
+
+_COUNT_JS = """
+const [sel, by] = arguments;
+if (by === 'xpath') {
+    return document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+}
+return document.querySelectorAll(sel).length;
+"""
+
+# Describes the first match of each query; with scroll, scrolls it to the viewport centre first
+_PROBE_JS = """
+const [queries, scroll] = arguments;
+const find = (sel, by) => by === 'xpath'
+    ? document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null)
+    : document.querySelectorAll(sel);
+const result = {url: location.href, title: document.title, ready: document.readyState, elements: {}};
+for (const [name, sel, by] of queries) {
+    const found = find(sel, by);
+    const count = by === 'xpath' ? found.snapshotLength : found.length;
+    const el = count ? (by === 'xpath' ? found.snapshotItem(0) : found[0]) : null;
+    if (!el) { result.elements[name] = {count: 0}; continue; }
+    if (scroll) el.scrollIntoView({block: 'center', inline: 'center'});
+    const rect = el.getBoundingClientRect();
+    const style = window.getComputedStyle(el);
+    result.elements[name] = {
+        count: count,
+        tag: el.tagName.toLowerCase(),
+        text: (el.innerText || el.textContent || '').trim(),
+        visible: rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none',
+        enabled: !el.disabled,
+        parent_tag: el.parentElement ? el.parentElement.tagName.toLowerCase() : null,
+        x: rect.left + rect.width / 2,
+        y: rect.top + rect.height / 2
+    };
+}
+return result;
+"""
+
+# Focuses and clears an input; returns the element (Selenium) or true (CDP, where it cannot be returned by value)
+_FIND_CLEAR_JS = """
+const [sel, by, returnElement] = arguments;
+const el = by === 'xpath'
+    ? document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(sel);
+if (!el) return null;
+el.focus();
+el.value = '';
+el.dispatchEvent(new Event('input', {bubbles: true}));
+return returnElement ? el : true;
+"""
+
+_RECT_JS = """
+const [sel, by] = arguments;
+const el = by === 'xpath'
+    ? document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+    : document.querySelector(sel);
+if (!el) return null;
+const rect = el.getBoundingClientRect();
+if (rect.width === 0 || rect.height === 0) return null;
+return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+"""
+
+
+def _screenshot_params(backend: 'BrowserBackend', selector: Optional[str], by: str, image_format: str,
+                       quality: int) -> Dict:
+    """Page.captureScreenshot parameters, clipped to the element when it is found"""
+    params = {'format': image_format, 'captureBeyondViewport': True}
+    if image_format != 'png':
+        params['quality'] = quality
+    rect = backend.evaluate(_RECT_JS, selector, by) if selector else None
+    if rect:
+        params['clip'] = dict(rect, scale=1)
+    return params
+
+COOKIE_PARAM_KEYS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+
+def _cookie_params(cookies: List[Dict]) -> List[Dict]:
+    """Convert CDP or WebDriver cookie dicts to Network.setCookies parameters"""
+    params = []
+    for cookie in cookies:
+        cookie = dict(cookie)
+        if 'expiry' in cookie:
+            cookie['expires'] = cookie.pop('expiry')  # WebDriver naming
+        params.append({key: cookie[key] for key in COOKIE_PARAM_KEYS if key in cookie})
+    return params
+
+
+def _origin(url: str) -> Optional[str]:
+    """scheme://host[:port] of an http(s) URL, or None"""
+    parsed = urlparse(url or '')
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme in ('http', 'https') and parsed.netloc else None
+
+
+class BrowserBackendError(Exception):
+    """Raised when a browser backend operation fails"""
+
+
+class BrowserBackend:
+    """Interface shared by all browser backends"""
+
+    name = 'base'
+    round_trips = 0  # Commands sent to the browser (a pipelined CDP batch counts once)
+    _visited_origins = frozenset()  # Origins navigated to since the last reset
+
+    def navigate(self, url: str):
+        raise NotImplementedError
+
+    def current_url(self) -> str:
+        raise NotImplementedError
+
+    def title(self) -> str:
+        raise NotImplementedError
+
+    def page_source(self) -> str:
+        raise NotImplementedError
+
+    def evaluate(self, script: str, *args) -> Any:
+        raise NotImplementedError
+
+    def count(self, selector: str, by: str = 'css') -> int:
+        raise NotImplementedError
+
+    def tag_name(self, selector: str, by: str = 'css') -> str:
+        raise NotImplementedError
+
+    def text(self, selector: str, by: str = 'css') -> str:
+        raise NotImplementedError
+
+    def click(self, selector: str, by: str = 'css'):
+        raise NotImplementedError
+
+    def type(self, selector: str, text: str, by: str = 'css'):
+        raise NotImplementedError
+
+    def wait_clickable(self, selector: str, timeout: float = 10, by: str = 'css') -> str:
+        """Wait until the element is visible and enabled, returning its text"""
+        raise NotImplementedError
+
+    def probe(self, queries: Dict[str, Any], wait_for: str = None, timeout: float = 0) -> Dict:
+        """Look up several elements and the page URL/title in one script call
+
+        `queries` maps a name to a CSS selector or a (selector, by) pair. Each
+        element comes back as {count, tag, text, visible, enabled, parent_tag}
+        ({count: 0} when missing). With `wait_for`, polls until that element
+        exists or `timeout` seconds pass.
+        """
+        specs = [[name] + ([query, 'css'] if isinstance(query, str) else list(query)) for name, query in queries.items()]
+        deadline = time.monotonic() + timeout
+        while True:
+            result = self.evaluate(_PROBE_JS, specs)
+            if not wait_for or result['elements'][wait_for]['count'] or time.monotonic() >= deadline:
+                return result
+            time.sleep(0.25)
+
+    def reset(self):
+        """Clear cookies and storage and park on a blank page so the browser can be reused"""
+        raise NotImplementedError
+
+    def _remember_origin(self, url: str):
+        origin = _origin(url)
+        if origin:
+            self._visited_origins = self._visited_origins | {origin}
+
+    def _origins_to_clear(self) -> List[str]:
+        """Origins whose storage reset() clears: those navigated to, the current one and every cookie's domain"""
+        origins = set(self._visited_origins)
+        self._visited_origins = frozenset()
+        try:
+            origins.add(_origin(self.current_url()))
+            for cookie in self.get_cookies():
+                domain = (cookie.get('domain') or '').lstrip('.')
+                if domain:
+                    origins.update((f"https://{domain}", f"http://{domain}"))
+        except Exception:
+            pass  # Best effort; the navigated origins are still cleared
+        origins.discard(None)
+        return sorted(origins)
+
+    def screenshot(self, selector: str = None, by: str = 'css', image_format: str = 'png', quality: int = 80) -> bytes:
+        """Encoded screenshot of the element (or the whole page if it is not found) as png or webp"""
+        raise NotImplementedError
+
+    def get_cookies(self) -> List[Dict]:
+        """All cookies in the browser (every domain), for checkpointing a session"""
+        raise NotImplementedError
+
+    def set_cookies(self, cookies: List[Dict]):
+        """Restore cookies saved by get_cookies"""
+        raise NotImplementedError
+
+    def start_network_capture(self):
+        """Start collecting DevTools Network.* events (discarding any collected before)"""
+        raise NotImplementedError
+
+    def stop_network_capture(self) -> List[Dict]:
+        """Stop collecting and return the Network.* events as [{method, params}, ...]"""
+        raise NotImplementedError
+
+    def is_alive(self, timeout: float = 5) -> bool:
+        """Cheap check that the browser still answers a trivial script within `timeout` seconds"""
+        result = {}
+
+        def probe():
+            try:
+                result['value'] = self.evaluate("return 1;")
+            except Exception:
+                pass
+
+        # A hung driver would block the caller for the full command timeout, so probe off-thread
+        thread = threading.Thread(target=probe, daemon=True, name="Browser-Liveness")
+        thread.start()
+        thread.join(timeout)
+        return result.get('value') == 1
+
+    def root_pid(self) -> Optional[int]:
+        """PID of the process that owns the browser tree (chromedriver or Chrome)"""
+        return None
+
+    def quit(self):
+        raise NotImplementedError
+
+
+class SeleniumBackend(BrowserBackend):
+    """Backend over a Selenium WebDriver or SeleniumBase Driver"""
+
+    def __init__(self, driver, is_seleniumbase: bool = False):
+        self.driver = driver
+        self.is_seleniumbase = is_seleniumbase
+        self.name = 'seleniumbase' if is_seleniumbase else 'selenium'
+        self.round_trips = 0
+
+        # Every WebDriver command (including WebElement ones) goes through driver.execute
+        execute = driver.execute
+
+        def counted_execute(*args, **kwargs):
+            self.round_trips += 1
+            return execute(*args, **kwargs)
+        driver.execute = counted_execute
+
+    def _by(self, by: str):
+        from selenium.webdriver.common.by import By
+        return By.XPATH if by == 'xpath' else By.CSS_SELECTOR
+
+    def navigate(self, url: str):
+        self._remember_origin(url)
+        self.driver.get(url)
+
+    def current_url(self) -> str:
+        return self.driver.current_url
+
+    def title(self) -> str:
+        return self.driver.title
+
+    def page_source(self) -> str:
+        return self.driver.page_source
+
+    def evaluate(self, script: str, *args) -> Any:
+        return self.driver.execute_script(script, *args)
+
+    def count(self, selector: str, by: str = 'css') -> int:
+        return len(self.driver.find_elements(self._by(by), selector))
+
+    def tag_name(self, selector: str, by: str = 'css') -> str:
+        return self.driver.find_element(self._by(by), selector).tag_name
+
+    def text(self, selector: str, by: str = 'css') -> str:
+        return self.driver.find_element(self._by(by), selector).text.strip()
+
+    def click(self, selector: str, by: str = 'css'):
+        element = self.driver.find_element(self._by(by), selector)
+        if self.is_seleniumbase:
+            # UC mode clicks through JS to avoid detection of synthetic pointer events
+            self.driver.execute_script("arguments[0].click();", element)
+        else:
+            element.click()
+
+    def type(self, selector: str, text: str, by: str = 'css'):
+        if self.is_seleniumbase and by == 'css':
+            self.driver.type(selector, text)
+            return
+        # Find and clear in one script call; fall back to find_element (implicit wait) if not there yet
+        element = self.driver.execute_script(_FIND_CLEAR_JS, selector, by, True)
+        if element is None:
+            element = self.driver.find_element(self._by(by), selector)
+            element.clear()
+        element.send_keys(text)
+
+    def wait_clickable(self, selector: str, timeout: float = 10, by: str = 'css') -> str:
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        element = WebDriverWait(self.driver, timeout).until(
+            EC.element_to_be_clickable((self._by(by), selector))
+        )
+        return element.text.strip()
+
+    def screenshot(self, selector: str = None, by: str = 'css', image_format: str = 'png', quality: int = 80) -> bytes:
+        params = _screenshot_params(self, selector, by, image_format, quality)
+        try:
+            return base64.b64decode(self.driver.execute_cdp_cmd('Page.captureScreenshot', params)['data'])
+        except Exception as e:
+            # Non-Chromium drivers: WebDriver screenshots are PNG only
+            if image_format != 'png':
+                raise BrowserBackendError(f"{image_format} screenshots need a Chromium driver: {e}")
+            if 'clip' in params:
+                return self.driver.find_element(self._by(by), selector).screenshot_as_png
+            return self.driver.get_screenshot_as_png()
+
+    def get_cookies(self) -> List[Dict]:
+        try:
+            return self.driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        except Exception:
+            return self.driver.get_cookies()  # Current domain only without CDP
+
+    def set_cookies(self, cookies: List[Dict]):
+        self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': _cookie_params(cookies)})
+
+    def start_network_capture(self):
+        # Needs the goog:loggingPrefs performance capability at launch; drain what is buffered so far
+        try:
+            self.driver.get_log('performance')
+        except Exception as e:
+            raise BrowserBackendError(f"Performance log not enabled for this driver: {e}")
+
+    def stop_network_capture(self) -> List[Dict]:
+        events = []
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message.get('method', '').startswith('Network.'):
+                events.append({'method': message['method'], 'params': message.get('params', {})})
+        return events
+
+    def reset(self):
+        try:
+            self.driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        except Exception:
+            pass
+        try:
+            # localStorage.clear() above only reaches the current origin
+            for origin in self._origins_to_clear():
+                self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            self.driver.delete_all_cookies()
+        self.driver.get('about:blank')
+
+    def root_pid(self) -> Optional[int]:
+        service = getattr(self.driver, 'service', None)
+        process = getattr(service, 'process', None)
+        return process.pid if process else None
+
+    def is_alive(self, timeout: float = 5) -> bool:
+        process = getattr(getattr(self.driver, 'service', None), 'process', None)
+        if process is not None and process.poll() is not None:
+            return False  # chromedriver exited
+        return super().is_alive(timeout)
+
+    def quit(self):
+        self.driver.quit()
+
+
+class CDPConnection:
+    """Chrome DevTools Protocol websocket with id-correlated, pipelined commands"""
+
+    def __init__(self, ws_url: str, connect_timeout: float = 10):
+        if not WEBSOCKET_AVAILABLE:
+            raise BrowserBackendError("websocket-client package is required for the CDP backend")
+        self._ws = websocket.create_connection(ws_url, timeout=connect_timeout, suppress_origin=True)
+        self._ws.settimeout(None)
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self.round_trips = 0  # Waited-for commands; a call_many batch counts once
+        self._reader = threading.Thread(target=self._read_loop, daemon=True, name="CDP-Reader")
+        self._reader.start()
+
+    def _read_loop(self):
+        """Resolve pending commands and dispatch events until the socket closes"""
+        try:
+            while not self._closed:
+                message = json.loads(self._ws.recv())
+                if 'id' in message:
+                    with self._lock:
+                        future = self._pending.pop(message['id'], None)
+                    if future is None:
+                        continue
+                    if 'error' in message:
+                        future.set_exception(BrowserBackendError(message['error'].get('message', 'CDP error')))
+                    else:
+                        future.set_result(message.get('result', {}))
+                elif 'method' in message:
+                    for callback in list(self._listeners.get(message['method'], [])):
+                        try:
+                            callback(message.get('params', {}))
+                        except Exception:
+                            pass
+        except Exception:
+            pass
+        finally:
+            self._closed = True
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(BrowserBackendError("CDP connection closed"))
+
+    def send(self, method: str, params: Dict = None) -> Future:
+        """Send a command without waiting for its result"""
+        if self._closed:
+            raise BrowserBackendError("CDP connection closed")
+        command_id = next(self._ids)
+        future = Future()
+        with self._lock:
+            self._pending[command_id] = future
+        with self._send_lock:
+            self._ws.send(json.dumps({'id': command_id, 'method': method, 'params': params or {}}))
+        return future
+
+    def call(self, method: str, params: Dict = None, timeout: float = 30) -> Dict:
+        """Send a command and wait for its result"""
+        self.round_trips += 1
+        return self.send(method, params).result(timeout=timeout)
+
+    def call_many(self, commands: List[tuple], timeout: float = 30) -> List[Dict]:
+        """Pipeline independent commands: send all, then collect results in order"""
+        self.round_trips += 1
+        futures = [self.send(method, params) for method, params in commands]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def on(self, method: str, callback: Callable[[Dict], None]):
+        """Register a callback for a CDP event"""
+        self._listeners.setdefault(method, []).append(callback)
+
+    def off(self, method: str, callback: Callable[[Dict], None]):
+        """Unregister an event callback"""
+        if callback in self._listeners.get(method, []):
+            self._listeners[method].remove(callback)
+
+    def is_open(self) -> bool:
+        return not self._closed
+
+    def close(self):
+        self._closed = True
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+class CDPBackend(BrowserBackend):
+    """Backend that drives Chrome directly over its DevTools websocket (no chromedriver hop)"""
+
+    name = 'cdp'
+
+    def __init__(self, process: Optional[subprocess.Popen], connection: CDPConnection, port: int,
+                 implicit_wait: float = 10, page_load_timeout: float = 30):
+        self.process = process
+        self.connection = connection
+        self.port = port
+        self.implicit_wait = implicit_wait
+        self.page_load_timeout = page_load_timeout
+        self._network_events = []
+        self._network_listeners = []
+
+    @classmethod
+    def launch(cls, chrome_binary: str, user_data_dir: str, flags: List[str], headless: bool = True,
+               implicit_wait: float = 10, page_load_timeout: float = 30, startup_timeout: float = 30) -> 'CDPBackend':
+        """Start Chrome with remote debugging and attach to its first page target"""
+        process, port = cls.start_chrome(chrome_binary, user_data_dir, flags, headless, startup_timeout)
+        try:
+            connection = CDPConnection(cls._page_ws_url(port))
+        except Exception:
+            process.kill()
+            raise
+
+        backend = cls(process, connection, port, implicit_wait, page_load_timeout)
+        backend.prepare_page()
+        return backend
+
+    @classmethod
+    def start_chrome(cls, chrome_binary: str, user_data_dir: str, flags: List[str], headless: bool = True,
+                     startup_timeout: float = 30) -> tuple:
+        """Start Chrome with remote debugging on a random port; returns (process, port)"""
+        args = [chrome_binary]
+        if headless:
+            args.append('--headless=new')
+        args += [f for f in flags if not f.startswith('--remote-debugging-port')]
+        args += ['--remote-debugging-port=0', '--remote-allow-origins=*', f'--user-data-dir={user_data_dir}', 'about:blank']
+
+        # Own session: the whole Chrome tree can be signalled as one process group
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        try:
+            return process, cls._wait_for_port(process, user_data_dir, startup_timeout)
+        except Exception:
+            process.kill()
+            raise
+
+    def prepare_page(self):
+        """Enable the page domains we rely on and hide navigator.webdriver"""
+        self.connection.call_many([
+            ('Page.enable', {}),
+            ('Page.setLifecycleEventsEnabled', {'enabled': True}),  # navigate() waits for the new document's load
+            ('Runtime.enable', {}),
+            ('Page.addScriptToEvaluateOnNewDocument',
+             {'source': "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"})
+        ])
+
+    @staticmethod
+    def _wait_for_port(process: subprocess.Popen, user_data_dir: str, timeout: float) -> int:
+        """Read the DevTools port Chrome writes to DevToolsActivePort"""
+        port_file = os.path.join(user_data_dir, 'DevToolsActivePort')
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise BrowserBackendError(f"Chrome exited during startup (code {process.returncode})")
+            try:
+                with open(port_file, 'r') as f:
+                    port = f.readline().strip()
+                if port:
+                    return int(port)
+            except (OSError, ValueError):
+                pass
+            time.sleep(0.1)
+        raise BrowserBackendError("Timed out waiting for Chrome DevTools port")
+
+    @property
+    def round_trips(self) -> int:
+        return self.connection.round_trips
+
+    @staticmethod
+    def _browser_ws_url(port: int) -> str:
+        """Websocket URL of the browser-level DevTools target"""
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=10) as response:
+            return json.loads(response.read().decode('utf-8'))['webSocketDebuggerUrl']
+
+    @staticmethod
+    def _page_ws_url(port: int) -> str:
+        """Find the websocket URL of the first page target"""
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/list", timeout=10) as response:
+            targets = json.loads(response.read().decode('utf-8'))
+        for target in targets:
+            if target.get('type') == 'page' and target.get('webSocketDebuggerUrl'):
+                return target['webSocketDebuggerUrl']
+        raise BrowserBackendError("No page target found")
+
+    def evaluate(self, script: str, *args) -> Any:
+        expression = f"(function(){{{script}\n}}).apply(null, {json.dumps(list(args))})"
+        result = self.connection.call('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True
+        }, timeout=self.page_load_timeout)
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            message = details.get('exception', {}).get('description') or details.get('text', 'Script error')
+            raise BrowserBackendError(message)
+        return result.get('result', {}).get('value')
+
+    def navigate(self, url: str):
+        self._remember_origin(url)
+        # Listen before navigating: the load event can arrive before Page.navigate returns. Polling
+        # document.readyState instead could still see 'complete' from the old document.
+        loaded = set()
+        load_event = threading.Event()
+
+        def on_lifecycle(params):
+            if params.get('name') == 'load':
+                loaded.add(params.get('loaderId'))
+                load_event.set()
+
+        self.connection.on('Page.lifecycleEvent', on_lifecycle)
+        try:
+            result = self.connection.call('Page.navigate', {'url': url}, timeout=self.page_load_timeout)
+            if result.get('errorText'):
+                raise BrowserBackendError(f"Navigation failed: {result['errorText']}")
+            loader_id = result.get('loaderId')
+            if not loader_id:
+                return  # Same-document navigation (fragment change): no new document to wait for
+            deadline = time.monotonic() + self.page_load_timeout
+            while loader_id not in loaded:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Page load timed out after {self.page_load_timeout}s: {url}")
+                load_event.wait(remaining)
+                load_event.clear()
+        finally:
+            self.connection.off('Page.lifecycleEvent', on_lifecycle)
+
+    def current_url(self) -> str:
+        return self.evaluate("return location.href;")
+
+    def title(self) -> str:
+        return self.evaluate("return document.title;")
+
+    def page_source(self) -> str:
+        return self.evaluate("return document.documentElement.outerHTML;")
+
+    def _describe(self, selector: str, by: str, scroll: bool = False, clickable: bool = False,
+                  timeout: float = None) -> Dict:
+        """Poll for an element (like Selenium's implicit wait) and return its description"""
+        deadline = time.monotonic() + (self.implicit_wait if timeout is None else timeout)
+        while True:
+            info = self.evaluate(_PROBE_JS, [['target', selector, by]], scroll)['elements']['target']
+            if not info['count']:
+                info = None
+            if info and (not clickable or (info['visible'] and info['enabled'])):
+                return info
+            if time.monotonic() >= deadline:
+                state = 'clickable' if clickable and info else 'found'
+                raise BrowserBackendError(f"Element not {state}: {selector}")
+            time.sleep(0.1)
+
+    def count(self, selector: str, by: str = 'css') -> int:
+        deadline = time.monotonic() + self.implicit_wait
+        while True:
+            found = self.evaluate(_COUNT_JS, selector, by)
+            if found or time.monotonic() >= deadline:
+                return found
+            time.sleep(0.1)
+
+    def tag_name(self, selector: str, by: str = 'css') -> str:
+        return self._describe(selector, by)['tag']
+
+    def text(self, selector: str, by: str = 'css') -> str:
+        return self._describe(selector, by)['text']
+
+    def click(self, selector: str, by: str = 'css'):
+        info = self._describe(selector, by, scroll=True)
+        x, y = info['x'], info['y']
+        # Pointer events are independent commands, so send them in one pipelined batch
+        self.connection.call_many([
+            ('Input.dispatchMouseEvent', {'type': 'mouseMoved', 'x': x, 'y': y}),
+            ('Input.dispatchMouseEvent', {'type': 'mousePressed', 'x': x, 'y': y, 'button': 'left', 'clickCount': 1}),
+            ('Input.dispatchMouseEvent', {'type': 'mouseReleased', 'x': x, 'y': y, 'button': 'left', 'clickCount': 1})
+        ])
+
+    def type(self, selector: str, text: str, by: str = 'css'):
+        self._describe(selector, by, scroll=True)
+        if not self.evaluate(_FIND_CLEAR_JS, selector, by):
+            raise BrowserBackendError(f"Element not found: {selector}")
+        self.connection.call('Input.insertText', {'text': text})
+
+    def wait_clickable(self, selector: str, timeout: float = 10, by: str = 'css') -> str:
+        try:
+            return self._describe(selector, by, clickable=True, timeout=timeout)['text']
+        except BrowserBackendError as e:
+            raise TimeoutError(str(e))
+
+    def screenshot(self, selector: str = None, by: str = 'css', image_format: str = 'png', quality: int = 80) -> bytes:
+        params = _screenshot_params(self, selector, by, image_format, quality)
+        return base64.b64decode(self.connection.call('Page.captureScreenshot', params)['data'])
+
+    def get_cookies(self) -> List[Dict]:
+        return self.connection.call('Network.getAllCookies', {})['cookies']
+
+    NETWORK_EVENTS = ('Network.requestWillBeSent', 'Network.responseReceived',
+                      'Network.loadingFinished', 'Network.loadingFailed')
+
+    def start_network_capture(self):
+        self.stop_network_capture()
+        self._network_events = []
+
+        def collect(method):
+            return lambda params: self._network_events.append({'method': method, 'params': params})
+        self._network_listeners = [(method, collect(method)) for method in self.NETWORK_EVENTS]
+        for method, callback in self._network_listeners:
+            self.connection.on(method, callback)
+        self.connection.call('Network.enable', {})
+
+    def stop_network_capture(self) -> List[Dict]:
+        for method, callback in self._network_listeners:
+            self.connection.off(method, callback)
+        self._network_listeners = []
+        events, self._network_events = self._network_events, []
+        return events
+
+    def set_cookies(self, cookies: List[Dict]):
+        self.connection.call('Network.setCookies', {'cookies': _cookie_params(cookies)})
+
+    def reset(self):
+        try:
+            self.evaluate("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} return true;")
+        except BrowserBackendError:
+            pass
+        self._clear_origin_storage()
+        self.connection.call('Network.clearBrowserCookies', {})
+        self.navigate('about:blank')
+
+    def _clear_origin_storage(self):
+        """Clear every origin's storage (localStorage.clear() only reaches the current one) in one batch"""
+        origins = self._origins_to_clear()
+        if origins:
+            self.connection.call_many([('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+                                       for origin in origins])
+
+    def root_pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def is_alive(self, timeout: float = 5) -> bool:
+        if self.process is not None and self.process.poll() is not None:
+            return False
+        if not self.connection.is_open():
+            return False
+        try:
+            result = self.connection.call('Runtime.evaluate', {'expression': '1', 'returnByValue': True}, timeout=timeout)
+            return result.get('result', {}).get('value') == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        self.connection.close()
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
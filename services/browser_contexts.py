@@ -0,0 +1,135 @@
+"""
+Browser Contexts for TLS Web Monitor
+Runs several accounts in one Chrome process, each in its own browser context
+
+A browser context (created with Target.createBrowserContext) is Chrome's
+incognito-style profile: cookies, storage and cache are private to it, but
+the browser and GPU processes are shared. Each monitor gets a context with a
+single page and drives it through the regular CDP backend, so an extra
+account costs roughly one renderer instead of a whole browser.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from services.browser_backends import BrowserBackendError, CDPBackend, CDPConnection
+
+
+class ContextBackend(CDPBackend):
+    """CDP backend for one page inside a shared Chrome's browser context"""
+
+    name = 'cdp-context'
+
+    def __init__(self, chrome: 'SharedChrome', context_id: str, target_id: str, connection: CDPConnection,
+                 implicit_wait: float = 10, page_load_timeout: float = 30):
+        super().__init__(None, connection, chrome.port, implicit_wait, page_load_timeout)
+        self.chrome = chrome
+        self.context_id = context_id
+        self.target_id = target_id
+
+    def reset(self):
+        try:
+            self.evaluate("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} return true;")
+        except BrowserBackendError:
+            pass
+        self._clear_origin_storage()  # Page-session storage commands act on this context's partition
+        # Cookies are cleared on the browser connection, scoped to this context only
+        self.chrome.connection.call('Storage.clearCookies', {'browserContextId': self.context_id})
+        self.navigate('about:blank')
+
+    def is_alive(self, timeout: float = 5) -> bool:
+        return self.chrome.is_alive() and super().is_alive(timeout)
+
+    def root_pid(self) -> Optional[int]:
+        # The browser process is shared, so per-context memory is not attributable to a process tree
+        return None
+
+    def quit(self):
+        self.connection.close()
+        self.chrome.dispose_context(self.context_id)
+
+
+class SharedChrome:
+    """One headless Chrome process hosting many isolated browser contexts"""
+
+    def __init__(self, chrome_binary: str, flags: List[str], headless: bool = True):
+        self.user_data_dir = tempfile.mkdtemp(prefix=f"chrome_shared_{os.getpid()}_")  # PID lets the janitor tell if it is orphaned
+        try:
+            self.process, self.port = CDPBackend.start_chrome(chrome_binary, self.user_data_dir, flags, headless)
+            self.connection = CDPConnection(CDPBackend._browser_ws_url(self.port))
+        except Exception:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+            raise
+        self._contexts = set()
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'disposed': 0}
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None and self.connection.is_open()
+
+    def new_context(self, implicit_wait: float = 10, page_load_timeout: float = 30) -> ContextBackend:
+        """Create an isolated browser context with one blank page and attach a backend to it"""
+        context_id = self.connection.call('Target.createBrowserContext', {})['browserContextId']
+        try:
+            target_id = self.connection.call('Target.createTarget', {
+                'url': 'about:blank',
+                'browserContextId': context_id
+            })['targetId']
+            connection = CDPConnection(f"ws://127.0.0.1:{self.port}/devtools/page/{target_id}")
+        except Exception:
+            self.connection.send('Target.disposeBrowserContext', {'browserContextId': context_id})
+            raise
+
+        backend = ContextBackend(self, context_id, target_id, connection, implicit_wait, page_load_timeout)
+        backend.prepare_page()
+        with self._lock:
+            self._contexts.add(context_id)
+            self._stats['created'] += 1
+        return backend
+
+    def dispose_context(self, context_id: str):
+        """Close a context and all of its pages"""
+        with self._lock:
+            if context_id not in self._contexts:
+                return
+            self._contexts.discard(context_id)
+            self._stats['disposed'] += 1
+        try:
+            self.connection.call('Target.disposeBrowserContext', {'browserContextId': context_id}, timeout=10)
+        except BrowserBackendError:
+            pass  # Browser already gone
+
+    def close(self):
+        """Quit Chrome and remove its profile directory"""
+        self.connection.close()
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except Exception:
+                self.process.kill()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, active=len(self._contexts), pid=self.process.pid,
+                        port=self.port, alive=self.is_alive())
+
+
+_shared_chrome = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_chrome(chrome_binary: str = None, flags: List[str] = None, headless: bool = True) -> Optional[SharedChrome]:
+    """Get the process-wide shared Chrome, (re)launching it if a binary is given and it is not running"""
+    global _shared_chrome
+    with _shared_lock:
+        if _shared_chrome and not _shared_chrome.is_alive():
+            _shared_chrome.close()
+            _shared_chrome = None
+        if _shared_chrome is None and chrome_binary:
+            _shared_chrome = SharedChrome(chrome_binary, flags or [], headless)
+        return _shared_chrome
@@ -0,0 +1,257 @@
+"""
+Browser Pool for TLS Web Monitor
+Shares a bounded set of Chrome instances between monitors through leases
+
+A monitor leases a browser for one check cycle and returns it afterwards.
+Returned browsers have their cookies and storage reset and stay warm for the
+next lease, so Chrome is launched only when the pool has nothing idle. Idle
+browsers are health-checked in the background and retired by age, lease
+count or memory use.
+"""
+
+import time
+import shutil
+import threading
+from collections import deque
+from typing import Callable, Dict, Optional
+
+# Check if psutil is available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class PooledBrowser:
+    """A launched browser plus the bookkeeping the pool needs to reuse and retire it"""
+
+    def __init__(self, backend, user_data_dir: str = None, is_seleniumbase: bool = False, port: int = None,
+                 process_tree=None):
+        self.backend = backend
+        self.process_tree = process_tree
+        self.user_data_dir = user_data_dir
+        self.is_seleniumbase = is_seleniumbase
+        self.port = port
+        self.created_at = time.monotonic()
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def memory_bytes(self) -> Optional[int]:
+        """RSS of the browser's process tree (None if unknown)"""
+        pid = self.backend.root_pid() if hasattr(self.backend, 'root_pid') else None
+        if not pid or not PSUTIL_AVAILABLE:
+            return None
+        try:
+            root = psutil.Process(pid)
+            return sum(p.memory_info().rss for p in [root] + root.children(recursive=True))
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+    def close(self):
+        """Quit the browser and remove its profile directory"""
+        try:
+            self.backend.quit()
+        except Exception:
+            pass
+        if self.process_tree:
+            self.process_tree.terminate()
+        if self.user_data_dir:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class BrowserPool:
+    def __init__(self, size: int = 2, max_age_seconds: float = 3600, max_leases: int = 50,
+                 max_memory_bytes: int = None, health_interval_seconds: float = 60):
+        self.size = max(1, int(size))
+        self.max_age_seconds = max_age_seconds
+        self.max_leases = max_leases
+        self.max_memory_bytes = max_memory_bytes
+        self.health_interval_seconds = health_interval_seconds
+        self._idle = deque()
+        self._leased = set()
+        self._launching = 0
+        self._checking = 0  # Idle browsers temporarily out of the pool for a health check
+        self._condition = threading.Condition()
+        self._closed = False
+        self._wait_times = deque(maxlen=200)
+        self._stats = {
+            'leases': 0,
+            'hits': 0,
+            'launches': 0,
+            'launch_failures': 0,
+            'lease_timeouts': 0,
+            'retired': {'age': 0, 'leases': 0, 'memory': 0, 'unhealthy': 0, 'reset_failed': 0, 'discarded': 0}
+        }
+        self._health_thread = threading.Thread(target=self._health_loop, daemon=True, name="Browser-Pool-Health")
+        self._health_thread.start()
+
+    def acquire(self, factory: Callable[[], PooledBrowser], timeout: float = 120) -> PooledBrowser:
+        """Lease an idle browser, launching one with `factory` if the pool has room"""
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    browser = self._idle.popleft()
+                    self._stats['hits'] += 1
+                    break
+                if len(self._leased) + self._launching + self._checking < self.size:
+                    self._launching += 1
+                    browser = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['lease_timeouts'] += 1
+                    raise TimeoutError(f"No pooled browser available within {timeout}s")
+                self._condition.wait(timeout=remaining)
+
+        if browser is None:
+            try:
+                browser = factory()
+            except Exception:
+                with self._condition:
+                    self._launching -= 1
+                    self._stats['launch_failures'] += 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._launching -= 1
+                self._stats['launches'] += 1
+
+        with self._condition:
+            self._leased.add(browser)
+            browser.leases += 1
+            self._stats['leases'] += 1
+            self._wait_times.append(time.monotonic() - started)
+        return browser
+
+    def release(self, browser: PooledBrowser, discard: bool = False):
+        """Return a leased browser; it is reset for reuse unless discarded or due for retirement"""
+        reason = 'discarded' if discard else self._retire_reason(browser)
+        if not reason:
+            try:
+                browser.backend.reset()
+            except Exception:
+                reason = 'reset_failed'
+
+        with self._condition:
+            self._leased.discard(browser)
+            browser.last_used = time.monotonic()
+            if reason or self._closed:
+                if reason:
+                    self._stats['retired'][reason] += 1
+            else:
+                self._idle.append(browser)
+            self._condition.notify()
+
+        if reason or self._closed:
+            browser.close()
+
+    def _retire_reason(self, browser: PooledBrowser) -> Optional[str]:
+        """Why a browser should be retired instead of reused, if at all"""
+        if self.max_age_seconds and browser.age_seconds() >= self.max_age_seconds:
+            return 'age'
+        if self.max_leases and browser.leases >= self.max_leases:
+            return 'leases'
+        if self.max_memory_bytes:
+            memory = browser.memory_bytes()
+            if memory is not None and memory >= self.max_memory_bytes:
+                return 'memory'
+        return None
+
+    def _health_loop(self):
+        """Periodically check idle browsers and retire unhealthy or expired ones"""
+        while not self._closed:
+            time.sleep(self.health_interval_seconds)
+            with self._condition:
+                candidates = list(self._idle)
+                self._idle.clear()
+                self._checking = len(candidates)
+
+            keep = []
+            retired = []
+            for browser in candidates:
+                reason = self._retire_reason(browser)
+                if not reason:
+                    try:
+                        if not browser.backend.is_alive():
+                            reason = 'unhealthy'
+                    except Exception:
+                        reason = 'unhealthy'
+                if reason:
+                    retired.append(reason)
+                    browser.close()
+                else:
+                    keep.append(browser)
+
+            with self._condition:
+                for reason in retired:
+                    self._stats['retired'][reason] += 1
+                self._idle.extendleft(reversed(keep))
+                self._checking = 0
+                self._condition.notify_all()
+
+    def close(self):
+        """Quit all idle browsers; leased ones are closed when released"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for browser in idle:
+            browser.close()
+
+    def get_stats(self) -> Dict:
+        """Get pool occupancy, hit rate and lease wait statistics"""
+        with self._condition:
+            waits = sorted(self._wait_times)
+            leases = self._stats['leases']
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'leased': len(self._leased),
+                'launching': self._launching,
+                'leases': leases,
+                'hits': self._stats['hits'],
+                'hit_rate': round(self._stats['hits'] / leases, 3) if leases else None,
+                'launches': self._stats['launches'],
+                'launches_avoided': self._stats['hits'],
+                'launch_failures': self._stats['launch_failures'],
+                'lease_timeouts': self._stats['lease_timeouts'],
+                'retired': dict(self._stats['retired']),
+                'wait_seconds': {
+                    'mean': round(sum(waits) / len(waits), 3) if waits else None,
+                    'max': round(waits[-1], 3) if waits else None
+                }
+            }
+
+
+_pool = None
+_pool_config = None  # Configuration the pool was created with
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(pool_config: Dict = None) -> Optional[BrowserPool]:
+    """Get the process-wide browser pool, creating it from `pool_config` on first use"""
+    global _pool, _pool_config
+    with _pool_lock:
+        if _pool is not None and pool_config is not None and pool_config != _pool_config:
+            print(f"[POOL] Ignoring browser_pool settings {pool_config}: the shared pool was already created "
+                  f"with {_pool_config}; restart to apply them")
+        if _pool is None and pool_config is not None:
+            _pool_config = dict(pool_config)
+            max_memory_mb = pool_config.get('max_memory_mb')
+            _pool = BrowserPool(
+                size=pool_config.get('size', 2),
+                max_age_seconds=pool_config.get('max_age_minutes', 60) * 60,
+                max_leases=pool_config.get('max_leases', 50),
+                max_memory_bytes=max_memory_mb * 1024 * 1024 if max_memory_mb else None,
+                health_interval_seconds=pool_config.get('health_interval_seconds', 60)
+            )
+        return _pool
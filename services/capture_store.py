@@ -0,0 +1,309 @@
+"""
+Capture Store for TLS Web Monitor
+Content-addressed, compressed storage for calendar page snapshots
+
+Snapshots are keyed by the SHA-256 of their HTML, so the identical "no slots"
+pages seen on most cycles are stored once. Entries are gzip-compressed and the
+least recently seen ones are evicted when the store exceeds its byte budget.
+Each check cycle is recorded with the hashes of the snapshots it saw.
+
+Network waterfalls share the budget but are a separate kind with their own
+directory, so tools that replay page snapshots never see them. They are
+evicted before any page snapshot.
+
+A monitor running in process mode writes to the same directory as the web
+server. Every change happens under an exclusive lock on the directory's .lock
+file. Structural changes (a new object, an eviction, a cycle log rewrite) bump
+its .version file; a process that finds a version it did not write reloads its
+index and cycle records from disk. Cycle records appended by other processes
+are read incrementally from where this process last stopped, and dedup hits
+only touch the object's mtime, which eviction re-reads before choosing victims.
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import hashlib
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Check if fcntl is available (not on Windows, where the store is single-process only)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+KINDS = {'page': ('objects', '.html.gz'), 'waterfall': ('waterfalls', '.json.gz')}  # kind -> (directory, suffix)
+EVICTION_ORDER = ('waterfall', 'page')
+
+
+class CaptureStore:
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024, max_cycles: int = 1000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._cycles_path = os.path.join(directory, 'cycles.jsonl')
+        self._lock_path = os.path.join(directory, '.lock')
+        self._version_path = os.path.join(directory, '.version')
+        self._seen_version = None
+        self._cycles_offset = 0  # Bytes of the cycle log already read into _cycles
+        self._lock = threading.Lock()
+        self._cycles = deque(maxlen=max_cycles)
+        self._index = {}  # (kind, hash) -> (size, last_seen)
+        self._total_bytes = 0
+        self._stats = {'puts': 0, 'dedup_hits': 0, 'evictions': 0}
+        self._appended = 0
+
+        for kind_dir, _ in KINDS.values():
+            os.makedirs(os.path.join(directory, kind_dir), exist_ok=True)
+        with self._lock, self._file_lock():
+            self._sync()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared with other processes using the same directory"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_version(self) -> str:
+        try:
+            with open(self._version_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return ''
+
+    def _sync(self):
+        """Catch up with other processes: full reload after a structural change, else read new cycle records (both locks held)"""
+        version = self._read_version()
+        if version != self._seen_version:
+            self._load()
+            self._seen_version = version
+        else:
+            self._read_cycles()
+
+    def _bump(self):
+        """Record that this process changed the store's structure (both locks held)"""
+        version = f"{os.getpid()}-{time.time_ns()}"
+        with open(self._version_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+        self._seen_version = version
+
+    def _load(self):
+        """Rebuild the in-memory index and recent cycle records from disk"""
+        self._index = {}
+        self._total_bytes = 0
+        self._cycles.clear()
+        for kind, (kind_dir, suffix) in KINDS.items():
+            kind_path = os.path.join(self.directory, kind_dir)
+            for prefix in os.listdir(kind_path):
+                prefix_dir = os.path.join(kind_path, prefix)
+                if not os.path.isdir(prefix_dir):
+                    continue
+                for name in os.listdir(prefix_dir):
+                    if not name.endswith(suffix):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(prefix_dir, name))
+                    except OSError:
+                        continue
+                    self._index[(kind, name[:-len(suffix)])] = (stat.st_size, stat.st_mtime)
+                    self._total_bytes += stat.st_size
+
+        self._cycles_offset = 0
+        self._read_cycles()
+
+    def _read_cycles(self):
+        """Append cycle records written since the last read (both locks held)"""
+        try:
+            with open(self._cycles_path, 'rb') as f:
+                f.seek(self._cycles_offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Partial line; read it once it is complete
+                    self._cycles_offset += len(line)
+                    try:
+                        self._cycles.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+
+    def _object_path(self, digest: str, kind: str = 'page') -> str:
+        kind_dir, suffix = KINDS[kind]
+        return os.path.join(self.directory, kind_dir, digest[:2], f"{digest}{suffix}")
+
+    def put(self, text: str, kind: str = 'page') -> str:
+        """Store a page snapshot (or another kind of capture) and return its content hash"""
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        key = (kind, digest)
+        now = time.time()
+
+        with self._lock, self._file_lock():
+            self._sync()
+            self._stats['puts'] += 1
+            path = self._object_path(digest, kind)
+
+            if key in self._index:
+                # Already stored: refresh its recency (on disk too, for other processes' eviction)
+                self._stats['dedup_hits'] += 1
+                size, _ = self._index[key]
+                self._index[key] = (size, now)
+                try:
+                    os.utime(path, (now, now))
+                except OSError:
+                    pass
+                return digest
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(temp_path, path)
+
+            size = os.path.getsize(path)
+            self._index[key] = (size, now)
+            self._total_bytes += size
+            self._enforce_budget(keep=key)
+            self._bump()
+
+        return digest
+
+    def _enforce_budget(self, keep: tuple = None) -> int:
+        """Evict waterfalls, then page snapshots, least recently seen first, until under the byte budget (both locks held)"""
+        if self._total_bytes <= self.max_bytes:
+            return 0
+        self._refresh_last_seen()
+        evicted = 0
+        candidates = sorted(self._index.items(), key=lambda item: (EVICTION_ORDER.index(item[0][0]), item[1][1]))
+        for key, (size, _) in candidates:
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            kind, digest = key
+            try:
+                os.remove(self._object_path(digest, kind))
+            except OSError:
+                pass
+            del self._index[key]
+            self._total_bytes -= size
+            self._stats['evictions'] += 1
+            evicted += 1
+        return evicted
+
+    def _refresh_last_seen(self):
+        """Pick up recency from object mtimes, which other processes' dedup hits update without a version bump"""
+        for (kind, digest), (size, last_seen) in list(self._index.items()):
+            try:
+                mtime = os.stat(self._object_path(digest, kind)).st_mtime
+            except OSError:
+                continue
+            if mtime > last_seen:
+                self._index[(kind, digest)] = (size, mtime)
+
+    def set_max_bytes(self, max_bytes: int):
+        """Change the byte budget, evicting right away if the store is now over it"""
+        with self._lock, self._file_lock():
+            self._sync()
+            self.max_bytes = max_bytes
+            if self._enforce_budget():
+                self._bump()
+
+    def get(self, digest: str, kind: str = 'page') -> Optional[str]:
+        """Load a snapshot (or another kind of capture) by hash, or None if unknown or evicted"""
+        if not HASH_PATTERN.match(digest or '') or kind not in KINDS:
+            return None
+        try:
+            with open(self._object_path(digest, kind), 'rb') as f:
+                return gzip.decompress(f.read()).decode('utf-8')
+        except OSError:
+            return None
+
+    def contains(self, digest: str, kind: str = 'page') -> bool:
+        with self._lock, self._file_lock():
+            self._sync()
+            return (kind, digest) in self._index
+
+    def record_cycle(self, record: Dict):
+        """Append a cycle record (with its snapshot hashes) to the cycle log"""
+        with self._lock, self._file_lock():
+            self._sync()
+            self._cycles.append(record)
+            try:
+                with open(self._cycles_path, 'ab') as f:
+                    f.write((json.dumps(record, default=str) + '\n').encode('utf-8'))
+                    self._cycles_offset = f.tell()
+                self._appended += 1
+                if self._appended % 100 == 0 and self._compact_cycle_log():
+                    self._bump()  # Rewritten: other processes' read offsets are no longer valid
+            except OSError as e:
+                print(f"[CAPTURE] Failed to write cycle record: {e}")
+
+    def _compact_cycle_log(self) -> bool:
+        """Trim the cycle log once it holds twice the retained records; returns True if it was rewritten (both locks held)"""
+        with open(self._cycles_path, 'r', encoding='utf-8') as f:
+            line_count = sum(1 for _ in f)
+        if line_count <= 2 * self._cycles.maxlen:
+            return False
+        temp_path = f"{self._cycles_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            for record in self._cycles:
+                f.write((json.dumps(record, default=str) + '\n').encode('utf-8'))
+            self._cycles_offset = f.tell()
+        os.replace(temp_path, self._cycles_path)
+        return True
+
+    def get_cycles(self, limit: int = 50) -> List[Dict]:
+        """Get the most recent cycle records, newest first"""
+        with self._lock, self._file_lock():
+            self._sync()
+            records = list(self._cycles)[-max(1, limit):]
+            records.reverse()
+            return [dict(record, snapshots=[dict(snapshot, stored=('page', snapshot.get('hash')) in self._index)
+                                            for snapshot in record.get('snapshots', [])])
+                    for record in records]
+
+    def get_stats(self) -> Dict:
+        """Get store size and deduplication statistics"""
+        with self._lock, self._file_lock():
+            self._sync()
+            kinds = {kind: {'objects': 0, 'bytes': 0} for kind in KINDS}
+            for (kind, _), (size, _) in self._index.items():
+                kinds[kind]['objects'] += 1
+                kinds[kind]['bytes'] += size
+            return dict(self._stats,
+                        objects=len(self._index),
+                        kinds=kinds,
+                        total_bytes=self._total_bytes,
+                        max_bytes=self.max_bytes,
+                        cycles=len(self._cycles))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_capture_store(directory: str = None, max_bytes: int = None) -> CaptureStore:
+    """Get the shared capture store for a directory (created on first use)"""
+    directory = directory or os.environ.get('CAPTURE_DIR', 'captures')
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = CaptureStore(directory, max_bytes or 50 * 1024 * 1024)
+            _stores[directory] = store
+        elif max_bytes and max_bytes != store.max_bytes:
+            store.set_max_bytes(max_bytes)
+        return store
@@ -0,0 +1,189 @@
+"""
+Check Scheduler for TLS Web Monitor
+Central heap-based scheduler that dispatches due checks to a bounded worker pool
+
+Instead of one sleeping thread per monitored target, every target is an entry
+in a min-heap keyed by its next due time. A single dispatcher thread pops due
+entries and hands them to a fixed-size thread pool. Each job returns the delay
+until its next run (or None to stop), so a target is never run concurrently
+with itself. New targets get a golden-ratio phase offset within their interval
+so targets started together do not check in lockstep.
+"""
+
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+
+
+class _Target:
+    def __init__(self, target_id: str, job: Callable[[], Optional[float]], interval_seconds: float):
+        self.id = target_id
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.generation = 0  # Matches only heap entries queued for this registration
+        self.idle = threading.Event()
+        self.idle.set()
+        self.runs = 0
+        self.last_lag_seconds = None
+
+
+class CheckScheduler:
+    def __init__(self, max_workers: int = 4, lag_window: int = 500):
+        self.max_workers = max(1, int(max_workers))
+        self._heap = []
+        self._targets = {}
+        self._sequence = itertools.count()
+        self._generations = itertools.count(1)  # Never reused, so remove/re-add cannot revive stale entries
+        self._in_flight = set()  # Target ids with a run executing, across registrations
+        self._deferred = {}  # target id -> (due, target) held until the id's in-flight run finishes
+        self._phase_index = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._dispatcher = None
+        self._stopped = False
+        self._lags = deque(maxlen=lag_window)
+        self._stats = {'dispatched': 0, 'completed': 0, 'failed': 0}
+
+    def start(self):
+        """Start the dispatcher thread and worker pool (no-op if already started)"""
+        with self._condition:
+            if self._dispatcher and self._dispatcher.is_alive():
+                return
+            self._stopped = False
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Check-Worker")
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True, name="Check-Scheduler")
+            self._dispatcher.start()
+
+    def shutdown(self):
+        """Stop dispatching; running jobs finish in the background"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+    def phase_offset(self, interval_seconds: float) -> float:
+        """Next phase offset: a low-discrepancy spread of start times across the interval"""
+        fraction = (next(self._phase_index) * GOLDEN_RATIO_FRACTION) % 1.0
+        return fraction * interval_seconds
+
+    def add(self, target_id: str, job: Callable[[], Optional[float]], interval_seconds: float,
+            first_delay: float = None) -> float:
+        """Schedule a target; returns the delay until its first run"""
+        if first_delay is None:
+            first_delay = self.phase_offset(interval_seconds)
+        with self._condition:
+            target = _Target(target_id, job, interval_seconds)
+            target.generation = next(self._generations)
+            self._targets[target_id] = target
+            self._push(target, time.monotonic() + first_delay)
+        return first_delay
+
+    def _push(self, target: _Target, due: float):
+        """Queue a target's next run (condition held)"""
+        heapq.heappush(self._heap, (due, next(self._sequence), target.id, target.generation))
+        self._condition.notify()
+
+    def remove(self, target_id: str, wait_timeout: float = None) -> bool:
+        """Unschedule a target; optionally wait for an in-flight run. Returns True if it is idle"""
+        with self._condition:
+            target = self._targets.pop(target_id, None)
+        if not target:
+            return True
+        return target.idle.wait(wait_timeout) if wait_timeout is not None else target.idle.is_set()
+
+    def contains(self, target_id: str) -> bool:
+        with self._condition:
+            return target_id in self._targets
+
+    def _dispatch_loop(self):
+        """Pop due entries and submit them to the worker pool"""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    if self._heap:
+                        wait = self._heap[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._condition.wait(timeout=wait)
+                    else:
+                        self._condition.wait()
+                if self._stopped:
+                    return
+
+                due, _, target_id, generation = heapq.heappop(self._heap)
+                target = self._targets.get(target_id)
+                if not target or target.generation != generation:
+                    continue  # Removed or replaced since this entry was queued
+                if target_id in self._in_flight:
+                    # A removed registration of this id is still running; start once it finishes
+                    self._deferred[target_id] = (due, target)
+                    continue
+                self._in_flight.add(target_id)
+                target.idle.clear()
+                self._stats['dispatched'] += 1
+
+            self._executor.submit(self._run_target, target, due)
+
+    def _run_target(self, target: _Target, due: float):
+        """Run one job and reschedule it with the delay it returns"""
+        started = time.monotonic()
+        lag = max(0.0, started - due)
+        target.last_lag_seconds = lag
+        self._lags.append(lag)
+
+        next_delay = None
+        try:
+            next_delay = target.job()
+            self._stats['completed'] += 1
+        except Exception as e:
+            self._stats['failed'] += 1
+            print(f"[SCHEDULER] Job for {target.id} failed: {e}")
+            next_delay = target.interval_seconds
+        finally:
+            target.runs += 1
+            with self._condition:
+                self._in_flight.discard(target.id)
+                deferred_due, deferred = self._deferred.pop(target.id, (None, None))
+                if deferred is not None and self._targets.get(target.id) is deferred:
+                    self._push(deferred, deferred_due)
+                current = self._targets.get(target.id)
+                if next_delay is None:
+                    if current is target:
+                        del self._targets[target.id]
+                elif current is target and not self._stopped:
+                    self._push(target, time.monotonic() + next_delay)
+            target.idle.set()
+
+    def get_stats(self) -> Dict:
+        """Get scheduling lag and throughput statistics"""
+        lags = sorted(self._lags)
+        with self._condition:
+            targets = {
+                t.id: {
+                    'interval_seconds': t.interval_seconds,
+                    'runs': t.runs,
+                    'running': not t.idle.is_set(),
+                    'last_lag_seconds': round(t.last_lag_seconds, 3) if t.last_lag_seconds is not None else None
+                }
+                for t in self._targets.values()
+            }
+            next_due = self._heap[0][0] - time.monotonic() if self._heap else None
+        return dict(self._stats,
+                    workers=self.max_workers,
+                    targets=len(targets),
+                    in_flight=sum(1 for t in targets.values() if t['running']),
+                    next_due_seconds=round(next_due, 3) if next_due is not None else None,
+                    lag_seconds={
+                        'samples': len(lags),
+                        'mean': round(sum(lags) / len(lags), 3) if lags else None,
+                        'p95': round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 3) if lags else None,
+                        'max': round(lags[-1], 3) if lags else None
+                    },
+                    per_target=targets)
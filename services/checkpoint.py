@@ -0,0 +1,64 @@
+"""
+Checkpoint for TLS Web Monitor
+Persists running monitors' state across restarts so monitoring resumes on boot
+
+On SIGTERM the app drains in-flight checks, asks each running monitor for its
+state (counters, last results, schedule position, session cookies) and writes
+it here. On the next boot, monitors found in a recent checkpoint are started
+again with that state. Set CHECKPOINT_FILE to a path on a persistent volume
+if the platform replaces the container's disk on redeploy.
+
+The checkpoint holds session cookies, which are login credentials, so it is
+created readable by its owner only (0600).
+"""
+
+import os
+import json
+import time
+from typing import Dict, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path() -> str:
+    return os.environ.get('CHECKPOINT_FILE', 'checkpoint.json')
+
+
+def save_checkpoint(monitors: Dict[str, Dict]) -> str:
+    """Atomically write the state of the monitors that were running (owner-only: it contains session cookies)"""
+    path = checkpoint_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    try:
+        os.remove(temp_path)  # O_CREAT keeps the mode of a leftover file
+    except OSError:
+        pass
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'version': CHECKPOINT_VERSION, 'saved_at': time.time(), 'monitors': monitors}, f)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_checkpoint(max_age_seconds: float = 3600) -> Optional[Dict[str, Dict]]:
+    """Read the monitor states from a checkpoint, ignoring missing, corrupt or stale ones"""
+    try:
+        with open(checkpoint_path(), 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        return None
+    if time.time() - checkpoint.get('saved_at', 0) > max_age_seconds:
+        return None
+    return checkpoint.get('monitors') or None
+
+
+def clear_checkpoint():
+    """Remove the checkpoint once it has been resumed (so a crash loop does not replay it)"""
+    try:
+        os.remove(checkpoint_path())
+    except OSError:
+        pass
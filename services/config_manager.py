@@ -40,14 +40,89 @@ class ConfigManager:
             # Monitoring Settings
             "check_interval_minutes": 15,
             "months_to_check": 3,
-            "max_retries": 3,
+            "max_retries": 3,  # Consecutive failed cycles before the circuit breaker opens
+            "failure_policy": {
+                "retry_delay_seconds": 60,
+                "month_retries": 1,
+                "backoff_base_seconds": 60,
+                "backoff_max_seconds": 1800
+            },
+            "liveness": {
+                "probe_timeout_seconds": 5,
+                "lead_seconds": 60  # Probe this long before each cycle so a rebuild happens during the wait
+            },
+            
+            # Page snapshot capture (content-addressed, compressed, size-bounded)
+            "capture_store": {
+                "enabled": True,
+                "max_megabytes": 50
+            },
+            
+            # Screenshots of the calendar when a month looks like it has slots
+            "evidence": {
+                "enabled": True,
+                "selector": "[data-testid*='calendar'], [class*='calendar']",  # Whole page if not found
+                "format": "webp",  # webp or png
+                "quality": 80,
+                "max_files": 200,
+                "max_megabytes": 100
+            },
+            "public_base_url": "",  # Used to link screenshots in emails (or set PUBLIC_BASE_URL)
+            
+            # Per-host rate governor shared by all monitors (backs off on 429/403/captcha pages)
+            "rate_limit": {
+                "enabled": True,
+                "requests_per_minute": 12,
+                "burst": 4,
+                "max_concurrent": 2,
+                "backoff_base_seconds": 60,
+                "backoff_max_seconds": 1800
+            },
+            
+            # Worker Settings ("thread" or "process"; process isolates the browser from the web server)
+            "worker_mode": "thread",
+            "scheduler_mode": "thread",  # "central" runs checks on the shared scheduler pool
             
             # Browser Settings
             "headless_mode": True,
             "use_seleniumbase_uc": True,
+            "browser_backend": "auto",  # auto, selenium, seleniumbase or cdp
+            "browser_isolation": "process",  # "context" shares one Chrome, one browser context per monitor
             "implicit_wait": 10,
             "page_load_timeout": 30,
-            "remote_debugging_port": 9222
+            "remote_debugging_port": 9222,
+            
+            # Hot standby: a second logged-in browser for instant failover (not used with the pool)
+            "hot_standby": {
+                "enabled": False,
+                "refresh_minutes": 10,  # How often the standby logs in again (single_session: is probed) and is replaced if dead
+                "min_available_mb": 600,
+                "single_session": False  # Account allows one session: never log the standby in; log in at takeover instead
+            },
+            
+            # Shared browser pool (monitors lease a warm browser per check cycle)
+            "browser_pool": {
+                "enabled": False,
+                "size": 2,
+                "max_age_minutes": 60,
+                "max_leases": 50,
+                "max_memory_mb": 400,
+                "lease_timeout_seconds": 120
+            },
+            
+            # Removes orphaned Chrome profiles, crash dumps and downloads from /tmp (often RAM-backed)
+            "temp_janitor": {
+                "enabled": True,
+                "interval_minutes": 15,
+                "min_age_minutes": 10,  # Never touch anything newer (a browser may be launching)
+                "budget_megabytes": 64  # Orphans are removed oldest-first until the rest fits
+            },
+            
+            # Per-cycle network waterfall from DevTools Network events (stored with the cycle, served as HAR)
+            "network_capture": {
+                "enabled": False,
+                "top_n": 5  # Slowest/largest requests kept in the cycle summary
+            }
         }
     
     def get_config(self) -> Dict[str, Any]:
@@ -89,6 +164,45 @@ class ConfigManager:
             print(f"Error updating config: {e}")
             raise
     
+    def _load_file_config(self) -> Dict[str, Any]:
+        """Load the raw saved configuration (without defaults)"""
+        if not os.path.exists(self.config_file):
+            return {}
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _save_file_config(self, config: Dict[str, Any]):
+        """Write the raw configuration to file"""
+        with open(self.config_file, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2)
+    
+    def get_monitor_configs(self) -> Dict[str, Dict]:
+        """Get the saved per-monitor configuration overrides"""
+        try:
+            return self._load_file_config().get('monitors', {})
+        except Exception as e:
+            print(f"Error loading monitor configs: {e}")
+            return {}
+    
+    def save_monitor_config(self, monitor_id: str, overrides: Dict[str, Any]):
+        """Save the configuration overrides of one monitor"""
+        config = self._load_file_config()
+        config.setdefault('monitors', {})[monitor_id] = overrides
+        self._save_file_config(config)
+    
+    def delete_monitor_config(self, monitor_id: str):
+        """Remove the saved configuration overrides of one monitor"""
+        config = self._load_file_config()
+        if monitor_id in config.get('monitors', {}):
+            del config['monitors'][monitor_id]
+            self._save_file_config(config)
+    
+    def merge_monitor_config(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a monitor's effective configuration from the base config and its overrides"""
+        base = self.get_config()
+        base.pop('monitors', None)
+        return self._deep_merge(base, overrides or {})
+    
     def _deep_merge(self, base: Dict, update: Dict) -> Dict:
         """Deep merge two dictionaries"""
         result = base.copy()
@@ -0,0 +1,232 @@
+"""
+Environment Probe for TLS Web Monitor
+Detects platform, Chrome and driver details once and caches the result
+
+The chromedriver Selenium launches is resolved through webdriver-manager on
+the first launch (it may download a driver matching Chrome) and then reused;
+the probe reports that binary and its version, not whichever chromedriver
+happens to be on PATH.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Dict, Optional
+
+# Check if psutil is available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Check if webdriver-manager is available
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    WEBDRIVER_MANAGER_AVAILABLE = True
+except ImportError:
+    WEBDRIVER_MANAGER_AVAILABLE = False
+
+CHROME_ENV_VARS = ['CHROME_BIN', 'GOOGLE_CHROME_BIN', 'CHROME_EXECUTABLE', 'CHROMIUM_BIN']
+CHROME_COMMANDS = ['google-chrome', 'google-chrome-stable', 'chromium-browser', 'chromium', 'chrome']
+CHROME_PATHS = [
+    '/usr/bin/google-chrome',
+    '/usr/bin/google-chrome-stable',
+    '/usr/bin/chromium-browser',
+    '/usr/bin/chromium',
+    '/opt/google/chrome/chrome',
+    '/snap/bin/chromium',
+    '/app/.chrome-for-testing/chrome-linux64/chrome',
+    '/workspace/.chrome/chrome',
+    '/opt/chrome/chrome'
+]
+
+
+@dataclass
+class EnvironmentInfo:
+    platform: str
+    is_cloud: bool
+    chrome_binary: Optional[str]
+    chrome_version: Optional[str]
+    driver_binary: Optional[str]
+    driver_version: Optional[str]
+    shm_size_bytes: Optional[int]
+    memory_total_bytes: Optional[int]
+    memory_available_bytes: Optional[int]
+    probed_at: str
+    driver_source: Optional[str] = None  # 'PATH' until resolve_driver_binary() runs, then where that driver came from
+    platform_detection: Dict = field(default_factory=dict)
+    environment_variables: Dict = field(default_factory=dict)
+    command_tests: Dict = field(default_factory=dict)
+    file_system_search: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary"""
+        return asdict(self)
+
+
+_cached_info = None
+_probe_lock = threading.Lock()
+_resolved_driver = None  # (path, source) once resolve_driver_binary() has run
+_driver_lock = threading.Lock()
+
+
+def get_environment(refresh: bool = False) -> EnvironmentInfo:
+    """Get the cached environment probe, running it on first use or when refresh is requested"""
+    global _cached_info
+    with _probe_lock:
+        if _cached_info is None or refresh:
+            _cached_info = probe_environment()
+            if _resolved_driver:
+                _apply_driver(_cached_info, *_resolved_driver)
+        return _cached_info
+
+
+def _apply_driver(info: EnvironmentInfo, path: Optional[str], source: Optional[str]):
+    if path and path != info.driver_binary:
+        info.driver_binary = path
+        info.driver_version = _run_version(path)
+    info.driver_source = source
+
+
+def resolve_driver_binary() -> Optional[str]:
+    """Path of the chromedriver for Selenium launches: resolved once, then reused (None lets Selenium find one)"""
+    global _resolved_driver
+    info = get_environment()
+    with _driver_lock:
+        if _resolved_driver is None:
+            path, source = None, None
+            if WEBDRIVER_MANAGER_AVAILABLE:
+                try:
+                    path, source = ChromeDriverManager().install(), 'webdriver-manager'
+                except Exception as e:
+                    print(f"[ENV] webdriver-manager could not provide chromedriver: {e}")
+            if not path and info.driver_binary:
+                path, source = info.driver_binary, 'PATH'
+            _resolved_driver = (path, source)
+            _apply_driver(info, path, source)
+        return _resolved_driver[0]
+
+
+def detect_platform() -> str:
+    """Detect the cloud platform from environment variables"""
+    if os.environ.get('KOYEB_SERVICE_NAME') is not None:
+        return "Koyeb"
+    if os.environ.get('RENDER_SERVICE_NAME') is not None:
+        return "Render"
+    if os.environ.get('RAILWAY_ENVIRONMENT') is not None:
+        return "Railway"
+    if os.environ.get('HEROKU_APP_NAME') is not None:
+        return "Heroku"
+    if os.environ.get('PORT') is not None:
+        return "Cloud"
+    return "Local"
+
+
+def _run_version(binary: str) -> Optional[str]:
+    """Run `<binary> --version` and return its output, or None on failure"""
+    try:
+        result = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except Exception:
+        pass
+    return None
+
+
+def probe_environment() -> EnvironmentInfo:
+    """Run the full environment probe (spawns subprocesses; use get_environment for the cached result)"""
+    platform = detect_platform()
+
+    platform_detection = {
+        'RENDER_SERVICE_NAME': os.environ.get('RENDER_SERVICE_NAME'),
+        'KOYEB_SERVICE_NAME': os.environ.get('KOYEB_SERVICE_NAME'),
+        'RAILWAY_ENVIRONMENT': os.environ.get('RAILWAY_ENVIRONMENT'),
+        'HEROKU_APP_NAME': os.environ.get('HEROKU_APP_NAME'),
+        'PORT': os.environ.get('PORT'),
+        'dockerenv_exists': os.path.exists('/.dockerenv')
+    }
+
+    environment_variables = {}
+    for var in CHROME_ENV_VARS:
+        value = os.environ.get(var)
+        environment_variables[var] = {
+            'value': value,
+            'exists': os.path.exists(value) if value else None,
+            'executable': os.access(value, os.X_OK) if value and os.path.exists(value) else None
+        }
+
+    # Only spawn --version for commands that are actually on PATH
+    command_tests = {}
+    for cmd in CHROME_COMMANDS:
+        location = shutil.which(cmd)
+        version = _run_version(location) if location else None
+        command_tests[cmd] = {
+            'version_works': version is not None,
+            'version_output': version,
+            'location': location
+        }
+
+    file_system_search = {}
+    for path in CHROME_PATHS:
+        exists = os.path.exists(path)
+        file_system_search[path] = {
+            'exists': exists,
+            'executable': os.access(path, os.X_OK) if exists else None,
+            'is_file': os.path.isfile(path) if exists else None
+        }
+
+    # Prefer an explicit CHROME_BIN, then the well-known install locations
+    chrome_binary = None
+    candidates = [os.environ.get(var) for var in CHROME_ENV_VARS] + CHROME_PATHS
+    for path in candidates:
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            chrome_binary = path
+            break
+
+    chrome_version = None
+    if chrome_binary:
+        for cmd, test in command_tests.items():
+            if test['location'] and os.path.realpath(test['location']) == os.path.realpath(chrome_binary):
+                chrome_version = test['version_output']
+                break
+        else:
+            chrome_version = _run_version(chrome_binary)
+
+    driver_binary = shutil.which('chromedriver')
+    driver_version = _run_version(driver_binary) if driver_binary else None
+
+    shm_size = None
+    if os.path.isdir('/dev/shm'):
+        try:
+            shm_size = shutil.disk_usage('/dev/shm').total
+        except OSError:
+            pass
+
+    memory_total = None
+    memory_available = None
+    if PSUTIL_AVAILABLE:
+        memory = psutil.virtual_memory()
+        memory_total = memory.total
+        memory_available = memory.available
+
+    return EnvironmentInfo(
+        platform=platform,
+        is_cloud=platform != "Local",
+        chrome_binary=chrome_binary,
+        chrome_version=chrome_version,
+        driver_binary=driver_binary,
+        driver_version=driver_version,
+        shm_size_bytes=shm_size,
+        memory_total_bytes=memory_total,
+        memory_available_bytes=memory_available,
+        probed_at=datetime.now().isoformat(),
+        driver_source='PATH' if driver_binary else None,
+        platform_detection=platform_detection,
+        environment_variables=environment_variables,
+        command_tests=command_tests,
+        file_system_search=file_system_search
+    )
@@ -0,0 +1,156 @@
+"""
+Event Feed for TLS Web Monitor
+Server-side filtering and compact encoding of dashboard events
+
+A client sends `subscribe_events` with the monitors and event kinds it wants,
+a minimum log level, whether it only wants important log lines, and whether
+it understands the compact encoding. Each distinct combination is a
+Socket.IO room, so an event is filtered and encoded once per combination that
+has members instead of once per client, and clients never receive lines
+they would throw away.
+
+Compact encoding uses short keys, level codes and epoch-millisecond
+timestamps, and strips decorative emoji from log text.
+"""
+
+import threading
+import unicodedata
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+LEVELS = {'debug': 0, 'info': 1, 'warning': 2, 'error': 3}
+EVENT_KINDS = {'log_message': 'log', 'status_update': 'status'}
+KINDS = ('log', 'status', 'other')
+
+# Compact key names (the dashboard expands them back)
+COMPACT_KEYS = {
+    'timestamp': 't', 'level': 'l', 'message': 'm', 'monitor_id': 'i',
+    'is_running': 'r', 'last_check': 'c', 'total_checks': 'n', 'error_count': 'e', 'status': 's'
+}
+TIMESTAMP_KEYS = ('timestamp', 'last_check')
+
+# Info lines worth showing on the dashboard (warnings and errors are always shown)
+IMPORTANT_KEYWORDS = (
+    'CHECK #', 'COMPLETED', 'SLOTS FOUND', 'NO SLOTS FOUND', 'NO APPOINTMENT SLOTS FOUND', 'NO AVAILABLE SLOTS',
+    'STARTING TLS', 'MONITORING STARTED', 'MONITORING STOPPED', 'STOP SIGNAL SENT',
+    'LOGIN SUCCESSFUL', 'NAVIGATION SUCCESSFUL', 'CHECK COMPLETE',
+    'NOTIFICATION SENT', 'EMAIL NOTIFICATION', 'DESKTOP NOTIFICATION',
+    'CONFIGURATION UPDATED', 'USING TLS ACCOUNT'
+)
+SUPPRESSED_MESSAGES = (
+    'UC mode opens in separate window (cannot be embedded due to anti-detection features)',
+)
+
+
+def is_important(message: str, level: str) -> bool:
+    """Whether a log line should reach clients that only want important messages"""
+    if any(suppressed in message for suppressed in SUPPRESSED_MESSAGES):
+        return False
+    if LEVELS.get(level, 1) >= LEVELS['warning']:
+        return True
+    upper = message.upper()
+    return any(keyword in upper for keyword in IMPORTANT_KEYWORDS)
+
+
+def _strip_emoji(text: str) -> str:
+    return ''.join(ch for ch in text if unicodedata.category(ch) != 'So' and ch != '\ufe0f').strip()
+
+
+def _epoch_ms(value):
+    if not isinstance(value, str) or not value:
+        return value
+    try:
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    except ValueError:
+        return value
+
+
+def encode_compact(data: Dict) -> Dict:
+    """Short keys, numeric level and timestamps, emoji-free message text"""
+    compact = {}
+    for key, value in data.items():
+        if key in TIMESTAMP_KEYS:
+            value = _epoch_ms(value)
+        elif key == 'level':
+            value = LEVELS.get(value, 1)
+        elif key == 'message' and isinstance(value, str):
+            value = _strip_emoji(value)
+        compact[COMPACT_KEYS.get(key, key)] = value
+    return compact
+
+
+def feed_room(monitor_id: str, kind: str, min_level: str, important_only: bool, compact: bool) -> str:
+    return f"feed:{monitor_id}:{kind}:{min_level}:{'important' if important_only else 'all'}:{'compact' if compact else 'json'}"
+
+
+class EventFeed:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._room_members = Counter()
+        self._client_rooms = {}
+        self._stats = {'events': 0, 'deliveries': 0, 'filtered': 0}
+
+    def subscribe(self, sid: str, options: Dict, known_monitors: List[str]) -> Tuple[List[str], List[str]]:
+        """Replace a client's subscription; returns (rooms to leave, rooms to join)"""
+        monitor_ids = [m for m in options.get('monitor_ids') or ['default'] if m in known_monitors]
+        kinds = [k for k in options.get('kinds') or KINDS if k in KINDS]
+        min_level = options.get('min_level', 'info')
+        if min_level not in LEVELS:
+            min_level = 'info'
+        important_only = bool(options.get('important_only', False))
+        compact = bool(options.get('compact', False))
+
+        rooms = [feed_room(monitor_id, kind, min_level if kind == 'log' else 'any',
+                           important_only and kind == 'log', compact)
+                 for monitor_id in monitor_ids for kind in kinds]
+        old_rooms = self.unsubscribe(sid)
+        with self._lock:
+            self._client_rooms[sid] = rooms
+            self._room_members.update(rooms)
+        return old_rooms, rooms
+
+    def unsubscribe(self, sid: str) -> List[str]:
+        """Forget a client's subscription; returns the rooms it should leave"""
+        with self._lock:
+            rooms = self._client_rooms.pop(sid, [])
+            self._room_members.subtract(rooms)
+            for room in rooms:
+                if self._room_members[room] <= 0:
+                    del self._room_members[room]
+        return rooms
+
+    def deliveries(self, monitor_id: str, event: str, data) -> List[Tuple[str, object]]:
+        """Rooms (with members) that should receive this event, each with its encoded payload"""
+        kind = EVENT_KINDS.get(event, 'other')
+        prefix = f"feed:{monitor_id}:{kind}:"
+        with self._lock:
+            rooms = [room for room in self._room_members if room.startswith(prefix)]
+        if not rooms:
+            return []
+
+        level = data.get('level', 'info') if isinstance(data, dict) else 'info'
+        important = kind == 'log' and isinstance(data, dict) and is_important(data.get('message', ''), level)
+        encoded = {}
+        result = []
+        filtered = 0
+        for room in rooms:
+            _, _, _, min_level, scope, encoding = room.split(':')
+            if kind == 'log' and (LEVELS.get(level, 1) < LEVELS[min_level] or (scope == 'important' and not important)):
+                filtered += 1
+                continue
+            if encoding not in encoded:
+                encoded[encoding] = encode_compact(data) if encoding == 'compact' and isinstance(data, dict) else data
+            result.append((room, encoded[encoding]))
+        with self._lock:
+            self._stats['events'] += 1
+            self._stats['deliveries'] += len(result)
+            self._stats['filtered'] += filtered
+        return result
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, clients=len(self._client_rooms), rooms=dict(self._room_members))
+
+
+event_feed = EventFeed()
@@ -0,0 +1,137 @@
+"""
+Evidence Store for TLS Web Monitor
+Screenshots of the calendar taken when a month looks like it has slots
+
+Screenshots are named by the SHA-256 of their bytes, so the name is known as
+soon as the image is captured and can go straight into notifications while a
+background writer puts the file on disk. Retention keeps at most `max_files`
+screenshots and `max_bytes` of them, dropping the oldest first.
+"""
+
+import os
+import re
+import time
+import queue
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+NAME_PATTERN = re.compile(r'^[0-9a-f]{64}\.(png|webp)$')
+MIMETYPES = {'png': 'image/png', 'webp': 'image/webp'}
+
+
+class EvidenceStore:
+    def __init__(self, directory: str, max_files: int = 200, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = {}  # name -> (size, mtime)
+        self._pending = {}  # name -> bytes not yet on disk
+        self._total_bytes = 0
+        self._stats = {'submitted': 0, 'written': 0, 'write_failures': 0, 'evictions': 0}
+        self._queue = queue.Queue()
+
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if NAME_PATTERN.match(name):
+                stat = os.stat(os.path.join(directory, name))
+                self._index[name] = (stat.st_size, stat.st_mtime)
+                self._total_bytes += stat.st_size
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True, name="Evidence-Writer")
+        self._writer.start()
+
+    def submit(self, image: bytes, image_format: str = 'png') -> str:
+        """Queue a screenshot for writing and return its name immediately"""
+        name = f"{hashlib.sha256(image).hexdigest()}.{image_format}"
+        with self._lock:
+            self._stats['submitted'] += 1
+            if name in self._index or name in self._pending:
+                return name
+            self._pending[name] = image
+        self._queue.put(name)
+        return name
+
+    def _write_loop(self):
+        """Write queued screenshots to disk and apply retention"""
+        while True:
+            name = self._queue.get()
+            with self._lock:
+                image = self._pending.get(name)
+            if image is None:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                temp_path = f"{path}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(image)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"[EVIDENCE] Failed to write screenshot {name}: {e}")
+                with self._lock:
+                    self._pending.pop(name, None)
+                    self._stats['write_failures'] += 1
+                continue
+
+            with self._lock:
+                self._pending.pop(name, None)
+                self._index[name] = (len(image), time.time())
+                self._total_bytes += len(image)
+                self._stats['written'] += 1
+                self._enforce_retention(keep=name)
+
+    def _enforce_retention(self, keep: str = None):
+        """Delete the oldest screenshots until within the count and byte limits (lock held)"""
+        for name, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if len(self._index) <= self.max_files and self._total_bytes <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            del self._index[name]
+            self._total_bytes -= size
+            self._stats['evictions'] += 1
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Get a screenshot's bytes (including ones still waiting to be written)"""
+        if not NAME_PATTERN.match(name or ''):
+            return None
+        with self._lock:
+            if name in self._pending:
+                return self._pending[name]
+            if name not in self._index:
+                return None
+        try:
+            with open(os.path.join(self.directory, name), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def list(self, limit: int = 50) -> List[Dict]:
+        """Most recent screenshots first"""
+        with self._lock:
+            items = sorted(self._index.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [{'name': name, 'bytes': size, 'created_at': mtime} for name, (size, mtime) in items]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, files=len(self._index), bytes=self._total_bytes,
+                        pending=len(self._pending), max_files=self.max_files, max_bytes=self.max_bytes)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_evidence_store(directory: str = None, max_files: int = 200, max_bytes: int = 100 * 1024 * 1024) -> EvidenceStore:
+    """Get the shared evidence store for a directory (created on first use)"""
+    directory = directory or os.environ.get('EVIDENCE_DIR', 'evidence')
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = EvidenceStore(directory, max_files, max_bytes)
+        return store
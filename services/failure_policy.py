@@ -0,0 +1,141 @@
+"""
+Failure Policy for TLS Web Monitor
+Classifies check-cycle failures by phase and exception, and gates retries with a circuit breaker
+
+Failure classes and what the monitor does about them:
+    transient  - timeouts and stale/missing elements: retry the failed month from the current month, then the next cycle soon
+    session    - dead Chrome/chromedriver/DevTools session: rebuild the browser before retrying
+    auth       - login failed with a live browser: clear the session and log in from scratch next cycle
+    throttled  - the site is rate limiting us: wait out the rate governor's backoff
+    unknown    - anything else: treated like transient
+
+Consecutive failed cycles trip the breaker open. While open, no cycles run
+until an exponentially growing backoff elapses; the next cycle is a half-open
+probe that either closes the breaker or re-opens it with a longer backoff.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException,
+    InvalidSessionIdException, NoSuchWindowException, WebDriverException
+)
+
+from services.browser_backends import BrowserBackendError
+from services.rate_governor import ThrottledError
+
+TRANSIENT = 'transient'
+SESSION = 'session'
+AUTH = 'auth'
+THROTTLED = 'throttled'
+UNKNOWN = 'unknown'
+
+# Recovery action for each class
+ACTIONS = {
+    TRANSIENT: 'retry',
+    SESSION: 'rebuild_driver',
+    AUTH: 'relogin',
+    THROTTLED: 'backoff',
+    UNKNOWN: 'retry'
+}
+
+SESSION_ERROR_MARKERS = (
+    'invalid session id', 'session deleted', 'chrome not reachable', 'disconnected',
+    'no such window', 'target window already closed', 'connection closed', 'connection refused',
+    'max retries exceeded'
+)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def classify_failure(phase: str, error: Optional[BaseException]) -> str:
+    """Classify a failure from the phase it happened in ('login', 'navigation', 'month') and its exception"""
+    message = str(error).lower() if error else ''
+    if isinstance(error, ThrottledError):
+        return THROTTLED
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError)):
+        return SESSION
+    if isinstance(error, (WebDriverException, BrowserBackendError)) and any(m in message for m in SESSION_ERROR_MARKERS):
+        return SESSION
+    if phase == 'login':
+        return AUTH
+    if isinstance(error, (TimeoutException, TimeoutError, NoSuchElementException, StaleElementReferenceException)):
+        return TRANSIENT
+    if isinstance(error, (WebDriverException, BrowserBackendError)):
+        return TRANSIENT
+    return UNKNOWN
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 3, backoff_base_seconds: float = 60,
+                 backoff_max_seconds: float = 1800):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self._open_until = 0.0
+        self._trips_in_streak = 0
+        self._failing_since = None
+        self._recoveries = deque(maxlen=50)
+        self._by_class = {}
+        self._lock = threading.Lock()
+
+    def before_cycle(self) -> float:
+        """Seconds to wait before a cycle may run (0 to run now; moves open -> half-open when due)"""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._open_until - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                self.state = HALF_OPEN
+            return 0.0
+
+    def record_success(self) -> Optional[float]:
+        """Close the breaker; returns the recovery time in seconds if this ended a failure streak"""
+        with self._lock:
+            recovery = None
+            if self._failing_since is not None:
+                recovery = time.monotonic() - self._failing_since
+                self._recoveries.append(recovery)
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trips_in_streak = 0
+            self._failing_since = None
+            return recovery
+
+    def record_failure(self, failure_class: str) -> Optional[float]:
+        """Count a failed cycle; returns the open backoff in seconds if the breaker (re)opened"""
+        with self._lock:
+            self._by_class[failure_class] = self._by_class.get(failure_class, 0) + 1
+            self.consecutive_failures += 1
+            if self._failing_since is None:
+                self._failing_since = time.monotonic()
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                backoff = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** self._trips_in_streak))
+                self._trips_in_streak += 1
+                self.opened_count += 1
+                self.state = OPEN
+                self._open_until = time.monotonic() + backoff
+                return backoff
+            return None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            recoveries = list(self._recoveries)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'opened_count': self.opened_count,
+                'open_remaining_seconds': round(max(0.0, self._open_until - time.monotonic()), 1) if self.state == OPEN else 0,
+                'failures_by_class': dict(self._by_class),
+                'recoveries': len(recoveries),
+                'mean_recovery_seconds': round(sum(recoveries) / len(recoveries), 1) if recoveries else None,
+                'last_recovery_seconds': round(recoveries[-1], 1) if recoveries else None
+            }
@@ -0,0 +1,166 @@
+"""
+Hot Standby for TLS Web Monitor
+Keeps a second, logged-in browser parked on the booking page for instant failover
+
+The standby is a shadow monitor with its own browser. A background loop
+builds it (when there is enough free memory), logs it in, navigates it to the
+booking page and repeats that periodically so its session stays fresh. When
+the active browser dies, the owner takes the standby's browser and resumes
+checking months immediately; a replacement standby is then built in the
+background.
+
+With single_session set (accounts where a second login ends the first
+session), the standby is only launched: it is never logged in and makes no
+navigation. The owner logs in on it at takeover, so a failover still saves
+the browser launch but pays a full login (typically 15-30s with the
+human-like delays) before months are checked again.
+
+The standby has no Socket.IO emitter and shares the owner's logger, so
+nothing it does reaches the dashboard; its console and file log lines are
+prefixed with [STANDBY].
+"""
+
+import copy
+import time
+import threading
+from typing import Dict
+
+# Check if psutil is available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class HotStandby:
+    def __init__(self, owner, refresh_seconds: float = 600, min_available_bytes: int = 600 * 1024 * 1024,
+                 single_session: bool = False):
+        self.owner = owner
+        self.refresh_seconds = refresh_seconds
+        self.min_available_bytes = min_available_bytes
+        self.single_session = single_session
+        self._standby = None
+        self._ready_at = None
+        self._lock = threading.Lock()  # Held while the standby is being built, refreshed or taken
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stats = {'built': 0, 'build_failures': 0, 'refreshes': 0, 'takeovers': 0,
+                       'skipped_low_memory': 0, 'last_takeover_ms': None}
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="Hot-Standby")
+        self._thread.start()
+
+    def stop(self):
+        """Stop maintaining the standby and quit its browser (the loop does it if a build is in progress)"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._lock.acquire(blocking=False):
+            try:
+                standby, self._standby = self._standby, None
+            finally:
+                self._lock.release()
+            if standby:
+                self._discard(standby)
+
+    @staticmethod
+    def _discard(standby):
+        """Quit a standby's browser and remove its profile"""
+        standby._quit_browser(force=True)
+        standby._cleanup_temp_data()
+
+    def has_headroom(self) -> bool:
+        """Whether available memory allows a second browser (assumed yes without psutil)"""
+        if not PSUTIL_AVAILABLE:
+            return True
+        return psutil.virtual_memory().available >= self.min_available_bytes
+
+    def take(self):
+        """Hand over the ready standby monitor (or None if none is ready) and start building a new one"""
+        started = time.monotonic()
+        if not self._lock.acquire(blocking=False):
+            return None  # Mid-build or mid-refresh; not ready to take over
+        try:
+            standby, self._standby = self._standby, None
+        finally:
+            self._lock.release()
+        if not standby:
+            return None
+        if not standby.browser or not standby.browser.is_alive(timeout=2):
+            self._discard(standby)
+            self._wake.set()
+            return None
+        self._stats['takeovers'] += 1
+        self._stats['last_takeover_ms'] = round((time.monotonic() - started) * 1000, 1)
+        self._wake.set()
+        return standby
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                if self._stop_event.is_set():
+                    break
+                if self._standby is None:
+                    self._build()
+                elif time.monotonic() - self._ready_at >= self.refresh_seconds:
+                    self._refresh()
+            self._wake.wait(timeout=30)
+            self._wake.clear()
+
+        with self._lock:
+            standby, self._standby = self._standby, None
+        if standby:
+            self._discard(standby)
+
+    def _build(self):
+        """Launch, log in and park a new standby (lock held)"""
+        if not self.has_headroom():
+            self._stats['skipped_low_memory'] += 1
+            return
+        standby = self.owner.__class__(copy.deepcopy(self.owner.config), logger=self.owner.logger)
+        standby._log_label = 'STANDBY'
+        try:
+            standby._setup_driver()
+            if self._park(standby):
+                self._standby = standby
+                self._ready_at = time.monotonic()
+                self._stats['built'] += 1
+                self.owner._emit_log('info', "🛟 Hot standby browser is launched (log in at takeover)" if self.single_session
+                                     else "🛟 Hot standby browser is logged in and parked on the booking page")
+                return
+        except Exception as e:
+            self.owner._emit_log('warning', f"Hot standby build failed: {e}")
+        self._stats['build_failures'] += 1
+        self._discard(standby)
+
+    def _refresh(self):
+        """Re-login and re-park the standby so its session does not expire, or replace it if it died (lock held)"""
+        standby = self._standby
+        if self.single_session:
+            parked = not self._stop_event.is_set() and standby.browser and standby.browser.is_alive(timeout=5)
+        else:
+            parked = self._park(standby)
+        if parked:
+            self._ready_at = time.monotonic()
+            self._stats['refreshes'] += 1
+        else:
+            self._discard(self._standby)
+            self._standby = None
+
+    def _park(self, standby) -> bool:
+        """Log in and open the booking page (single_session: leave the fresh browser untouched)"""
+        if self._stop_event.is_set():
+            return False
+        if self.single_session:
+            return True
+        return standby.login() and standby.navigate_to_appointment_booking()
+
+    def get_stats(self) -> Dict:
+        standby = self._standby
+        return dict(self._stats,
+                    ready=standby is not None,
+                    age_seconds=round(time.monotonic() - self._ready_at, 1) if standby and self._ready_at else None,
+                    headroom=self.has_headroom())
@@ -0,0 +1,124 @@
+"""
+Memory Tracer for TLS Web Monitor
+Runtime tracemalloc control with named snapshots and allocation-site diffs
+
+Tracing is off by default and costs nothing until started. While it runs,
+every allocation records its traceback (1 frame by default), which adds
+CPU and memory overhead; snapshots are kept in memory (at most
+MAX_SNAPSHOTS, oldest dropped first). Stopping discards the snapshots and
+the trace data, so the process returns to zero tracing overhead.
+"""
+
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+MAX_SNAPSHOTS = 8
+MAX_FRAMES = 25
+GROUP_BY = ('lineno', 'filename', 'traceback')
+NAME_PATTERN_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_')
+
+# Allocations made by tracing itself are noise in every diff
+NOISE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+class MemoryTracer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()  # name -> (taken_at, snapshot)
+        self._started_at = None
+
+    def start(self, frames: int = 1) -> Tuple[bool, str]:
+        """Start tracing allocations with `frames` frames of traceback each"""
+        frames = max(1, min(int(frames), MAX_FRAMES))
+        with self._lock:
+            if tracemalloc.is_tracing():
+                return False, "Tracing is already running"
+            tracemalloc.start(frames)
+            self._started_at = datetime.now()
+        return True, f"Tracing started with {frames} frame(s) per allocation"
+
+    def stop(self) -> Tuple[bool, str]:
+        """Stop tracing and free the trace data and snapshots"""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return False, "Tracing is not running"
+            tracemalloc.stop()
+            self._snapshots.clear()
+            self._started_at = None
+        return True, "Tracing stopped and snapshots discarded"
+
+    def snapshot(self, name: str = None) -> Tuple[bool, str]:
+        """Take a named snapshot of the current allocations"""
+        name = name or datetime.now().strftime('snap-%H%M%S')
+        if len(name) > 32 or not set(name) <= NAME_PATTERN_CHARS or name == 'current':
+            return False, "Snapshot name must be 1-32 letters, digits, '-' or '_' (and not 'current')"
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return False, "Start tracing before taking snapshots"
+            snapshot = tracemalloc.take_snapshot().filter_traces(NOISE_FILTERS)
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = (datetime.now(), snapshot)
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        return True, name
+
+    def _get_snapshot(self, name: str) -> Optional[tracemalloc.Snapshot]:
+        if name == 'current':
+            return tracemalloc.take_snapshot().filter_traces(NOISE_FILTERS) if tracemalloc.is_tracing() else None
+        entry = self._snapshots.get(name)
+        return entry[1] if entry else None
+
+    def diff(self, base: str, other: str = 'current', top: int = 25, group_by: str = 'lineno') -> Tuple[bool, object]:
+        """Top allocation sites by size growth from `base` to `other` ('current' takes a fresh snapshot)"""
+        if group_by not in GROUP_BY:
+            return False, f"group_by must be one of {', '.join(GROUP_BY)}"
+        with self._lock:
+            base_snapshot = self._get_snapshot(base)
+            other_snapshot = self._get_snapshot(other)
+        if base_snapshot is None or other_snapshot is None:
+            return False, f"Unknown snapshot '{base if base_snapshot is None else other}'"
+
+        stats = other_snapshot.compare_to(base_snapshot, group_by)
+        sites = []
+        for stat in stats[:max(1, min(int(top), 500))]:
+            sites.append({
+                'site': [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                'size_diff_bytes': stat.size_diff,
+                'size_bytes': stat.size,
+                'count_diff': stat.count_diff,
+                'count': stat.count
+            })
+        return True, {
+            'base': base,
+            'other': other,
+            'group_by': group_by,
+            'total_diff_bytes': sum(stat.size_diff for stat in stats),
+            'sites': sites
+        }
+
+    def get_stats(self) -> Dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots: List[Dict] = [{'name': name, 'taken_at': taken_at.isoformat()}
+                                     for name, (taken_at, _) in self._snapshots.items()]
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'started_at': self._started_at.isoformat() if self._started_at else None,
+            'traced_bytes': current,
+            'traced_peak_bytes': peak,
+            'tracemalloc_overhead_bytes': tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            'snapshots': snapshots
+        }
+
+
+memory_tracer = MemoryTracer()
@@ -0,0 +1,338 @@
+"""
+Monitor Registry for TLS Web Monitor
+Creates, starts, stops and inspects multiple monitors by ID
+
+Each monitor runs with the base configuration deep-merged with its own
+overrides (credentials, tls_url, ...). With scheduler_mode "central", a
+monitor has no thread of its own; its checks are dispatched by the shared
+CheckScheduler. Events from the "default" monitor are broadcast as before;
+events from other monitors carry their monitor_id and are sent only to
+clients in the Socket.IO room "monitor:<id>". Clients that subscribe through
+the event feed instead get filtered (and optionally compact) copies.
+"""
+
+import re
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from services.tls_monitor import TLSWebMonitor
+from services.monitor_worker import WorkerMonitor
+from services.event_feed import event_feed
+
+DEFAULT_MONITOR_ID = 'default'
+LEGACY_ROOM = 'legacy'  # Clients that have not sent subscribe_events get every default-monitor event
+MONITOR_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+
+
+def monitor_room(monitor_id: str) -> str:
+    """Socket.IO room that receives a monitor's events"""
+    return f"monitor:{monitor_id}"
+
+
+class MonitorEmitter:
+    """Socket.IO wrapper that tags events with their monitor ID and routes them to its room"""
+
+    def __init__(self, socketio, monitor_id: str):
+        self.socketio = socketio
+        self.monitor_id = monitor_id
+
+    def emit(self, event: str, data=None, **kwargs):
+        if not self.socketio:
+            return
+        if isinstance(data, dict):
+            data = dict(data, monitor_id=self.monitor_id)
+        if self.monitor_id == DEFAULT_MONITOR_ID:
+            self.socketio.emit(event, data, to=LEGACY_ROOM, **kwargs)
+        else:
+            self.socketio.emit(event, data, to=monitor_room(self.monitor_id), **kwargs)
+        for room, payload in event_feed.deliveries(self.monitor_id, event, data):
+            self.socketio.emit(event, payload, to=room, **kwargs)
+
+
+class MonitorEntry:
+    def __init__(self, monitor_id: str, overrides: Dict = None):
+        self.id = monitor_id
+        self.overrides = overrides or {}
+        self.monitor = None
+        self.thread = None
+        self.lock = threading.Lock()  # Prevents concurrent start/stop of this monitor
+
+
+class MonitorRegistry:
+    def __init__(self, config_manager, socketio=None, scheduler=None):
+        self.config_manager = config_manager
+        self.socketio = socketio
+        self.scheduler = scheduler
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        # Restore saved monitors; the default monitor always exists
+        for monitor_id, overrides in config_manager.get_monitor_configs().items():
+            if MONITOR_ID_PATTERN.match(monitor_id):
+                self._entries[monitor_id] = MonitorEntry(monitor_id, overrides)
+        self._entries.setdefault(DEFAULT_MONITOR_ID, MonitorEntry(DEFAULT_MONITOR_ID))
+
+    def _get_entry(self, monitor_id: str) -> Optional[MonitorEntry]:
+        with self._lock:
+            return self._entries.get(monitor_id)
+
+    def get_config(self, monitor_id: str) -> Optional[Dict]:
+        """Get the effective configuration of a monitor (base config plus its overrides)"""
+        entry = self._get_entry(monitor_id)
+        if not entry:
+            return None
+        return self.config_manager.merge_monitor_config(entry.overrides)
+
+    def _is_active(self, entry: MonitorEntry) -> bool:
+        """Running, initializing, or waiting for its first scheduled dispatch"""
+        if entry.monitor and entry.monitor.is_running():
+            return True
+        return bool(entry.monitor and self.scheduler and self.scheduler.contains(entry.id))
+
+    def _scheduled_step(self, monitor):
+        """Scheduler job: start the monitor on first dispatch, then run one check per dispatch"""
+        if monitor.is_stop_requested() or monitor.is_draining():
+            return None
+        if not monitor.is_running() and not monitor.begin_monitoring():
+            return None
+        delay = monitor.run_monitoring_step()
+        if delay is None or monitor.is_stop_requested() or monitor.is_draining():
+            monitor.end_monitoring()
+            return None
+        return delay
+
+    def get_monitor(self, monitor_id: str = DEFAULT_MONITOR_ID):
+        """Get the live monitor instance for an ID, if one was started"""
+        entry = self._get_entry(monitor_id)
+        return entry.monitor if entry else None
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def create(self, monitor_id: str, overrides: Dict = None) -> Tuple[bool, str]:
+        """Register a new monitor with its configuration overrides"""
+        if not monitor_id or not MONITOR_ID_PATTERN.match(monitor_id):
+            return False, "Monitor ID must be 1-32 letters, digits, '-' or '_'"
+        with self._lock:
+            if monitor_id in self._entries:
+                return False, f"Monitor '{monitor_id}' already exists"
+            self._entries[monitor_id] = MonitorEntry(monitor_id, overrides)
+        if monitor_id != DEFAULT_MONITOR_ID:
+            self.config_manager.save_monitor_config(monitor_id, overrides or {})
+        return True, f"Monitor '{monitor_id}' created"
+
+    def update(self, monitor_id: str, overrides: Dict) -> Tuple[bool, str]:
+        """Merge new overrides into a monitor's configuration and push it if running"""
+        entry = self._get_entry(monitor_id)
+        if not entry:
+            return False, f"Monitor '{monitor_id}' not found"
+        entry.overrides = self.config_manager._deep_merge(entry.overrides, overrides or {})
+        if monitor_id != DEFAULT_MONITOR_ID:
+            self.config_manager.save_monitor_config(monitor_id, entry.overrides)
+        self.push_config(monitor_id)
+        return True, f"Monitor '{monitor_id}' updated"
+
+    def push_config(self, monitor_id: str = None):
+        """Push the effective configuration to one running monitor, or to all of them"""
+        for target_id in ([monitor_id] if monitor_id else self.ids()):
+            entry = self._get_entry(target_id)
+            if entry and entry.monitor and entry.monitor.is_running():
+                entry.monitor.update_config(self.get_config(target_id))
+
+    def remove(self, monitor_id: str) -> Tuple[bool, str]:
+        """Stop (if needed) and unregister a monitor"""
+        if monitor_id == DEFAULT_MONITOR_ID:
+            return False, "The default monitor cannot be removed"
+        entry = self._get_entry(monitor_id)
+        if not entry:
+            return False, f"Monitor '{monitor_id}' not found"
+        if self._is_active(entry):
+            success, message = self.stop(monitor_id)
+            if not success:
+                return False, message
+        with self._lock:
+            self._entries.pop(monitor_id, None)
+        self.config_manager.delete_monitor_config(monitor_id)
+        return True, f"Monitor '{monitor_id}' removed"
+
+    def start(self, monitor_id: str = DEFAULT_MONITOR_ID, resume_state: Dict = None) -> Tuple[bool, str]:
+        """Start a monitor in its own thread, or on the shared scheduler in central mode"""
+        entry = self._get_entry(monitor_id)
+        if not entry:
+            return False, f"Monitor '{monitor_id}' not found"
+
+        with entry.lock:
+            # Check if monitoring is already running
+            if self._is_active(entry):
+                return False, 'Monitoring is already running'
+
+            # Clean up any existing thread
+            if entry.thread and entry.thread.is_alive():
+                return False, 'Previous monitoring session is still stopping. Please wait a moment and try again.'
+
+            # Force cleanup any existing monitor instance
+            if entry.monitor:
+                try:
+                    entry.monitor.force_stop()
+                except:
+                    pass
+                entry.monitor = None
+            entry.thread = None
+
+            config = self.get_config(monitor_id)
+
+            # Validate configuration before starting
+            is_valid, error_message = self.config_manager.validate_config(config)
+            if not is_valid:
+                return False, error_message
+
+            # Specifically check TLS credentials
+            tls_email = config.get('login_credentials', {}).get('email', '').strip()
+            tls_password = config.get('login_credentials', {}).get('password', '').strip()
+            if not tls_email or not tls_password:
+                return False, 'TLS email and password are required. Please fill in your TLS account credentials before starting monitoring.'
+
+            # Process mode isolates the browser from the web server's GIL and event loop
+            emitter = MonitorEmitter(self.socketio, monitor_id)
+            if config.get('worker_mode') == 'process':
+                entry.monitor = WorkerMonitor(config, emitter)
+            else:
+                entry.monitor = TLSWebMonitor(config, emitter)
+            if resume_state:
+                entry.monitor.restore_state(resume_state)
+            
+            if isinstance(entry.monitor, TLSWebMonitor):
+                # Central mode: the shared scheduler runs the checks instead of a dedicated thread
+                if config.get('scheduler_mode') == 'central' and self.scheduler:
+                    monitor = entry.monitor
+                    resume_delay = None
+                    if resume_state and resume_state.get('next_check_at'):
+                        resume_delay = max(0, resume_state['next_check_at'] - time.time())
+                    first_delay = self.scheduler.add(monitor_id, lambda: self._scheduled_step(monitor),
+                                                     config['check_interval_minutes'] * 60, first_delay=resume_delay)
+                    return True, f'Monitoring scheduled (first check in {int(first_delay)}s)'
+
+            # Start monitoring in a separate thread (in process mode it relays worker events)
+            entry.thread = threading.Thread(target=entry.monitor.start_monitoring, daemon=True, name=f"TLS-Monitor-{monitor_id}")
+            entry.thread.start()
+
+            return True, 'Monitoring started successfully'
+
+    def stop(self, monitor_id: str = DEFAULT_MONITOR_ID) -> Tuple[bool, str]:
+        """Stop a monitor, escalating to force_stop if it does not exit in time"""
+        entry = self._get_entry(monitor_id)
+        if not entry:
+            return False, f"Monitor '{monitor_id}' not found"
+
+        with entry.lock:
+            monitor = entry.monitor
+            try:
+                if not monitor:
+                    return False, 'No monitoring process is running'
+
+                if not self._is_active(entry):
+                    return False, 'Monitoring is not currently running'
+
+                # Signal the monitor to stop
+                was_running = monitor.is_running()
+                monitor.stop_monitoring()
+
+                # Scheduled monitors: unschedule and wait for an in-flight check
+                if self.scheduler and self.scheduler.contains(monitor_id):
+                    if not self.scheduler.remove(monitor_id, wait_timeout=10.0):
+                        monitor.force_stop()
+                        if not self.scheduler.remove(monitor_id, wait_timeout=5.0):
+                            return False, 'Monitoring process is not responding. It may continue running in the background.'
+                    if was_running:
+                        monitor.end_monitoring()
+
+                # Wait for the thread to finish (with timeout)
+                if entry.thread and entry.thread.is_alive():
+                    entry.thread.join(timeout=10.0)  # Wait up to 10 seconds
+
+                    # If thread is still alive after timeout, force cleanup
+                    if entry.thread.is_alive():
+                        monitor.force_stop()
+                        entry.thread.join(timeout=5.0)  # Wait another 5 seconds
+
+                        if entry.thread.is_alive():
+                            return False, 'Monitoring process is not responding. It may continue running in the background.'
+
+                entry.monitor = None
+                entry.thread = None
+                return True, 'Monitoring stopped successfully'
+            except Exception as e:
+                # Force cleanup on error
+                try:
+                    monitor.force_stop()
+                except:
+                    pass
+                entry.monitor = None
+                entry.thread = None
+                return False, f'Error stopping monitoring: {str(e)}'
+
+    def drain(self, deadline_seconds: float = 20) -> Dict[str, Dict]:
+        """Let in-flight checks finish (within the deadline), then export and stop every active monitor"""
+        with self._lock:
+            entries = list(self._entries.values())
+        active = [entry for entry in entries if entry.monitor and self._is_active(entry)]
+        deadline = time.monotonic() + deadline_seconds
+        
+        for entry in active:
+            entry.monitor.request_drain()
+        for entry in active:
+            while entry.monitor.is_cycle_running() and time.monotonic() < deadline:
+                time.sleep(0.2)
+        
+        states = {}
+        for entry in active:
+            with entry.lock:
+                monitor = entry.monitor
+                if not monitor:
+                    continue
+                states[entry.id] = dict(monitor.export_state(), running=True)
+                if self.scheduler:
+                    self.scheduler.remove(entry.id)
+                monitor.stop_monitoring()
+                if entry.thread and entry.thread.is_alive():
+                    entry.thread.join(timeout=max(0.5, deadline - time.monotonic()))
+                entry.monitor = None
+                entry.thread = None
+        return states
+    
+    def get_status(self, monitor_id: str = DEFAULT_MONITOR_ID) -> Optional[Dict]:
+        """Get the status of one monitor"""
+        entry = self._get_entry(monitor_id)
+        if not entry:
+            return None
+
+        monitor = entry.monitor
+        config = self.get_config(monitor_id)
+        status = {
+            'monitor_id': monitor_id,
+            'tls_url': config.get('tls_url'),
+            'account': config.get('login_credentials', {}).get('email', ''),
+            'is_running': False,
+            'last_check': None,
+            'total_checks': 0,
+            'error_count': 0,
+            'browser_port': None
+        }
+        if monitor:
+            status.update({
+                'is_running': self._is_active(entry),
+                'last_check': monitor.get_last_check_time(),
+                'total_checks': monitor.get_total_checks(),
+                'error_count': monitor.get_error_count(),
+                'browser_port': monitor.get_browser_port(),
+                'instance_id': getattr(monitor, '_instance_id', 'unknown')
+            })
+            if hasattr(monitor, 'get_failure_stats'):
+                status['circuit'] = monitor.get_failure_stats()
+        return status
+
+    def list_status(self) -> List[Dict]:
+        """Get the status of every registered monitor"""
+        return [self.get_status(monitor_id) for monitor_id in self.ids()]
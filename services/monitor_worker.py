@@ -0,0 +1,333 @@
+"""
+Worker Process Mode for TLS Web Monitor
+Runs the browser monitor in a child process and relays its events over a pipe
+
+The child is a fresh interpreter (`python -m services.monitor_worker`) so it never
+inherits eventlet monkey patching or shares a GIL with the Flask/Socket.IO server.
+Protocol is JSON lines: the parent writes the config and then commands to the
+child's stdin, the child writes events to its original stdout. Everything the
+monitor prints goes to stderr so it cannot corrupt the event channel.
+
+Shutdown checkpoints go over the same channel: the parent sends "drain", waits
+until the child reports no cycle in flight, then sends "export_state" and gets
+the monitor's state back as an "exported_state" event. A checkpointed state is
+passed back in with the next "start" command.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import signal
+import threading
+import subprocess
+from typing import Dict, List
+
+STATE_INTERVAL_SECONDS = 1.0
+TERMINATE_TIMEOUT_SECONDS = 5.0
+EXPORT_TIMEOUT_SECONDS = 10.0
+
+
+class WorkerMonitor:
+    """Parent-side proxy exposing the same interface as TLSWebMonitor"""
+
+    def __init__(self, config: Dict, socketio=None):
+        self.config = config
+        self.socketio = socketio
+        self._process = None
+        self._write_lock = threading.Lock()
+        self._starting = False
+        self._state = {
+            'is_running': False,
+            'last_check': '',
+            'total_checks': 0,
+            'error_count': 0,
+            'browser_port': None,
+            'in_cycle': False,
+            'draining': False
+        }
+        self._resume_state = None  # Checkpoint sent to the worker with the start command
+        self._drain_pending = False  # Drain sent but not yet acknowledged by a state update
+        self._exported_state = None
+        self._export_ready = threading.Event()
+        self._instance_id = f"worker-{uuid.uuid4().hex[:8]}"
+
+    def start_monitoring(self):
+        """Spawn the worker process and relay its events until it exits (blocking)"""
+        if self.is_running():
+            return
+
+        self._starting = True
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        try:
+            self._process = subprocess.Popen(
+                [sys.executable, '-u', '-m', 'services.monitor_worker'],
+                cwd=package_root,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=None,  # Inherit so worker output reaches the container logs
+                text=True,
+                encoding='utf-8',
+                bufsize=1
+            )
+            self._send({'cmd': 'start', 'config': self.config, 'resume_state': self._resume_state})
+            self._resume_state = None
+        except Exception as e:
+            self._starting = False
+            self._emit('log_message', {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'level': 'error',
+                'message': f"Failed to start monitor worker process: {e}"
+            })
+            return
+
+        try:
+            for line in self._process.stdout:
+                self._handle_line(line)
+        finally:
+            returncode = self._process.wait()
+            self._starting = False
+            self._state['is_running'] = False
+            if returncode and returncode > 0:
+                self._emit('log_message', {
+                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'level': 'error',
+                    'message': f"Monitor worker process exited with code {returncode}"
+                })
+
+    def _handle_line(self, line: str):
+        """Dispatch one event line from the worker"""
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return
+
+        kind = message.get('type')
+        if kind == 'emit':
+            self._emit(message.get('event'), message.get('data'))
+        elif kind == 'state':
+            self._state.update(message.get('state', {}))
+            self._starting = False
+            if self._state.get('draining'):
+                self._drain_pending = False
+        elif kind == 'exported_state':
+            self._exported_state = message.get('state') or {}
+            self._export_ready.set()
+
+    def _emit(self, event: str, data):
+        """Forward an event to Socket.IO clients"""
+        if self.socketio and event:
+            self.socketio.emit(event, data)
+
+    def _send(self, command: Dict) -> bool:
+        """Write a command to the worker's stdin"""
+        process = self._process
+        if not process or process.poll() is not None:
+            return False
+        try:
+            with self._write_lock:
+                process.stdin.write(json.dumps(command, default=str) + '\n')
+                process.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def update_config(self, config: Dict):
+        """Push a new configuration to the running worker"""
+        self.config = config
+        self._send({'cmd': 'config', 'config': config})
+
+    def restore_state(self, state: Dict):
+        """Continue from a checkpoint; it is sent to the worker with the start command (call before starting)"""
+        self._resume_state = state
+
+    def request_drain(self):
+        """Ask the worker to schedule no further cycles; it stays up until export_state and stop"""
+        self._drain_pending = self._send({'cmd': 'drain'})
+
+    def is_draining(self) -> bool:
+        return self._drain_pending or bool(self._state.get('draining'))
+
+    def is_cycle_running(self) -> bool:
+        """Whether the worker has a check cycle in flight (assumed yes until it acknowledges a drain)"""
+        process_alive = self._process is not None and self._process.poll() is None
+        return process_alive and (self._drain_pending or bool(self._state.get('in_cycle')))
+
+    def export_state(self, timeout: float = EXPORT_TIMEOUT_SECONDS) -> Dict:
+        """Fetch the worker monitor's checkpoint state (counters only if the worker does not answer)"""
+        self._export_ready.clear()
+        self._exported_state = None
+        if self._send({'cmd': 'export_state'}) and self._export_ready.wait(timeout):
+            return self._exported_state
+        print(f"[WORKER] No checkpoint state from worker {self.get_worker_pid()} - saving counters only")
+        return {
+            'total_checks': self.get_total_checks(),
+            'error_count': self.get_error_count(),
+            'last_check': self.get_last_check_time() or None
+        }
+
+    def stop_monitoring(self):
+        """Ask the worker to stop gracefully"""
+        self._send({'cmd': 'stop'})
+
+    def force_stop(self):
+        """Stop the worker, escalating to terminate and kill"""
+        process = self._process
+        if not process or process.poll() is not None:
+            return
+        self._send({'cmd': 'force_stop'})
+        try:
+            process.wait(timeout=TERMINATE_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                process.wait(timeout=TERMINATE_TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._state['is_running'] = False
+
+    def send_desktop_notification(self, slots: List[Dict]):
+        """Ask the worker to send a desktop notification"""
+        self._send({'cmd': 'notify', 'channel': 'desktop', 'slots': slots})
+
+    def send_email_notification(self, slots: List[Dict]):
+        """Ask the worker to send an email notification"""
+        self._send({'cmd': 'notify', 'channel': 'email', 'slots': slots})
+
+    def is_running(self) -> bool:
+        """Check if the worker is running or still starting up"""
+        process_alive = self._process is not None and self._process.poll() is None
+        return process_alive and (self._starting or self._state['is_running'])
+
+    def get_last_check_time(self) -> str:
+        """Get the last check time as ISO string"""
+        return self._state.get('last_check') or ""
+
+    def get_total_checks(self) -> int:
+        """Get total number of checks performed"""
+        return self._state.get('total_checks', 0)
+
+    def get_error_count(self) -> int:
+        """Get total number of errors encountered"""
+        return self._state.get('error_count', 0)
+
+    def get_browser_port(self) -> int:
+        """Get browser remote debugging port (Chrome only)"""
+        return self._state.get('browser_port') or 9222
+
+    def get_worker_pid(self):
+        """Get the worker process ID"""
+        return self._process.pid if self._process else None
+
+
+class _EventChannel:
+    """Socket.IO stand-in used inside the worker; writes emits to the event pipe"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, data=None):
+        self.send({'type': 'emit', 'event': event, 'data': data})
+
+    def send(self, message: Dict):
+        try:
+            with self._lock:
+                self._stream.write(json.dumps(message, default=str) + '\n')
+                self._stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def _monitor_state(monitor) -> Dict:
+    """Snapshot the counters the parent serves from /api/status"""
+    return {
+        'is_running': monitor.is_running(),
+        'last_check': monitor.get_last_check_time(),
+        'total_checks': monitor.get_total_checks(),
+        'error_count': monitor.get_error_count(),
+        'browser_port': monitor.get_browser_port(),
+        'in_cycle': monitor.is_cycle_running(),
+        'draining': monitor.is_draining()
+    }
+
+
+def _command_loop(monitor, channel: _EventChannel, released: threading.Event):
+    """Apply commands from the parent; EOF means the parent is gone"""
+    for line in sys.stdin:
+        try:
+            command = json.loads(line)
+        except ValueError:
+            continue
+
+        cmd = command.get('cmd')
+        if cmd == 'stop':
+            released.set()
+            monitor.stop_monitoring()
+        elif cmd == 'force_stop':
+            released.set()
+            monitor.force_stop()
+        elif cmd == 'drain':
+            monitor.request_drain()
+        elif cmd == 'export_state':
+            channel.send({'type': 'exported_state', 'state': monitor.export_state()})
+        elif cmd == 'config':
+            monitor.update_config(command.get('config', {}))
+        elif cmd == 'notify':
+            if command.get('channel') == 'desktop':
+                monitor.send_desktop_notification(command.get('slots', []))
+            else:
+                monitor.send_email_notification(command.get('slots', []))
+        channel.send({'type': 'state', 'state': _monitor_state(monitor)})
+
+    released.set()
+    monitor.force_stop()
+
+
+def _state_loop(monitor, channel: _EventChannel, stop_event: threading.Event):
+    """Periodically publish monitor counters to the parent"""
+    while not stop_event.wait(STATE_INTERVAL_SECONDS):
+        channel.send({'type': 'state', 'state': _monitor_state(monitor)})
+
+
+def main():
+    """Worker process entry point"""
+    # Keep the original stdout as the event pipe and send all prints to stderr
+    event_stream = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    channel = _EventChannel(event_stream)
+
+    # Shutdown is driven by the parent (drain, export_state, stop) so a checkpoint can be taken first
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    start = json.loads(sys.stdin.readline() or '{}')
+    if start.get('cmd') != 'start':
+        return 1
+
+    from services.tls_monitor import TLSWebMonitor
+    monitor = TLSWebMonitor(start.get('config', {}), channel)
+    if start.get('resume_state'):
+        monitor.restore_state(start['resume_state'])
+
+    stop_event = threading.Event()
+    released = threading.Event()  # Set once the parent stops us or goes away
+    threading.Thread(target=_command_loop, args=(monitor, channel, released), daemon=True, name="Worker-Commands").start()
+    threading.Thread(target=_state_loop, args=(monitor, channel, stop_event), daemon=True, name="Worker-State").start()
+
+    try:
+        monitor.start_monitoring()
+        if monitor.is_draining():
+            # Keep the browser (and its session cookies) until the parent has exported our state
+            channel.send({'type': 'state', 'state': _monitor_state(monitor)})
+            released.wait(EXPORT_TIMEOUT_SECONDS * 6)
+    finally:
+        stop_event.set()
+        if monitor.browser:
+            monitor.force_stop()
+        channel.send({'type': 'state', 'state': _monitor_state(monitor)})
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
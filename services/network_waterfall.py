@@ -0,0 +1,143 @@
+"""
+Network Waterfall for TLS Web Monitor
+Turns DevTools Network events from one check cycle into per-request timings, a summary and HAR
+
+Each request's timing comes from its ResourceTiming (DNS, connect, TLS,
+send, wait for headers) plus the loadingFinished time for the body. Sizes
+are bytes on the wire. Request and response headers are deliberately not
+kept: the login form posts credentials and the responses set session
+cookies.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List
+
+PHASES = ('blocked', 'dns', 'connect', 'ssl', 'send', 'wait', 'receive')
+
+
+def _phase(timing: Dict, start: str, end: str) -> float:
+    if not timing or timing.get(start, -1) < 0 or timing.get(end, -1) < 0:
+        return -1
+    return round(timing[end] - timing[start], 2)
+
+
+def _timings(timing: Dict, total_ms: float) -> Dict:
+    """HAR timings from a CDP ResourceTiming (all offsets are ms after timing.requestTime)"""
+    if not timing:
+        return {'blocked': -1, 'dns': -1, 'connect': -1, 'ssl': -1, 'send': 0, 'wait': round(total_ms, 2), 'receive': 0}
+    first = next((timing[key] for key in ('dnsStart', 'connectStart', 'sendStart') if timing.get(key, -1) >= 0), 0)
+    headers_ms = timing.get('receiveHeadersEnd', 0)
+    return {
+        'blocked': round(first, 2),
+        'dns': _phase(timing, 'dnsStart', 'dnsEnd'),
+        'connect': _phase(timing, 'connectStart', 'connectEnd'),  # Includes ssl, as in HAR
+        'ssl': _phase(timing, 'sslStart', 'sslEnd'),
+        'send': max(0, _phase(timing, 'sendStart', 'sendEnd')),
+        'wait': max(0, round(headers_ms - timing.get('sendEnd', 0), 2)),
+        'receive': max(0, round(total_ms - headers_ms, 2))
+    }
+
+
+def build_entries(events: List[Dict]) -> List[Dict]:
+    """Collapse Network.* events into one entry per request hop (redirects are separate hops)"""
+    open_requests = {}
+    entries = []
+
+    def finish(entry: Dict, end_timestamp: float):
+        entry['time'] = round(max(0.0, (end_timestamp - entry.pop('_timestamp')) * 1000), 2)
+        timing = entry.pop('_timing', None)
+        request_time = timing.get('requestTime') if timing else None
+        total_from_timing = (end_timestamp - request_time) * 1000 if request_time else entry['time']
+        entry['timings'] = _timings(timing, total_from_timing)
+        entries.append(entry)
+
+    for event in events:
+        method, params = event['method'], event.get('params', {})
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            previous = open_requests.pop(request_id, None)
+            if previous and params.get('redirectResponse'):
+                response = params['redirectResponse']
+                previous.update(status=response.get('status', 0), mime_type=response.get('mimeType', ''),
+                                bytes=response.get('encodedDataLength', 0), _timing=response.get('timing'))
+                finish(previous, params['timestamp'])
+            request = params.get('request', {})
+            open_requests[request_id] = {
+                'url': request.get('url', ''),
+                'method': request.get('method', 'GET'),
+                'type': params.get('type', 'Other'),
+                'started': datetime.fromtimestamp(params.get('wallTime', 0), tz=timezone.utc).isoformat(),
+                'status': 0,
+                'mime_type': '',
+                'bytes': 0,
+                'error': None,
+                '_timestamp': params.get('timestamp', 0)
+            }
+        elif request_id in open_requests:
+            entry = open_requests[request_id]
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                entry.update(status=response.get('status', 0), mime_type=response.get('mimeType', ''),
+                             protocol=response.get('protocol'), _timing=response.get('timing'))
+            elif method == 'Network.loadingFinished':
+                entry['bytes'] = params.get('encodedDataLength', 0)
+                finish(open_requests.pop(request_id), params.get('timestamp', entry['_timestamp']))
+            elif method == 'Network.loadingFailed':
+                entry['error'] = params.get('errorText') or 'failed'
+                finish(open_requests.pop(request_id), params.get('timestamp', entry['_timestamp']))
+
+    entries.sort(key=lambda entry: entry['started'])
+    return entries
+
+
+def summarize(entries: List[Dict], top_n: int = 5) -> Dict:
+    """Compact per-phase summary of a cycle's requests"""
+    phases = {phase: round(sum(entry['timings'][phase] for entry in entries if entry['timings'][phase] > 0), 1)
+              for phase in PHASES}
+    bytes_by_type = Counter()
+    for entry in entries:
+        bytes_by_type[entry['type']] += entry['bytes']
+
+    def brief(entry: Dict) -> Dict:
+        return {'url': entry['url'][:200], 'ms': entry['time'], 'status': entry['status'], 'bytes': entry['bytes']}
+
+    return {
+        'requests': len(entries),
+        'failed': sum(1 for entry in entries if entry['error'] or entry['status'] >= 400),
+        'total_bytes': sum(entry['bytes'] for entry in entries),
+        'phases_ms': phases,
+        'bytes_by_type': dict(bytes_by_type.most_common()),
+        'slowest': [brief(entry) for entry in sorted(entries, key=lambda e: e['time'], reverse=True)[:top_n]],
+        'largest': [brief(entry) for entry in sorted(entries, key=lambda e: e['bytes'], reverse=True)[:top_n]]
+    }
+
+
+def to_har(entries: List[Dict], title: str = 'TLS check cycle') -> Dict:
+    """HAR 1.2 log of the entries (without headers, cookies or bodies)"""
+    started = entries[0]['started'] if entries else datetime.now(timezone.utc).isoformat()
+    har_entries = []
+    for entry in entries:
+        har_entries.append({
+            'pageref': 'cycle',
+            'startedDateTime': entry['started'],
+            'time': entry['time'],
+            'request': {
+                'method': entry['method'], 'url': entry['url'], 'httpVersion': entry.get('protocol') or '',
+                'headers': [], 'queryString': [], 'cookies': [], 'headersSize': -1, 'bodySize': -1
+            },
+            'response': {
+                'status': entry['status'], 'statusText': entry['error'] or '', 'httpVersion': entry.get('protocol') or '',
+                'headers': [], 'cookies': [], 'redirectURL': '', 'headersSize': -1, 'bodySize': entry['bytes'],
+                'content': {'size': entry['bytes'], 'mimeType': entry['mime_type']}
+            },
+            'cache': {},
+            'timings': entry['timings'],
+            '_resourceType': entry['type']
+        })
+    return {'log': {
+        'version': '1.2',
+        'creator': {'name': 'TLS Web Monitor', 'version': '1.0'},
+        'pages': [{'id': 'cycle', 'title': title, 'startedDateTime': started, 'pageTimings': {}}],
+        'entries': har_entries
+    }}
@@ -0,0 +1,186 @@
+"""
+Process Trees for TLS Web Monitor
+Records the processes a browser launch spawned and tears down exactly those
+
+Each monitor remembers the PIDs (with their start times, so a reused PID is
+never mistaken for ours) of the chromedriver/Chrome tree it launched. At
+teardown the recorded processes plus their current descendants get SIGTERM,
+and whatever is still alive after the timeout gets SIGKILL. Chrome launched
+directly (CDP backend) runs in its own session, so its process group is
+signalled as well, which also reaches helpers that were reparented.
+Other monitors' browsers are never touched.
+"""
+
+import os
+import time
+import signal
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Check if psutil is available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'chromedriver', 'uc_driver')
+
+
+def _identity(process) -> Optional[Tuple[int, float]]:
+    try:
+        return process.pid, process.create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+def child_processes() -> Set[Tuple[int, float]]:
+    """(pid, start time) of every descendant of this process"""
+    if not PSUTIL_AVAILABLE:
+        return set()
+    identities = (_identity(child) for child in psutil.Process().children(recursive=True))
+    return {identity for identity in identities if identity}
+
+
+class ProcessTree:
+    def __init__(self, processes: Iterable[Tuple[int, float]] = (), group_id: int = None):
+        self._processes = set(processes)  # (pid, create_time); create_time is None without psutil
+        self.group_id = group_id
+
+    @classmethod
+    def capture(cls, root_pid: Optional[int], own_group: bool = False) -> 'ProcessTree':
+        """Record a root process and its current descendants"""
+        tree = cls(group_id=root_pid if own_group else None)
+        if root_pid:
+            tree.add(root_pid)
+        return tree
+
+    @classmethod
+    def spawned_since(cls, baseline: Set[Tuple[int, float]], profile_dir: Optional[str]) -> 'ProcessTree':
+        """Browser processes started after `baseline` that use `profile_dir` (and the chromedriver that launched them)
+
+        Without a profile directory nothing identifies a launch's processes
+        (other monitors may be launching at the same time), so the tree is empty.
+        """
+        tree = cls()
+        if not PSUTIL_AVAILABLE or not profile_dir:
+            return tree
+        profile_arg = f"--user-data-dir={profile_dir}"
+
+        def uses_profile(process) -> bool:
+            return profile_arg in process.cmdline()
+
+        for child in psutil.Process().children(recursive=True):
+            identity = _identity(child)
+            if not identity or identity in baseline:
+                continue
+            try:
+                if not any(name in child.name().lower() for name in BROWSER_PROCESS_NAMES):
+                    continue
+                # chromedriver carries no profile flag; keep it if it is the parent of a matching Chrome
+                if not uses_profile(child) and not any(uses_profile(grandchild) for grandchild in child.children()):
+                    continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            tree.add(child.pid)
+        return tree
+
+    def add(self, pid: int):
+        """Add a process and its current descendants"""
+        if not PSUTIL_AVAILABLE:
+            self._processes.add((pid, None))
+            return
+        try:
+            root = psutil.Process(pid)
+            members = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return
+        self._processes.update(identity for identity in map(_identity, members) if identity)
+
+    def pids(self) -> Set[int]:
+        return {pid for pid, _ in self._processes}
+
+    def _live_members(self) -> list:
+        """Recorded processes that are still the same processes, plus their descendants now"""
+        members = {}
+        for pid, create_time in self._processes:
+            try:
+                process = psutil.Process(pid)
+                if create_time is not None and process.create_time() != create_time:
+                    continue  # PID was reused by an unrelated process
+                members[pid] = process
+                for child in process.children(recursive=True):
+                    members[child.pid] = child
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return list(members.values())
+
+    def terminate(self, timeout: float = 5) -> Dict:
+        """SIGTERM the tree, then SIGKILL whatever survives `timeout` seconds"""
+        result = {'terminated': 0, 'killed': 0}
+        if self.group_id:
+            try:
+                os.killpg(self.group_id, signal.SIGTERM)
+            except OSError:
+                pass
+
+        if PSUTIL_AVAILABLE:
+            members = self._live_members()
+            for process in members:
+                try:
+                    process.terminate()
+                except psutil.NoSuchProcess:
+                    pass
+            gone, alive = psutil.wait_procs(members, timeout=timeout)
+            for process in alive:
+                try:
+                    process.kill()
+                except psutil.NoSuchProcess:
+                    pass
+            psutil.wait_procs(alive, timeout=1)
+            result = {'terminated': len(gone), 'killed': len(alive)}
+        else:
+            for pid in self.pids():
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    result['terminated'] += 1
+                except OSError:
+                    pass
+            deadline = time.monotonic() + timeout
+            alive = self.pids()
+            while alive and time.monotonic() < deadline:
+                time.sleep(0.1)
+                alive = {pid for pid in alive if _pid_exists(pid)}
+            for pid in alive:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                    result['killed'] += 1
+                except OSError:
+                    pass
+
+        if self.group_id and result['killed']:
+            try:
+                os.killpg(self.group_id, signal.SIGKILL)
+            except OSError:
+                pass
+        self._processes.clear()
+        self.group_id = None
+        return result
+
+    def __bool__(self) -> bool:
+        return bool(self._processes) or bool(self.group_id)
+
+
+def _pid_exists(pid: int) -> bool:
+    try:
+        # Reap our own exited children first; a zombie still answers signal 0
+        if os.waitpid(pid, os.WNOHANG)[0] == pid:
+            return False
+    except ChildProcessError:
+        pass
+    try:
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,191 @@
+"""
+Sampling Profiler for TLS Web Monitor
+Samples every thread's Python stack at a fixed rate and aggregates collapsed stacks
+
+The sampler runs in a real OS thread (not an eventlet green thread, which
+would only run when the hub lets it) and reads sys._current_frames(), so the
+profiled code is never instrumented or slowed except for the brief moment
+each sample is taken. Duration, rate, stack depth and the number of distinct
+stacks are capped so a profile is safe on a small production instance.
+Under eventlet all green threads share the main OS thread; time spent idle
+in the hub shows up under the hub's wait frames.
+
+Output is the collapsed-stack format used by flamegraph tools
+("thread;outer;...;inner count") or a self-contained SVG flame graph.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+# The sampler must be a real OS thread even when eventlet has patched threading
+try:
+    from eventlet import patcher
+    _os_threading = patcher.original('threading')
+    _os_time = patcher.original('time')
+except ImportError:
+    _os_threading = threading
+    _os_time = time
+
+MAX_SECONDS = 60
+MAX_HZ = 250
+MAX_DEPTH = 64
+MAX_STACKS = 20000
+TRUNCATED_STACK = '[other stacks]'
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for path in sys.path:
+        if path and filename.startswith(path):
+            filename = os.path.relpath(filename, path)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _thread_names() -> Dict[int, str]:
+    names = {}
+    for module in (_os_threading, threading):
+        for thread in module.enumerate():
+            if thread.ident is not None:
+                names.setdefault(thread.ident, thread.name)
+    return names
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def profile(self, seconds: float, hz: float = 100) -> Optional[Dict]:
+        """Sample all threads for `seconds` (returns None if a profile is already running)"""
+        seconds = max(0.1, min(float(seconds), MAX_SECONDS))
+        hz = max(1.0, min(float(hz), MAX_HZ))
+        with self._lock:
+            if self._running:
+                return None
+            self._running = True
+
+        result = {}
+        sampler = _os_threading.Thread(target=self._sample, args=(seconds, hz, result), daemon=True,
+                                       name="Sampling-Profiler")
+        try:
+            sampler.start()
+            # Wait with the (possibly green) time.sleep so the eventlet hub keeps serving requests
+            while sampler.is_alive():
+                time.sleep(0.1)
+        finally:
+            self._running = False
+        return result
+
+    def _sample(self, seconds: float, hz: float, result: Dict):
+        """Sampler thread: take stack samples until the duration has passed"""
+        stacks = Counter()
+        own_ident = _os_threading.get_ident()
+        names = _thread_names()
+        interval = 1.0 / hz
+        samples = 0
+        sampling_time = 0.0
+        started = _os_time.monotonic()
+        deadline = started + seconds
+        next_sample = started
+
+        while True:
+            now = _os_time.monotonic()
+            if now >= deadline:
+                break
+            if next_sample > now:
+                _os_time.sleep(next_sample - now)
+            next_sample += interval
+
+            sample_started = _os_time.perf_counter()
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_DEPTH:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                if ident not in names:
+                    names = _thread_names()
+                labels.append(names.get(ident, f"thread-{ident}"))
+                stack = ';'.join(reversed(labels))
+                if stack not in stacks and len(stacks) >= MAX_STACKS:
+                    stack = TRUNCATED_STACK
+                stacks[stack] += 1
+            del frames
+            samples += 1
+            sampling_time += _os_time.perf_counter() - sample_started
+
+        elapsed = _os_time.monotonic() - started
+        result.update({
+            'stacks': stacks,
+            'samples': samples,
+            'seconds': round(elapsed, 3),
+            'hz': hz,
+            'overhead_percent': round(sampling_time / elapsed * 100, 2) if elapsed else 0
+        })
+
+
+def collapsed(stacks: Counter) -> str:
+    """Brendan Gregg's collapsed-stack format, heaviest stacks first"""
+    return '\n'.join(f"{stack} {count}" for stack, count in stacks.most_common()) + '\n'
+
+
+def flamegraph_svg(stacks: Counter, title: str = "Flame Graph", width: int = 1200) -> str:
+    """Render collapsed stacks as a self-contained SVG flame graph (hover for full frame names)"""
+    root = {'children': {}, 'count': 0}
+    for stack, count in stacks.items():
+        node = root
+        node['count'] += count
+        for label in stack.split(';'):
+            node = node['children'].setdefault(label, {'children': {}, 'count': 0})
+            node['count'] += count
+
+    total = root['count'] or 1
+    frame_height = 16
+    rects: List[Tuple[float, int, float, str, int]] = []
+    max_depth = 0
+
+    def layout(node: Dict, x: float, depth: int):
+        nonlocal max_depth
+        for label, child in sorted(node['children'].items()):
+            child_width = child['count'] / total * width
+            if child_width >= 0.5:
+                rects.append((x, depth, child_width, label, child['count']))
+                max_depth = max(max_depth, depth)
+                layout(child, x, depth + 1)
+            x += child_width
+
+    layout(root, 0.0, 0)
+    height = (max_depth + 1) * frame_height + 40
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="{width / 2}" y="16" text-anchor="middle" font-size="14">{escape(title)}</text>'
+    ]
+    for x, depth, rect_width, label, count in rects:
+        y = height - (depth + 1) * frame_height
+        hue = 10 + (hash(label) % 40)
+        text = escape(label)
+        chars = int(rect_width / 7)
+        shown = escape(label[:chars - 2] + '..') if 3 <= chars < len(label) else (text if chars >= len(label) else '')
+        parts.append(
+            f'<g><title>{text} ({count} samples, {count / total * 100:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{rect_width:.1f}" height="{frame_height - 1}" '
+            f'fill="hsl({hue},90%,60%)" rx="2"/>'
+            f'<text x="{x + 3:.1f}" y="{y + 11}">{shown}</text></g>'
+        )
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+sampling_profiler = SamplingProfiler()
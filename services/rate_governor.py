@@ -0,0 +1,203 @@
+"""
+Rate Governor for TLS Web Monitor
+Per-host token buckets shared by every monitor, cycle and retry
+
+Each navigation to a host must first take a token from that host's bucket
+and a concurrency slot. When a page looks throttled (HTTP 429/403 pages,
+captcha or bot challenges) the host enters an exponential backoff during
+which nothing is admitted; a clean navigation resets the backoff.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+THROTTLE_MARKERS = {
+    '429': ('error 429', '429 too many', 'too many requests', 'rate limit exceeded'),
+    '403': ('error 403', '403 forbidden', 'access denied', 'request blocked'),
+    # Not a bare 'captcha': pages protected by invisible reCAPTCHA mention it in their footer
+    'captcha': ('captcha challenge shown', 'are you a robot', 'verify you are human', 'checking your browser')
+}
+
+# Reads the title, shown challenges and the start of the body text so the check stays cheap.
+# Only challenge frames and widgets that are visible at a real size count: invisible reCAPTCHA
+# embeds its badge iframe and a hidden bframe on many normal pages.
+THROTTLE_PROBE_JS = """
+const shown = el => {
+    const rect = el.getBoundingClientRect(), style = getComputedStyle(el);
+    return rect.width >= 50 && rect.height >= 50 && rect.bottom > 0 && rect.right > 0 &&
+           style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+};
+const challenge = Array.from(document.querySelectorAll(
+    "iframe[src*='/recaptcha/api2/bframe'], iframe[src*='/recaptcha/enterprise/bframe'], " +
+    "iframe[src*='hcaptcha.com'][src*='frame=challenge'], iframe[src*='challenges.cloudflare.com'], " +
+    ".g-recaptcha:not([data-size='invisible']), .h-captcha:not([data-size='invisible']), .cf-turnstile, " +
+    "#challenge-form, #cf-challenge-running")).some(shown);
+return [document.title || '', challenge ? 'captcha challenge shown' : '',
+        (document.body ? document.body.innerText : '').slice(0, 500)].join('\\n');
+"""
+
+
+class ThrottledError(Exception):
+    """Raised when a governed navigation lands on a page that looks throttled"""
+
+    def __init__(self, signal: str):
+        super().__init__(f"Throttled by site ({signal})")
+        self.signal = signal
+
+
+def host_of(url: str) -> str:
+    """Host part of a URL (or the value itself if it is already a host)"""
+    return urlparse(url).netloc or url
+
+
+def classify_throttle(probe_text: str) -> Optional[str]:
+    """Map the throttle probe output to '429', '403' or 'captcha', or None if the page looks normal"""
+    text = (probe_text or '').lower()
+    for signal, markers in THROTTLE_MARKERS.items():
+        if any(marker in text for marker in markers):
+            return signal
+    return None
+
+
+class _HostState:
+    def __init__(self, rate_per_second: float, burst: int, max_concurrent: int):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.backoff_until = 0.0
+        self.consecutive_throttles = 0
+        self.admitted = 0
+        self.waited_seconds = 0.0
+        self.throttles = {}
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate_per_second)
+        self.refilled_at = now
+
+    def wait_needed(self, now: float) -> float:
+        """Seconds until a request could be admitted (0 if it can go now)"""
+        self.refill(now)
+        waits = [self.backoff_until - now]
+        if self.tokens < 1:
+            waits.append((1 - self.tokens) / self.rate_per_second)
+        if self.in_flight >= self.max_concurrent:
+            waits.append(1.0)  # Woken early by a release
+        return max(0.0, max(waits))
+
+
+class RateGovernor:
+    def __init__(self, requests_per_minute: float = 12, burst: int = 4, max_concurrent: int = 2,
+                 backoff_base_seconds: float = 60, backoff_max_seconds: float = 1800):
+        self.rate_per_second = max(0.001, requests_per_minute / 60.0)
+        self.burst = max(1, int(burst))
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._hosts = {}
+        self._condition = threading.Condition()
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate_per_second, self.burst, self.max_concurrent)
+        return state
+
+    @contextmanager
+    def admit(self, url: str, cancel_event: threading.Event = None, timeout: float = None):
+        """Block until the host has a token and a free slot, then hold the slot for the request"""
+        host = host_of(url)
+        started = time.monotonic()
+        with self._condition:
+            state = self._host(host)
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise InterruptedError("Stop requested while waiting for rate limit")
+                now = time.monotonic()
+                wait = state.wait_needed(now)
+                if wait <= 0:
+                    break
+                if timeout is not None and now - started + wait > timeout:
+                    raise TimeoutError(f"Rate limit for {host} not admitted within {timeout}s")
+                # Wake at least every second so a stop request is noticed promptly
+                self._condition.wait(timeout=min(wait, 1.0))
+            state.tokens -= 1
+            state.in_flight += 1
+            state.admitted += 1
+            state.waited_seconds += time.monotonic() - started
+        try:
+            yield
+        finally:
+            with self._condition:
+                state.in_flight -= 1
+                self._condition.notify_all()
+
+    def report_throttle(self, url: str, signal: str) -> float:
+        """Record a throttle signal for a host; returns the backoff in seconds"""
+        with self._condition:
+            state = self._host(host_of(url))
+            state.consecutive_throttles += 1
+            state.throttles[signal] = state.throttles.get(signal, 0) + 1
+            backoff = min(self.backoff_max_seconds,
+                          self.backoff_base_seconds * (2 ** (state.consecutive_throttles - 1)))
+            state.backoff_until = max(state.backoff_until, time.monotonic() + backoff)
+            state.tokens = 0.0  # Drain the bucket so the backoff is not followed by a burst
+            return backoff
+
+    def report_success(self, url: str):
+        """Clear the throttle streak after a normal page"""
+        with self._condition:
+            self._host(host_of(url)).consecutive_throttles = 0
+
+    def backoff_remaining(self, url: str) -> float:
+        """Seconds left in a host's throttle backoff"""
+        with self._condition:
+            state = self._hosts.get(host_of(url))
+            return max(0.0, state.backoff_until - time.monotonic()) if state else 0.0
+
+    def get_stats(self) -> Dict:
+        """Get per-host bucket, concurrency and backoff state"""
+        now = time.monotonic()
+        with self._condition:
+            hosts = {}
+            for host, state in self._hosts.items():
+                state.refill(now)
+                hosts[host] = {
+                    'tokens': round(state.tokens, 2),
+                    'in_flight': state.in_flight,
+                    'admitted': state.admitted,
+                    'mean_wait_seconds': round(state.waited_seconds / state.admitted, 3) if state.admitted else None,
+                    'backoff_remaining_seconds': round(max(0.0, state.backoff_until - now), 1),
+                    'consecutive_throttles': state.consecutive_throttles,
+                    'throttles': dict(state.throttles)
+                }
+        return {
+            'requests_per_minute': round(self.rate_per_second * 60, 2),
+            'burst': self.burst,
+            'max_concurrent': self.max_concurrent,
+            'hosts': hosts
+        }
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor(rate_config: Dict = None) -> Optional[RateGovernor]:
+    """Get the process-wide rate governor, creating it from `rate_config` on first use"""
+    global _governor
+    with _governor_lock:
+        if _governor is None and rate_config is not None:
+            _governor = RateGovernor(
+                requests_per_minute=rate_config.get('requests_per_minute', 12),
+                burst=rate_config.get('burst', 4),
+                max_concurrent=rate_config.get('max_concurrent', 2),
+                backoff_base_seconds=rate_config.get('backoff_base_seconds', 60),
+                backoff_max_seconds=rate_config.get('backoff_max_seconds', 1800)
+            )
+        return _governor
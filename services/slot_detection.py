@@ -0,0 +1,29 @@
+"""
+Slot Detection Rules for TLS Web Monitor
+Pure page-classification logic shared by the live monitor and offline backtesting
+"""
+
+from typing import List, Optional, Tuple
+
+# Verdicts for a calendar page
+NO_SLOTS = 'no_slots'
+POTENTIAL_SLOTS = 'potential_slots'
+
+NO_APPOINTMENT_TEXTS = [
+    "we currently don't have any appointment slots available",
+    "no slots are currently available",
+    "currently don't have any appointment slots"
+]
+
+
+def classify_page(html: str, no_appointment_texts: List[str] = None) -> Tuple[str, Optional[str]]:
+    """Classify a calendar page, returning (verdict, matched no-appointment text)
+
+    A page is "potential slots" whenever none of the no-appointment texts is
+    present, so unknown pages err on the side of notifying.
+    """
+    page_source = html.lower()
+    for text in (NO_APPOINTMENT_TEXTS if no_appointment_texts is None else no_appointment_texts):
+        if text.lower() in page_source:
+            return NO_SLOTS, text
+    return POTENTIAL_SLOTS, None
@@ -0,0 +1,97 @@
+"""
+Static Assets for TLS Web Monitor
+Content-hashed file names and precompressed variants for the dashboard assets
+
+On startup every file under the static folder is read once, named after the
+hash of its content (css/style.css -> css/style.3f9a1c2b7d4e.css) and
+compressed with gzip and, when the brotli package is installed, brotli.
+Templates keep calling url_for('static', filename='css/style.css'); the
+app rewrites that to the hashed name, which is served with an immutable
+one-year cache. A changed file gets a new name, so browsers never see a
+stale asset and repeat loads fetch nothing.
+"""
+
+import os
+import gzip
+import hashlib
+import mimetypes
+from typing import Dict, Optional, Tuple
+
+# Check if brotli is available
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+HASH_LENGTH = 12
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_COMPRESS_BYTES = 512
+
+
+class StaticAsset:
+    def __init__(self, path: str, content: bytes):
+        self.path = path
+        self.digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+        root, ext = os.path.splitext(path)
+        self.hashed_path = f"{root}.{self.digest}{ext}"
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.variants = {'identity': content}
+
+        if self.mimetype.startswith(COMPRESSIBLE_TYPES) and len(content) >= MIN_COMPRESS_BYTES:
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                self.variants['gzip'] = compressed
+            if BROTLI_AVAILABLE:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < len(content):
+                    self.variants['br'] = compressed
+
+    def negotiate(self, accept_encoding: str) -> Tuple[str, bytes, str]:
+        """Pick the smallest variant the client accepts: (encoding, body, etag)"""
+        accepted = {token.split(';')[0].strip() for token in (accept_encoding or '').lower().split(',')}
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and encoding in accepted:
+                return encoding, self.variants[encoding], f'"{self.digest}-{encoding}"'
+        return 'identity', self.variants['identity'], f'"{self.digest}"'
+
+
+class AssetManifest:
+    def __init__(self, static_dir: str):
+        self.static_dir = static_dir
+        self._by_path = {}
+        self._by_hashed_path = {}
+        self.build()
+
+    def build(self):
+        """Hash and compress every file in the static folder"""
+        by_path, by_hashed_path = {}, {}
+        for root, _, files in os.walk(self.static_dir):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.static_dir).replace(os.sep, '/')
+                with open(full_path, 'rb') as f:
+                    asset = StaticAsset(path, f.read())
+                by_path[path] = asset
+                by_hashed_path[asset.hashed_path] = asset
+        self._by_path, self._by_hashed_path = by_path, by_hashed_path
+
+    def hashed(self, path: str) -> str:
+        """The fingerprinted name for a static path (unchanged if it is not in the manifest)"""
+        asset = self._by_path.get(path)
+        return asset.hashed_path if asset else path
+
+    def lookup(self, path: str) -> Tuple[Optional[StaticAsset], bool]:
+        """Find an asset by hashed or plain path: (asset, is_fingerprinted)"""
+        if path in self._by_hashed_path:
+            return self._by_hashed_path[path], True
+        return self._by_path.get(path), False
+
+    def get_stats(self) -> Dict:
+        assets = {}
+        for path, asset in self._by_path.items():
+            assets[path] = {
+                'hashed_path': asset.hashed_path,
+                'bytes': {encoding: len(body) for encoding, body in asset.variants.items()}
+            }
+        return {'brotli_available': BROTLI_AVAILABLE, 'assets': assets}
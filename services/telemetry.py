@@ -0,0 +1,149 @@
+"""
+Telemetry Sampler for TLS Web Monitor
+Records low-overhead system metrics in a bounded ring buffer
+
+tmp_fs_used_bytes and shm_fs_used_bytes are the used space of the whole
+filesystem holding /tmp and /dev/shm (one statvfs call each), not the size of
+this monitor's own profiles and captures; /api/janitor reports those.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+# Check if psutil is available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Fields reported as the bucket maximum when downsampling (peaks matter more than averages)
+PEAK_FIELDS = ('loop_lag_ms', 'chrome_rss_bytes', 'chrome_processes')
+
+
+class TelemetrySampler:
+    def __init__(self, interval_seconds: float = 5.0, capacity: int = 720):
+        self.interval_seconds = max(0.5, float(interval_seconds))
+        self._samples = deque(maxlen=max(1, int(capacity)))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+        self._tmp_dirs = [d for d in dict.fromkeys(['/tmp', '/dev/shm', tempfile.gettempdir()]) if os.path.isdir(d)]
+
+    def start(self):
+        """Start the background sampling thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Telemetry-Sampler")
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background sampling thread"""
+        self._stop_event.set()
+
+    def is_running(self) -> bool:
+        """Check if the sampler thread is alive"""
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        """Sampling loop; loop lag is how late each wake-up is versus the requested interval"""
+        lag_ms = 0.0
+        while not self._stop_event.is_set():
+            try:
+                sample = self.collect_sample()
+                sample['loop_lag_ms'] = round(lag_ms, 2)
+                with self._lock:
+                    self._samples.append(sample)
+            except Exception as e:
+                print(f"[TELEMETRY] Sample failed: {e}")
+
+            # time.sleep is green under eventlet, so any overshoot is time the hub spent elsewhere
+            started = time.monotonic()
+            time.sleep(self.interval_seconds)
+            lag_ms = max(0.0, (time.monotonic() - started - self.interval_seconds) * 1000)
+
+    def collect_sample(self) -> Dict:
+        """Collect a single sample of process, Chrome and temp storage metrics"""
+        sample = {'t': round(time.time(), 3)}
+
+        if self._process:
+            with self._process.oneshot():
+                sample['cpu_percent'] = self._process.cpu_percent(interval=None)
+                sample['rss_bytes'] = self._process.memory_info().rss
+                if hasattr(self._process, 'num_fds'):
+                    sample['fd_count'] = self._process.num_fds()
+
+            # Chrome and chromedriver are spawned as descendants of this process
+            chrome_rss = 0
+            chrome_count = 0
+            for child in self._process.children(recursive=True):
+                try:
+                    if 'chrome' in child.name().lower():
+                        chrome_rss += child.memory_info().rss
+                        chrome_count += 1
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            sample['chrome_rss_bytes'] = chrome_rss
+            sample['chrome_processes'] = chrome_count
+
+        # Filesystem-wide usage: statvfs is constant-time, unlike summing every file
+        for temp_dir in self._tmp_dirs:
+            try:
+                key = 'shm_fs_used_bytes' if temp_dir == '/dev/shm' else 'tmp_fs_used_bytes'
+                if key not in sample:
+                    sample[key] = shutil.disk_usage(temp_dir).used
+            except OSError:
+                continue
+
+        return sample
+
+    def latest(self) -> Optional[Dict]:
+        """Get the most recent sample"""
+        with self._lock:
+            return dict(self._samples[-1]) if self._samples else None
+
+    def get_series(self, max_points: int = 120, since: float = None) -> List[Dict]:
+        """Get recorded samples, downsampled into at most max_points buckets"""
+        with self._lock:
+            samples = list(self._samples)
+
+        if since is not None:
+            samples = [s for s in samples if s['t'] >= since]
+
+        max_points = max(1, int(max_points))
+        if len(samples) <= max_points:
+            return samples
+
+        bucket_size = -(-len(samples) // max_points)  # Ceiling division
+        return [self._merge_bucket(samples[i:i + bucket_size]) for i in range(0, len(samples), bucket_size)]
+
+    def _merge_bucket(self, bucket: List[Dict]) -> Dict:
+        """Merge a bucket of samples into one point (mean, or max for peak fields)"""
+        merged = {'t': bucket[-1]['t'], 'n': len(bucket)}
+        keys = {k for s in bucket for k in s if k != 't'}
+        for key in keys:
+            values = [s[key] for s in bucket if key in s]
+            if key in PEAK_FIELDS:
+                merged[key] = max(values)
+            else:
+                merged[key] = round(sum(values) / len(values), 2)
+        return merged
+
+    def get_info(self) -> Dict:
+        """Get sampler configuration and fill level"""
+        with self._lock:
+            count = len(self._samples)
+        return {
+            'running': self.is_running(),
+            'interval_seconds': self.interval_seconds,
+            'capacity': self._samples.maxlen,
+            'samples': count,
+            'psutil_available': PSUTIL_AVAILABLE
+        }
@@ -0,0 +1,235 @@
+"""
+Temp Janitor for TLS Web Monitor
+Reclaims Chrome profiles, crash dumps and download leftovers that no live process owns
+
+A clean stop removes the monitor's profile directory, but a crash or OOM kill
+leaves chrome_user_data_* (and chrome_shared_*) profiles, Chrome's own
+.com.google.Chrome.* scratch directories, Crashpad dumps and SeleniumBase
+downloads behind. /tmp is often tmpfs, so they count against RAM.
+
+The janitor runs at startup and then periodically. An artifact is in use if
+a live process was started with it as --user-data-dir, if its SingletonLock
+points at a live process, or (for Chrome scratch directories, which carry no
+owner) if a live Chrome started before it was last modified. Artifacts
+younger than `min_age_seconds` are left alone so a launch in progress is
+never raced. Orphans are removed oldest-first until the artifacts left take
+no more than `budget_bytes`.
+"""
+
+import os
+import re
+import time
+import shutil
+import fnmatch
+import tempfile
+import threading
+from typing import Dict, List, Optional, Set
+
+# Check if psutil is available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PROFILE_PATTERNS = ('chrome_user_data_*', 'chrome_shared_*')
+SCRATCH_PATTERNS = ('.com.google.Chrome.*', '.org.chromium.Chromium.*', 'Crashpad', '*.dmp')
+DOWNLOAD_KEEP_PATTERNS = ('*driver*', '*.lock')  # SeleniumBase keeps its drivers next to downloads
+USER_DATA_DIR_ARG = re.compile(r'--user-data-dir=(.+)')
+# The PID of the process that created one of our profiles is part of its name
+OWNER_PID_PATTERNS = (re.compile(r'^chrome_user_data_\d+_(\d+)_'), re.compile(r'^chrome_shared_(\d+)_'))
+
+
+def path_size(path: str) -> int:
+    """Total size of a file or directory tree (symlinks are not followed)"""
+    try:
+        if not os.path.isdir(path) or os.path.islink(path):
+            return os.lstat(path).st_size
+    except OSError:
+        return 0
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files + dirs:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _pid_alive(pid: int) -> bool:
+    if PSUTIL_AVAILABLE:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+        return True
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+
+class TempJanitor:
+    def __init__(self, budget_bytes: int = 64 * 1024 * 1024, interval_seconds: float = 900,
+                 min_age_seconds: float = 600, temp_dirs: List[str] = None, downloads_dir: str = 'downloaded_files'):
+        self.budget_bytes = budget_bytes
+        self.interval_seconds = interval_seconds
+        self.min_age_seconds = min_age_seconds
+        self.temp_dirs = temp_dirs or [d for d in dict.fromkeys(['/tmp', '/dev/shm', tempfile.gettempdir()])
+                                       if os.path.isdir(d)]
+        self.downloads_dir = downloads_dir
+        self._lock = threading.Lock()  # One sweep at a time
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._stats = {'runs': 0, 'reclaimed_bytes': 0, 'reclaimed_items': 0, 'failures': 0, 'last_run': None}
+        self._last_report = None
+
+    def start(self):
+        """Sweep once now, then periodically in a background thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Temp-Janitor")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                report = self.sweep()
+                if report['reclaimed_bytes']:
+                    print(f"[JANITOR] Reclaimed {report['reclaimed_bytes'] / 1024 / 1024:.1f} MB "
+                          f"from {len(report['reclaimed'])} orphaned artifact(s)")
+            except Exception as e:
+                print(f"[JANITOR] Sweep failed: {e}")
+            self._stop_event.wait(self.interval_seconds)
+
+    def _find_artifacts(self) -> List[Dict]:
+        """Candidate artifacts with their kind, size and last modification time"""
+        artifacts = []
+        for temp_dir in self.temp_dirs:
+            try:
+                names = os.listdir(temp_dir)
+            except OSError:
+                continue
+            for name in names:
+                if any(fnmatch.fnmatch(name, pattern) for pattern in PROFILE_PATTERNS):
+                    kind = 'profile'
+                elif any(fnmatch.fnmatch(name, pattern) for pattern in SCRATCH_PATTERNS):
+                    kind = 'scratch'
+                else:
+                    continue
+                artifacts.append({'path': os.path.join(temp_dir, name), 'kind': kind})
+
+        if self.downloads_dir and os.path.isdir(self.downloads_dir):
+            for name in os.listdir(self.downloads_dir):
+                if not any(fnmatch.fnmatch(name, pattern) for pattern in DOWNLOAD_KEEP_PATTERNS):
+                    artifacts.append({'path': os.path.join(self.downloads_dir, name), 'kind': 'download'})
+
+        for artifact in artifacts:
+            try:
+                artifact['mtime'] = os.lstat(artifact['path']).st_mtime
+            except OSError:
+                artifact['mtime'] = None
+            artifact['bytes'] = path_size(artifact['path'])
+        return [artifact for artifact in artifacts if artifact['mtime'] is not None]
+
+    @staticmethod
+    def _live_processes() -> Dict:
+        """Profile directories passed to live processes and the start time of the oldest live Chrome"""
+        in_use: Set[str] = set()
+        oldest_chrome: Optional[float] = None
+        if not PSUTIL_AVAILABLE:
+            return {'in_use': in_use, 'oldest_chrome': None, 'known': False}
+        for process in psutil.process_iter(['name', 'cmdline', 'create_time']):
+            try:
+                cmdline = process.info['cmdline'] or []
+                for arg in cmdline:
+                    match = USER_DATA_DIR_ARG.match(arg)
+                    if match:
+                        in_use.add(os.path.realpath(match.group(1)))
+                if 'chrome' in (process.info['name'] or '').lower():
+                    created = process.info['create_time']
+                    oldest_chrome = created if oldest_chrome is None else min(oldest_chrome, created)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return {'in_use': in_use, 'oldest_chrome': oldest_chrome, 'known': True}
+
+    @staticmethod
+    def _singleton_owner_alive(profile_dir: str) -> bool:
+        """Chrome's SingletonLock symlink points at '<hostname>-<pid>' while the profile is open"""
+        try:
+            target = os.readlink(os.path.join(profile_dir, 'SingletonLock'))
+        except OSError:
+            return False
+        pid = target.rsplit('-', 1)[-1]
+        return pid.isdigit() and _pid_alive(int(pid))
+
+    def _is_in_use(self, artifact: Dict, live: Dict) -> bool:
+        if artifact['kind'] == 'profile':
+            if os.path.realpath(artifact['path']) in live['in_use']:
+                return True
+            if self._singleton_owner_alive(artifact['path']):
+                return True
+            if not live['known']:
+                # Without psutil, trust the creating PID embedded in our own profile names
+                name = os.path.basename(artifact['path'])
+                for pattern in OWNER_PID_PATTERNS:
+                    match = pattern.match(name)
+                    if match:
+                        return _pid_alive(int(match.group(1)))
+                return True  # No owner PID in the name: cannot tell, so keep it
+            return False
+        if artifact['kind'] == 'scratch':
+            if not live['known']:
+                return True  # Cannot tell who owns it
+            return live['oldest_chrome'] is not None and live['oldest_chrome'] <= artifact['mtime']
+        return False
+
+    def sweep(self) -> Dict:
+        """Remove orphaned artifacts, oldest first, until the remaining ones fit the byte budget"""
+        with self._lock:
+            now = time.time()
+            artifacts = self._find_artifacts()
+            live = self._live_processes()
+            total_bytes = sum(artifact['bytes'] for artifact in artifacts)
+            orphans = sorted((artifact for artifact in artifacts
+                              if now - artifact['mtime'] >= self.min_age_seconds and not self._is_in_use(artifact, live)),
+                             key=lambda artifact: artifact['mtime'])
+
+            reclaimed = []
+            for artifact in orphans:
+                if total_bytes <= self.budget_bytes:
+                    break
+                try:
+                    if os.path.isdir(artifact['path']) and not os.path.islink(artifact['path']):
+                        shutil.rmtree(artifact['path'])
+                    else:
+                        os.remove(artifact['path'])
+                except OSError:
+                    self._stats['failures'] += 1
+                    continue
+                total_bytes -= artifact['bytes']
+                reclaimed.append({'path': artifact['path'], 'kind': artifact['kind'], 'bytes': artifact['bytes']})
+
+            reclaimed_bytes = sum(item['bytes'] for item in reclaimed)
+            self._stats['runs'] += 1
+            self._stats['reclaimed_bytes'] += reclaimed_bytes
+            self._stats['reclaimed_items'] += len(reclaimed)
+            self._stats['last_run'] = now
+            self._last_report = {
+                'artifacts': len(artifacts),
+                'orphans': len(orphans),
+                'reclaimed': reclaimed,
+                'reclaimed_bytes': reclaimed_bytes,
+                'remaining_bytes': total_bytes,
+                'budget_bytes': self.budget_bytes
+            }
+            return self._last_report
+
+    def get_stats(self) -> Dict:
+        return dict(self._stats, last_report=self._last_report,
+                    running=bool(self._thread and self._thread.is_alive()),
+                    temp_dirs=self.temp_dirs, interval_seconds=self.interval_seconds)
@@ -12,9 +12,10 @@ import threading
 import sys
 import tempfile
 import uuid
+import json
 import shutil
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -26,13 +27,22 @@ except ImportError:
     SELENIUMBASE_AVAILABLE = False
 
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+
+from services.environment import get_environment, resolve_driver_binary
+from services.process_tree import ProcessTree, child_processes
+from services.browser_backends import SeleniumBackend, CDPBackend
+from services.browser_pool import PooledBrowser, get_browser_pool
+from services.browser_contexts import get_shared_chrome
+from services.rate_governor import get_rate_governor, classify_throttle, THROTTLE_PROBE_JS, ThrottledError
+from services.hot_standby import HotStandby
+from services.failure_policy import CircuitBreaker, classify_failure, ACTIONS, SESSION, TRANSIENT, UNKNOWN
+from services.capture_store import get_capture_store
+from services.evidence_store import get_evidence_store
+from services.slot_detection import classify_page
+from services.network_waterfall import build_entries, summarize
 
 try:
     import win10toast
@@ -43,21 +53,101 @@ except ImportError:
 # UC control flag - set TLS_ENABLE_UC=1 to force UC in cloud (not recommended for stability)
 TLS_ENABLE_UC = os.environ.get("TLS_ENABLE_UC") == "1"
 
+# Minimal stable Chrome flags shared by the Selenium and CDP backends
+STABLE_CHROME_FLAGS = [
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-extensions',
+    '--disable-sync',
+    '--disable-translate',
+    '--hide-scrollbars',
+    '--mute-audio',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-features=TranslateUI',
+    '--disable-blink-features=AutomationControlled',
+    '--remote-debugging-port=0'  # Use random port to avoid conflicts
+]
+
 class TLSWebMonitor:
-    def __init__(self, config: Dict, socketio=None):
+    def __init__(self, config: Dict, socketio=None, logger=None):
         self.config = config
         self.socketio = socketio
         self.driver = None
+        self.browser = None  # BrowserBackend wrapping the active browser
         self._is_seleniumbase = False
-        self.logger = self._setup_logging()
+        # Helper instances (hot standby) share their owner's logger instead of rebuilding its handlers
+        self.logger = logger or self._setup_logging()
         self._running = False
         self._initializing = False  # Flag to track driver initialization
         self._stop_event = threading.Event()
+        self._draining = False  # Shutdown drain: finish the in-flight cycle but schedule no further ones
         self._last_check_time = None
         self._total_checks = 0
         self._error_count = 0
+        self._retry_count = 0
         self._browser_port = None
         self._temp_user_data_dir = None  # Store temp directory for cleanup
+        self._browser_tree = None  # Processes spawned by this monitor's browser launch
+        self._log_label = None  # Prefix for console/file logs of helper instances (hot standby)
+        self._cycle_round_trips = None  # Browser commands sent during the last check cycle
+        self._cycle_network = None  # Network waterfall summary of the last check cycle
+        self._launch_baseline = set()  # Child processes that existed before the current launch
+        self._cycle_snapshots = []  # Snapshot hashes captured during the current cycle
+        self._capture_store = None
+        capture_config = config.get("capture_store", {})
+        if capture_config.get("enabled", True):
+            try:
+                self._capture_store = get_capture_store(max_bytes=int(capture_config.get("max_megabytes", 50) * 1024 * 1024))
+            except Exception as e:
+                print(f"[CAPTURE] Capture store unavailable: {e}")
+        # Evidence screenshots of months that look like they have slots
+        self._evidence_store = None
+        evidence_config = config.get("evidence", {})
+        if evidence_config.get("enabled", True):
+            try:
+                self._evidence_store = get_evidence_store(
+                    max_files=evidence_config.get("max_files", 200),
+                    max_bytes=int(evidence_config.get("max_megabytes", 100) * 1024 * 1024)
+                )
+            except Exception as e:
+                print(f"[EVIDENCE] Evidence store unavailable: {e}")
+        # Shared browser pool: browsers are leased per check cycle instead of owned
+        self._pool = None
+        self._lease = None
+        self._lease_lock = threading.Lock()
+        pool_config = config.get("browser_pool", {})
+        if pool_config.get("enabled", False):
+            self._pool = get_browser_pool(pool_config)
+        # Shared per-host rate governor: every navigation is admitted through it
+        rate_config = config.get("rate_limit", {})
+        self._governor = get_rate_governor(rate_config) if rate_config.get("enabled", True) else None
+        # Failure classification and circuit breaker (replaces stopping after max_retries)
+        policy_config = config.get("failure_policy", {})
+        self._breaker = CircuitBreaker(
+            failure_threshold=config.get("max_retries", 3),
+            backoff_base_seconds=policy_config.get("backoff_base_seconds", 60),
+            backoff_max_seconds=policy_config.get("backoff_max_seconds", 1800)
+        )
+        self._last_failure = None  # (phase, exception) of the current cycle's failure
+        # Liveness probing: a timer probes the browser shortly before each cycle and rebuilds it off-thread
+        self._liveness_timer = None
+        self._rebuild_lock = threading.Lock()
+        self._liveness_stats = {'probes': 0, 'failures': 0, 'background_rebuilds': 0,
+                                'inline_rebuilds': 0, 'last_probe_ms': None}
+        self._hot_standby = None
+        self._parked_on_booking = False  # Browser adopted from a logged-in standby is already on the booking page
+        # Checkpoint/resume state
+        self._in_cycle = False
+        self._next_check_at = None  # Wall-clock time of the next scheduled check
+        self._last_results = None
+        self._restored_cookies = None
+        self._warm_session = False  # Restored cookies may still be logged in
+        self._resume_delay = 0
+        self._calendar_month = 0  # Months the booking calendar has been paged past the current one
         # Instance identifier (used only for debug/status; safe accessor via getattr elsewhere)
         try:
             self._instance_id = uuid.uuid4().hex[:8]
@@ -121,6 +211,8 @@ class TLSWebMonitor:
     
     def _emit_log(self, level: str, message: str):
         """Emit log message to web interface and console (no duplication)"""
+        if self._log_label:
+            message = f"[{self._log_label}] {message}"
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'level': level,
@@ -175,19 +267,20 @@ class TLSWebMonitor:
             elapsed += sleep_time
     
     def _cleanup_failed_chrome_attempt(self):
-        """Clean up any leftover Chrome processes and user data after failed initialization"""
+        """Clean up the Chrome processes and user data left by this monitor's failed initialization"""
         try:
-            # Kill any stray Chrome/ChromeDriver processes
-            import subprocess
-            
-            # Find and kill Chrome processes
-            for process_name in ['chrome', 'google-chrome', 'google-chrome-stable', 'chromedriver']:
-                try:
-                    result = subprocess.run(['pkill', '-f', process_name], capture_output=True, timeout=5)
-                    if result.returncode == 0:
-                        self._emit_log('info', f"🗑️ Killed stray {process_name} processes")
-                except Exception:
-                    pass
+            # Kill only what this launch attempt spawned (other monitors' browsers keep running)
+            tree = ProcessTree.spawned_since(self._launch_baseline, self._temp_user_data_dir)
+            if self.driver or self.browser:
+                target = self.browser or self.driver
+                root_pid = target.root_pid() if hasattr(target, 'root_pid') else None
+                if root_pid:
+                    tree.add(root_pid)
+            if tree:
+                result = tree.terminate(timeout=3)
+                self._emit_log('info', f"🗑️ Stopped {result['terminated'] + result['killed']} processes from the failed launch")
+            self.browser = None
+            self.driver = None
             
             # Clean up temp user data directory if it exists
             if self._temp_user_data_dir and os.path.exists(self._temp_user_data_dir):
@@ -198,69 +291,63 @@ class TLSWebMonitor:
                     self._temp_user_data_dir = None
                 except Exception as e:
                     self._emit_log('warning', f"Could not clean up user data dir: {e}")
-                    
-            # Small delay to let processes fully terminate
-            import time
-            time.sleep(0.5)
             
         except Exception as e:
             self._emit_log('warning', f"Error during Chrome cleanup: {e}")
 
     def _setup_driver(self):
+        """Launch the browser and record the process tree it spawned"""
+        # Tear down this monitor's previous browser tree, if one is left (never anyone else's)
+        self._kill_browser_tree()
+        self._launch_baseline = child_processes()
+        try:
+            self._launch_driver()
+        except Exception:
+            self._cleanup_failed_chrome_attempt()
+            raise
+        if self.browser and self.browser.root_pid():
+            self._browser_tree = ProcessTree.capture(self.browser.root_pid(), own_group=self.browser.name == 'cdp')
+    
+    def _kill_browser_tree(self, timeout: float = 5):
+        """Terminate the processes of this monitor's browser, escalating to SIGKILL after the timeout"""
+        tree, self._browser_tree = self._browser_tree, None
+        if tree:
+            result = tree.terminate(timeout=timeout)
+            if result['killed']:
+                self._emit_log('warning', f"Force-killed {result['killed']} browser processes that ignored SIGTERM")
+    
+    def _launch_driver(self):
         """Initialize the browser driver with cloud-stable configuration"""
         instance_id = getattr(self, '_instance_id', 'unknown')
         print(f"[DEBUG] {instance_id} - Setting up Chrome WebDriver")
         
-        # Detect cloud deployment platforms
-        is_render = os.environ.get('RENDER_SERVICE_NAME') is not None
-        is_koyeb = os.environ.get('KOYEB_SERVICE_NAME') is not None
-        is_railway = os.environ.get('RAILWAY_ENVIRONMENT') is not None
-        is_heroku = os.environ.get('HEROKU_APP_NAME') is not None
-        is_cloud_deployment = any([is_render, is_koyeb, is_railway, is_heroku, os.environ.get('PORT')])
+        # Platform and Chrome location come from the cached startup probe
+        environment = get_environment()
+        platform = environment.platform
+        is_render = platform == "Render"
+        is_cloud_deployment = environment.is_cloud
+        
+        # Backend selection: "auto" keeps UC-when-possible with a Selenium fallback
+        backend = self.config.get("browser_backend", "auto")
         
         # Disable UC in cloud unless explicitly forced via environment variable
         use_uc = (
-            self.config.get("use_seleniumbase_uc", False)
+            not self._uses_browser_contexts()
+            and backend in ("auto", "seleniumbase")
+            and (self.config.get("use_seleniumbase_uc", False) or backend == "seleniumbase")
             and SELENIUMBASE_AVAILABLE
             and (not is_cloud_deployment or TLS_ENABLE_UC)
         )
         
-        # Clean up any stray Chrome processes from previous runs
-        if is_cloud_deployment:
-            try:
-                import subprocess
-                process_names = ['chrome', 'google-chrome', 'google-chrome-stable', 'chromedriver', 'uc_driver']
-                for process_name in process_names:
-                    try:
-                        subprocess.run(['pkill', '-f', process_name], capture_output=True, timeout=2)
-                    except Exception:
-                        pass
-                # Small delay to let processes terminate
-                time.sleep(0.3)
-                self._emit_log('info', "🧹 Cleaned up any stray Chrome processes")
-            except Exception as e:
-                self._emit_log('info', f"Process cleanup note: {e}")
-        
         # Find Chrome binary in cloud environments
         chrome_binary = None
         if is_cloud_deployment:
-            platform = "Koyeb" if is_koyeb else "Render" if is_render else "Railway" if is_railway else "Heroku" if is_heroku else "Cloud"
             self._emit_log('info', f"🌐 Detected {platform} deployment - setting up Chrome...")
             
-            chrome_paths = [
-                '/usr/bin/google-chrome',
-                '/usr/bin/google-chrome-stable',
-                '/usr/bin/chromium-browser',
-                '/usr/bin/chromium'
-            ]
-            
-            for path in chrome_paths:
-                if os.path.exists(path) and os.access(path, os.X_OK):
-                    chrome_binary = path
-                    self._emit_log('info', f"✅ Found Chrome: {chrome_binary}")
-                    break
-                    
-            if not chrome_binary:
+            chrome_binary = environment.chrome_binary
+            if chrome_binary:
+                self._emit_log('info', f"✅ Found Chrome: {chrome_binary}")
+            else:
                 raise RuntimeError(f"Chrome binary not found on {platform} - Chrome installation required")
         
         # Try SeleniumBase UC mode (only if not in cloud or explicitly enabled)
@@ -269,8 +356,10 @@ class TLSWebMonitor:
                 self._emit_log('info', "🚀 Initializing SeleniumBase UC mode...")
                 if chrome_binary:
                     os.environ['CHROME_BIN'] = chrome_binary
-                self.driver = Driver(uc=True, headless=is_cloud_deployment or is_render)
+                self.driver = Driver(uc=True, headless=is_cloud_deployment or is_render,
+                                     log_cdp_events=self._network_capture_enabled())
                 self._is_seleniumbase = True
+                self.browser = SeleniumBackend(self.driver, is_seleniumbase=True)
                 self._emit_log('info', "✅ SeleniumBase UC driver initialized successfully")
                 return
             except Exception as e:
@@ -278,49 +367,35 @@ class TLSWebMonitor:
                 self._cleanup_failed_chrome_attempt()
                 self._emit_log('info', "🔄 Falling back to regular Selenium WebDriver...")
         
+        # Headless mode for cloud or user preference
+        headless_mode = True if is_cloud_deployment else self.config.get("headless_mode", False)
+        
+        if self._uses_browser_contexts():
+            self._setup_context_backend(chrome_binary or environment.chrome_binary, headless_mode)
+            return
+        
+        if backend == "cdp":
+            self._setup_cdp_backend(chrome_binary or environment.chrome_binary, headless_mode)
+            return
+        
         # Regular Selenium WebDriver setup with minimal, stable flags
         self._emit_log('info', "🔧 Using regular Selenium WebDriver")
         self._is_seleniumbase = False
         
         options = Options()
         
-        # Headless mode for cloud or user preference
-        headless_mode = True if is_cloud_deployment else self.config.get("headless_mode", False)
         if headless_mode:
             options.add_argument('--headless=new')
         
-        # Minimal stable Chrome flags (remove duplicates and problematic ones)
-        stable_flags = [
-            '--no-sandbox',
-            '--disable-gpu',
-            '--disable-dev-shm-usage',
-            '--disable-background-networking',
-            '--disable-default-apps',
-            '--disable-extensions',
-            '--disable-sync',
-            '--disable-translate',
-            '--hide-scrollbars',
-            '--mute-audio',
-            '--no-first-run',
-            '--no-default-browser-check',
-            '--disable-features=TranslateUI',
-            '--disable-blink-features=AutomationControlled',
-            '--remote-debugging-port=0'  # Use random port to avoid conflicts
-        ]
-        
-        for flag in stable_flags:
+        for flag in STABLE_CHROME_FLAGS:
             options.add_argument(flag)
         
-        # Create unique user data directory (use /tmp instead of /dev/shm for stability)
-        temp_dir = tempfile.gettempdir()
-        timestamp = int(time.time() * 1000)
-        process_id = os.getpid()
-        unique_user_data_dir = os.path.join(temp_dir, f"chrome_user_data_{timestamp}_{process_id}_{uuid.uuid4().hex[:8]}")
-        
-        os.makedirs(unique_user_data_dir, exist_ok=True)
+        unique_user_data_dir = self._create_user_data_dir()
         options.add_argument(f'--user-data-dir={unique_user_data_dir}')
-        self._temp_user_data_dir = unique_user_data_dir
-        self._emit_log('info', f"🗂️ Using user data directory: {unique_user_data_dir}")
+        
+        # Network waterfall capture reads DevTools events from the performance log
+        if self._network_capture_enabled():
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
         # Anti-automation detection
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -332,9 +407,8 @@ class TLSWebMonitor:
             self._emit_log('info', f"🎯 Chrome binary set to: {chrome_binary}")
         
         try:
-            # Use webdriver-manager to handle ChromeDriver
-            self._emit_log('info', "📦 Installing/updating ChromeDriver...")
-            service = Service(ChromeDriverManager().install())
+            # ChromeDriver is resolved through webdriver-manager on the first launch only
+            service = Service(resolve_driver_binary())
             
             self._emit_log('info', f"🚀 Starting Chrome WebDriver with {len(options.arguments)} arguments...")
             
@@ -347,92 +421,133 @@ class TLSWebMonitor:
             # Set timeouts
             self.driver.implicitly_wait(self.config.get("implicit_wait", 10))
             self.driver.set_page_load_timeout(self.config.get("page_load_timeout", 30))
+            self.browser = SeleniumBackend(self.driver)
             
             self._emit_log('info', "✅ Chrome WebDriver initialized successfully")
             
         except Exception as driver_error:
             self._emit_log('error', f"❌ Failed to initialize Chrome WebDriver: {driver_error}")
             if is_cloud_deployment:
-                platform = "Koyeb" if is_koyeb else "Render" if is_render else "Railway" if is_railway else "Heroku" if is_heroku else "Cloud"
                 self._emit_log('error', f"🔍 {platform} diagnostic information:")
                 self._emit_log('error', f"  Chrome binary: {chrome_binary}")
                 self._emit_log('error', f"  CHROME_BIN env: {os.environ.get('CHROME_BIN', 'Not set')}")
                 self._emit_log('error', f"🔧 Check {platform} build logs for Chrome installation issues")
             raise
     
+    def _uses_browser_contexts(self) -> bool:
+        """Context isolation: one browser context per monitor inside a shared Chrome"""
+        return self.config.get("browser_isolation", "process") == "context"
+    
+    def _hot_standby_enabled(self) -> bool:
+        return self.config.get("hot_standby", {}).get("enabled", False) and not self._pool
+    
+    def _setup_context_backend(self, chrome_binary: str, headless_mode: bool):
+        """Open an isolated browser context in the shared Chrome (launching it on first use)"""
+        if not chrome_binary:
+            raise RuntimeError("Context isolation requires a Chrome binary - set CHROME_BIN")
+        
+        self._is_seleniumbase = False
+        try:
+            chrome = get_shared_chrome(chrome_binary, STABLE_CHROME_FLAGS, headless=headless_mode)
+            self.browser = chrome.new_context(
+                implicit_wait=self.config.get("implicit_wait", 10),
+                page_load_timeout=self.config.get("page_load_timeout", 30)
+            )
+            self._browser_port = chrome.port
+            self._emit_log('info', f"🧩 Opened isolated browser context in shared Chrome (pid {chrome.process.pid})")
+        except Exception as e:
+            self._emit_log('error', f"❌ Failed to open browser context: {e}")
+            raise
+    
+    def _create_user_data_dir(self) -> str:
+        """Create a unique Chrome user data directory (in /tmp rather than /dev/shm for stability)"""
+        temp_dir = tempfile.gettempdir()
+        timestamp = int(time.time() * 1000)
+        process_id = os.getpid()
+        unique_user_data_dir = os.path.join(temp_dir, f"chrome_user_data_{timestamp}_{process_id}_{uuid.uuid4().hex[:8]}")
+        
+        os.makedirs(unique_user_data_dir, exist_ok=True)
+        self._temp_user_data_dir = unique_user_data_dir
+        self._emit_log('info', f"🗂️ Using user data directory: {unique_user_data_dir}")
+        return unique_user_data_dir
+    
+    def _setup_cdp_backend(self, chrome_binary: str, headless_mode: bool):
+        """Launch Chrome and drive it directly over the DevTools protocol"""
+        if not chrome_binary:
+            raise RuntimeError("CDP backend requires a Chrome binary - set CHROME_BIN")
+        
+        self._emit_log('info', "🔌 Using native Chrome DevTools backend")
+        self._is_seleniumbase = False
+        user_data_dir = self._create_user_data_dir()
+        try:
+            self.browser = CDPBackend.launch(
+                chrome_binary,
+                user_data_dir,
+                STABLE_CHROME_FLAGS,
+                headless=headless_mode,
+                implicit_wait=self.config.get("implicit_wait", 10),
+                page_load_timeout=self.config.get("page_load_timeout", 30)
+            )
+            self._browser_port = self.browser.port
+            self._emit_log('info', f"✅ Chrome DevTools backend connected on port {self._browser_port}")
+        except Exception as e:
+            self._emit_log('error', f"❌ Failed to start Chrome DevTools backend: {e}")
+            self._cleanup_failed_chrome_attempt()
+            raise
+    
     def login(self) -> bool:
         """Log in to TLS website starting from El-Sheikh Zayed page"""
         try:
+            if self._warm_session:
+                self._warm_session = False
+                if self._resume_session():
+                    return True
+            
             # Navigate to El-Sheikh Zayed page
             self._emit_log('info', "Navigating to El-Sheikh Zayed TLS page...")
-            self.driver.get(self.config["tls_url"])
+            self._governed(self.browser.navigate, self.config["tls_url"])
             self._human_delay(3, 5)
             
-            self._emit_log('info', f"Current URL: {self.driver.current_url}")
-            self._emit_log('info', f"Page title: {self.driver.title}")
-            
-            # Find and click LOGIN button
+            # URL, title and the LOGIN element (with its parent) in one probe
             self._emit_log('info', "Looking for LOGIN button...")
             login_selector = "//span[contains(text(), 'LOGIN')]"
+            page = self.browser.probe({'login': (login_selector, 'xpath')}, wait_for='login',
+                                      timeout=self.config.get("implicit_wait", 10))
+            login = page['elements']['login']
+            self._emit_log('info', f"Current URL: {page['url']}")
+            self._emit_log('info', f"Page title: {page['title']}")
             
-            if self._is_seleniumbase:
-                elements = self.driver.find_elements("xpath", login_selector)
-            else:
-                elements = self.driver.find_elements(By.XPATH, login_selector)
-            
-            if elements:
-                elem = elements[0]
-                self._emit_log('info', f"Found login element: {elem.tag_name}")
+            if login['count']:
+                tag_name = login['tag']
+                self._emit_log('info', f"Found login element: {tag_name}")
                 
                 # Click parent link if it's a span
-                if elem.tag_name == 'span':
-                    parent = elem.find_element(By.XPATH, "./..")
-                    if parent.tag_name == 'a':
+                if tag_name == 'span':
+                    parent_selector = f"({login_selector})[1]/.."
+                    if login['parent_tag'] == 'a':
                         self._emit_log('info', "Clicking parent link of LOGIN span")
-                        if self._is_seleniumbase:
-                            self.driver.execute_script("arguments[0].click();", parent)
-                        else:
-                            parent.click()
+                        self._governed(self.browser.click, parent_selector, by='xpath')
                 
                 self._human_delay(3, 5)
             else:
                 self._emit_log('warning', "Could not find LOGIN button, trying direct navigation")
-                self.driver.get(self.config["login_start_url"])
+                self._governed(self.browser.navigate, self.config["login_start_url"])
                 self._human_delay(3, 5)
             
             # Wait for login form and fill credentials
             self._emit_log('info', "Entering login credentials...")
             
             # Fill email
-            email_selector = "#email-input-field"
-            if self._is_seleniumbase:
-                self.driver.type(email_selector, self.config["login_credentials"]["email"])
-            else:
-                email_field = self.driver.find_element(By.CSS_SELECTOR, email_selector)
-                email_field.clear()
-                email_field.send_keys(self.config["login_credentials"]["email"])
-            
+            self.browser.type("#email-input-field", self.config["login_credentials"]["email"])
             self._human_delay(1, 2)
             
             # Fill password
-            password_selector = "#password-input-field"
-            if self._is_seleniumbase:
-                self.driver.type(password_selector, self.config["login_credentials"]["password"])
-            else:
-                password_field = self.driver.find_element(By.CSS_SELECTOR, password_selector)
-                password_field.clear()
-                password_field.send_keys(self.config["login_credentials"]["password"])
-            
+            self.browser.type("#password-input-field", self.config["login_credentials"]["password"])
             self._human_delay(1, 2)
             
             # Click login button
             self._emit_log('info', "Clicking login button...")
-            login_button_selector = "#btn-login"
-            if self._is_seleniumbase:
-                self.driver.click(login_button_selector)
-            else:
-                login_button = self.driver.find_element(By.CSS_SELECTOR, login_button_selector)
-                login_button.click()
+            self._governed(self.browser.click, "#btn-login")
             
             # Wait for login completion
             self._human_delay(3, 5)
@@ -441,32 +556,66 @@ class TLSWebMonitor:
             
         except Exception as e:
             self._emit_log('error', f"Login failed: {e}")
+            self._last_failure = ('login', e)
+            return False
+    
+    def _governed(self, action, *args, **kwargs):
+        """Run a navigation or page-changing submit through the rate governor and back off if the new page looks throttled"""
+        if not self._governor:
+            return action(*args, **kwargs)
+        
+        url = args[0] if action == self.browser.navigate else self.config["tls_url"]
+        with self._governor.admit(url, cancel_event=self._stop_event):
+            result = action(*args, **kwargs)
+        
+        try:
+            signal = classify_throttle(self.browser.evaluate(THROTTLE_PROBE_JS))
+        except Exception:
+            signal = None  # Page still loading; the next navigation is checked anyway
+        if signal:
+            backoff = self._governor.report_throttle(url, signal)
+            self._emit_log('warning', f"🚦 Throttling detected ({signal}) - backing off {int(backoff)}s")
+            raise ThrottledError(signal)
+        self._governor.report_success(url)
+        return result
+    
+    def _throttle_backoff(self) -> float:
+        """Seconds remaining in the target host's throttle backoff"""
+        return self._governor.backoff_remaining(self.config["tls_url"]) if self._governor else 0.0
+    
+    def _resume_session(self) -> bool:
+        """After a restart: check whether the restored cookies are still logged in"""
+        self._governed(self.browser.navigate, self.config["login_start_url"])
+        self._human_delay(2, 3)
+        if self.browser.count("#email-input-field"):
+            self._emit_log('info', "Restored session has expired - logging in again")
             return False
+        self._emit_log('info', "Login successful - resumed saved session")
+        return True
     
     def navigate_to_appointment_booking(self) -> bool:
         """Navigate to appointment booking section"""
         try:
-            wait = WebDriverWait(self.driver, 10)
-            
             # Click the Select button for the travel group
             select_button_selector = "[data-testid='btn-select-group']"
-            select_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, select_button_selector)))
-            select_button.click()
+            self.browser.wait_clickable(select_button_selector, timeout=10)
+            self._governed(self.browser.click, select_button_selector)
+            self._calendar_month = 0  # The calendar opens on the current month
             
             self._emit_log('info', "Navigated to appointment booking section")
             return True
             
         except Exception as e:
             self._emit_log('error', f"Failed to navigate to appointment booking: {e}")
+            self._last_failure = ('navigation', e)
             return False
     
-    def check_available_slots(self, month_offset: int = 0) -> List[Dict]:
-        """Check for available slots in a specific month"""
+    def check_available_slots(self, month_offset: int = 0, steps: int = None) -> List[Dict]:
+        """Check for available slots in a specific month (steps: next-month clicks to take, default month_offset)"""
         available_slots = []
+        steps = month_offset if steps is None else steps
         
         try:
-            wait = WebDriverWait(self.driver, 10)
-            
             # Handle current month (month_offset 0)
             if month_offset == 0:
                 time.sleep(3)  # Wait for page to load
@@ -474,14 +623,14 @@ class TLSWebMonitor:
                 # Click current month button to ensure we're viewing it
                 try:
                     current_month_selector = 'a[data-testid="btn-current-month-available"]'
-                    current_month_button = self.driver.find_element(By.CSS_SELECTOR, current_month_selector)
-                    month_text = current_month_button.text.strip()
-                    self._emit_log('info', f"Ensuring we're viewing current month: {month_text}")
+                    current_month = self.browser.probe({'month': current_month_selector})['elements']['month']
+                    if not current_month['count']:
+                        raise LookupError("Current month button not found")
+                    self._emit_log('info', f"Ensuring we're viewing current month: {current_month['text']}")
                     
-                    if self._is_seleniumbase:
-                        self.driver.execute_script("arguments[0].click();", current_month_button)
-                    else:
-                        current_month_button.click()
+                    # Calendar paging stays on the page, so it is not admitted through the governor
+                    self.browser.click(current_month_selector)
+                    self._calendar_month = 0
                     time.sleep(2)
                 except Exception:
                     pass  # Continue if current month button click fails
@@ -490,16 +639,13 @@ class TLSWebMonitor:
             elif month_offset > 0:
                 next_month_selector = 'a[data-testid="btn-next-month-available"]'
                 
-                for i in range(month_offset):
+                for i in range(steps):
                     try:
-                        next_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, next_month_selector)))
-                        month_text = next_button.text.strip()
+                        month_text = self.browser.wait_clickable(next_month_selector, timeout=10)
                         self._emit_log('info', f"Navigation step {i+1}: Clicking to navigate to {month_text}")
                         
-                        if self._is_seleniumbase:
-                            self.driver.execute_script("arguments[0].click();", next_button)
-                        else:
-                            next_button.click()
+                        self.browser.click(next_month_selector)
+                        self._calendar_month += 1
                         
                         time.sleep(3)
                         self._emit_log('info', f"Successfully navigated to: {month_text}")
@@ -509,17 +655,13 @@ class TLSWebMonitor:
                         break
             
             # Check for "no appointments" message
-            page_source = self.driver.page_source.lower()
-            no_appointment_texts = [
-                "we currently don't have any appointment slots available",
-                "no slots are currently available",
-                "currently don't have any appointment slots"
-            ]
-            
-            for text in no_appointment_texts:
-                if text in page_source:
-                    self._emit_log('info', f"No appointments available for month offset {month_offset}: {text}")
-                    return []
+            raw_source = self.browser.page_source()
+            verdict, matched_text = classify_page(raw_source)
+            snapshot_hash = self._capture_snapshot(month_offset, raw_source, verdict)
+            
+            if matched_text:
+                self._emit_log('info', f"No appointments available for month offset {month_offset}: {matched_text}")
+                return []
             
             # If no "no appointments" message found, potential slots available
             self._emit_log('warning', f"POTENTIAL SLOTS AVAILABLE for month offset {month_offset} - verify manually!")
@@ -527,7 +669,9 @@ class TLSWebMonitor:
                 'date': 'Unknown',
                 'time': 'Slots may be available (verify manually)',
                 'month_offset': month_offset,
-                'element_text': 'No "no appointments" message found'
+                'element_text': 'No "no appointments" message found',
+                'snapshot_hash': snapshot_hash,
+                'screenshot': self._capture_evidence(month_offset)
             }
             available_slots.append(slot_info)
             
@@ -535,7 +679,74 @@ class TLSWebMonitor:
             
         except Exception as e:
             self._emit_log('error', f"Error checking month offset {month_offset}: {e}")
-            return []
+            raise
+    
+    def _reset_calendar(self):
+        """Page the booking calendar back to the current month"""
+        current_month_selector = 'a[data-testid="btn-current-month-available"]'
+        self.browser.wait_clickable(current_month_selector, timeout=10)
+        self.browser.click(current_month_selector)
+        self._calendar_month = 0
+        time.sleep(2)
+    
+    def _capture_snapshot(self, month_offset: int, html: str, verdict: str):
+        """Store the month's page in the capture store and remember its hash for the cycle record"""
+        if not self._capture_store:
+            return None
+        try:
+            snapshot_hash = self._capture_store.put(html)
+        except Exception as e:
+            self._emit_log('warning', f"Failed to capture page snapshot: {e}")
+            return None
+        self._cycle_snapshots.append({
+            'month_offset': month_offset,
+            'hash': snapshot_hash,
+            'verdict': verdict
+        })
+        return snapshot_hash
+    
+    def _capture_evidence(self, month_offset: int):
+        """Screenshot the calendar for a positive verdict; the file is written by the store's background worker"""
+        if not self._evidence_store:
+            return None
+        evidence_config = self.config.get("evidence", {})
+        image_format = evidence_config.get("format", "webp")
+        selector = evidence_config.get("selector") or None
+        try:
+            try:
+                image = self.browser.screenshot(selector, image_format=image_format,
+                                                quality=evidence_config.get("quality", 80))
+            except Exception:
+                if image_format == 'png':
+                    raise
+                image_format = 'png'  # Driver cannot encode webp; fall back to a PNG capture
+                image = self.browser.screenshot(selector, image_format='png')
+            name = self._evidence_store.submit(image, image_format)
+            self._emit_log('info', f"📸 Captured evidence screenshot for month offset {month_offset}: {name}")
+            return name
+        except Exception as e:
+            self._emit_log('warning', f"Failed to capture evidence screenshot: {e}")
+            return None
+    
+    def _evidence_url(self, name: str) -> str:
+        """Link to a screenshot, absolute when a public base URL is configured"""
+        base_url = (self.config.get("public_base_url") or os.environ.get("PUBLIC_BASE_URL", "")).rstrip('/')
+        return f"{base_url}/api/evidence/{name}"
+    
+    def _record_cycle(self, success: bool, started_at: datetime):
+        """Record the finished cycle with the snapshot hashes it captured"""
+        if not self._capture_store:
+            return
+        self._capture_store.record_cycle({
+            'instance_id': self._instance_id,
+            'cycle': self._total_checks,
+            'started_at': started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'success': success,
+            'snapshots': self._cycle_snapshots,
+            'round_trips': self._cycle_round_trips,
+            'network': self._cycle_network
+        })
     
     def send_desktop_notification(self, slots: List[Dict], notification_type: str = "slots_found"):
         """Send desktop notification about available slots"""
@@ -602,6 +813,10 @@ Details:
                 body += f"\n{i}. Month offset: {slot['month_offset']}"
                 body += f"\n   Status: {slot['element_text']}"
                 body += f"\n   Time: {slot['time']}"
+                if slot.get('snapshot_hash'):
+                    body += f"\n   Snapshot: {slot['snapshot_hash']}"
+                if slot.get('screenshot'):
+                    body += f"\n   Screenshot: {self._evidence_url(slot['screenshot'])}"
                 body += "\n"
             
             body += f"""
@@ -631,25 +846,96 @@ This is an automated notification from your TLS Visa Slot Checker.
             self._emit_log('error', f"Failed to send email notification: {e}")
     
     def run_check_cycle(self) -> bool:
+        """Run a complete check cycle, counting the browser round-trips it needed"""
+        browser = self.browser
+        round_trips_at_start = browser.round_trips if browser else 0
+        capturing = self._start_network_capture(browser)
+        try:
+            return self._check_all_months()
+        finally:
+            # Unknown if the browser was replaced mid-cycle (rebuild or standby takeover)
+            self._cycle_round_trips = (self.browser.round_trips - round_trips_at_start
+                                       if browser and self.browser is browser else None)
+            if self._cycle_round_trips is not None:
+                self._emit_log('info', f"Check cycle used {self._cycle_round_trips} browser round-trips")
+            self._cycle_network = self._finish_network_capture(browser) if capturing and self.browser is browser else None
+    
+    def _network_capture_enabled(self) -> bool:
+        return self.config.get("network_capture", {}).get("enabled", False)
+    
+    def _start_network_capture(self, browser) -> bool:
+        """Start collecting the cycle's Network events, if the waterfall capture is enabled"""
+        if not browser or not self._network_capture_enabled():
+            return False
+        try:
+            browser.start_network_capture()
+            return True
+        except Exception as e:
+            self._emit_log('warning', f"Network capture unavailable on this browser: {e}")
+            return False
+    
+    def _finish_network_capture(self, browser) -> Optional[Dict]:
+        """Summarize the cycle's requests and store the full waterfall in the capture store"""
+        try:
+            entries = build_entries(browser.stop_network_capture())
+        except Exception as e:
+            self._emit_log('warning', f"Failed to collect network events: {e}")
+            return None
+        summary = summarize(entries, top_n=self.config.get("network_capture", {}).get("top_n", 5))
+        if self._capture_store and entries:
+            try:
+                summary['waterfall_hash'] = self._capture_store.put(json.dumps({'entries': entries}), kind='waterfall')
+            except Exception as e:
+                self._emit_log('warning', f"Failed to store network waterfall: {e}")
+        phases = summary['phases_ms']
+        self._emit_log('info', f"🌐 {summary['requests']} requests, {summary['total_bytes'] / 1024:.0f} KB "
+                               f"(dns {phases['dns']:.0f}ms, ssl {phases['ssl']:.0f}ms, wait {phases['wait']:.0f}ms, "
+                               f"receive {phases['receive']:.0f}ms)")
+        return summary
+    
+    def _check_all_months(self) -> bool:
         """Run a complete check cycle for all configured months"""
         try:
-            if not self.login():
-                return False
-            
-            if not self.navigate_to_appointment_booking():
-                return False
+            if self._parked_on_booking:
+                # Adopted from the hot standby: already logged in and on the booking page
+                self._parked_on_booking = False
+                self._emit_log('info', "Resuming on the standby browser's booking page")
+            else:
+                if not self.login():
+                    return False
+                
+                if not self.navigate_to_appointment_booking():
+                    return False
             
             all_available_slots = []
             
             # Check slots for each month (current + next 2 months = 3 total)
+            month_retries = self.config.get("failure_policy", {}).get("month_retries", 1)
             for month_offset in range(self.config["months_to_check"]):
                 self._emit_log('info', f"Checking month offset {month_offset}...")
-                try:
-                    slots = self.check_available_slots(month_offset)
-                    all_available_slots.extend(slots)
-                except Exception as e:
-                    self._emit_log('error', f"Error checking month offset {month_offset}: {type(e).__name__}")
-                    continue
+                # Calendar month this offset lands on; a retry pages back to it from the current month
+                target_month = self._calendar_month + month_offset if month_offset > 0 else 0
+                for attempt in range(month_retries + 1):
+                    try:
+                        if attempt and month_offset > 0:
+                            # The failed attempt left the calendar somewhere unknown
+                            self._reset_calendar()
+                            slots = self.check_available_slots(month_offset, steps=target_month)
+                        else:
+                            slots = self.check_available_slots(month_offset)
+                        all_available_slots.extend(slots)
+                        break
+                    except Exception as e:
+                        failure_class = classify_failure('month', e)
+                        if failure_class == SESSION:
+                            # The browser is gone; the remaining months cannot succeed
+                            self._last_failure = ('month', e)
+                            raise
+                        if failure_class in (TRANSIENT, UNKNOWN) and attempt < month_retries:
+                            self._emit_log('warning', f"Retrying month offset {month_offset} after {type(e).__name__}")
+                            continue
+                        self._emit_log('error', f"Error checking month offset {month_offset}: {type(e).__name__}")
+                        break
                 
                 time.sleep(2)  # Delay between checks
             
@@ -670,93 +956,237 @@ This is an automated notification from your TLS Visa Slot Checker.
             
         except Exception as e:
             self._emit_log('error', f"Error during check cycle: {e}")
+            self._last_failure = self._last_failure or ('cycle', e)
             return False
     
-    def start_monitoring(self):
-        """Start continuous monitoring for available slots"""
+    def begin_monitoring(self) -> bool:
+        """Mark monitoring as started and initialize the driver; returns False if startup failed"""
         self._emit_log('info', "Starting TLS Visa Appointment Slot Monitoring...")
         self._emit_log('info', f"Checking every {self.config['check_interval_minutes']} minutes")
         self._emit_log('info', f"Monitoring {self.config['months_to_check']} months ahead")
         
         if self._running or self._initializing:
             self._emit_log('warning', "Monitoring is already running or initializing")
-            return
+            return False
             
         self._running = True
         self._initializing = True
         self._stop_event.clear()
-        retry_count = 0
-        max_retries = self.config["max_retries"]
+        self._draining = False
+        self._retry_count = 0
         
         try:
-            # Initialize driver once at start
-            self._setup_driver()
+            # Initialize driver once at start (pooled browsers are leased per cycle instead)
+            if not self._pool:
+                self._setup_driver()
+                self._apply_restored_cookies()
             self._initializing = False  # Driver setup complete
+            if self._hot_standby_enabled():
+                standby_config = self.config["hot_standby"]
+                self._hot_standby = HotStandby(
+                    self,
+                    refresh_seconds=standby_config.get("refresh_minutes", 10) * 60,
+                    min_available_bytes=int(standby_config.get("min_available_mb", 600) * 1024 * 1024),
+                    single_session=standby_config.get("single_session", False)
+                )
+                self._hot_standby.start()
         except Exception as e:
             self._initializing = False
             self._running = False
             self._emit_log('error', f"Failed to initialize driver: {e}")
-            return
+            return False
+        return True
+    
+    def run_monitoring_step(self):
+        """Run one check and return the seconds to wait before the next one, or None to stop monitoring"""
+        # An open circuit breaker skips cycles until its backoff has elapsed
+        breaker_wait = self._breaker.before_cycle()
+        if breaker_wait > 0:
+            return breaker_wait
         
-        while not self._stop_event.is_set():
-            try:
-                # Emit status update before starting check
-                self._emit_status_update({
-                    'is_running': True,
-                    'last_check': None,
-                    'total_checks': self._total_checks,
-                    'error_count': self._error_count,
-                    'status': 'Running check...'
-                })
-                
-                # Driver is already set up once at start - no need to recreate each cycle
+        try:
+            # Emit status update before starting check
+            self._emit_status_update({
+                'is_running': True,
+                'last_check': None,
+                'total_checks': self._total_checks,
+                'error_count': self._error_count,
+                'status': 'Running check...'
+            })
+            
+            # Driver is set up once at start; it is only rebuilt after a session failure
+            cycle_started = datetime.now()
+            self._cycle_snapshots = []
+            self._last_failure = None
+            self._in_cycle = True
+            if self._pool:
+                self._acquire_pooled_browser()
+                try:
+                    success = self.run_check_cycle()
+                finally:
+                    session_lost = self._last_failure is not None and self._failure_class() == SESSION
+                    self._release_pooled_browser(discard=session_lost)
+            else:
+                self._ensure_live_browser()
                 success = self.run_check_cycle()
-                self._total_checks += 1
-                self._last_check_time = datetime.now()
-                
-                if success:
-                    retry_count = 0  # Reset retry count on success
-                    self._emit_status_update({
-                        'is_running': True,
-                        'last_check': self._last_check_time.isoformat(),
-                        'total_checks': self._total_checks,
-                        'error_count': self._error_count,
-                        'status': 'Check completed successfully'
-                    })
-                else:
-                    retry_count += 1
-                    self._error_count += 1
-                    self._emit_log('warning', f"Check cycle failed. Retry {retry_count}/{max_retries}")
-                    
-                    if retry_count >= max_retries:
-                        self._emit_log('error', "Maximum retries reached. Stopping monitoring.")
-                        break
-                        
-                    self._emit_status_update({
-                        'is_running': True,
-                        'last_check': self._last_check_time.isoformat() if self._last_check_time else None,
-                        'total_checks': self._total_checks,
-                        'error_count': self._error_count,
-                        'status': f'Check failed - retry {retry_count}/{max_retries}'
-                    })
-                
-                # Wait before next check (interruptible)
-                wait_seconds = self.config['check_interval_minutes'] * 60
-                self._emit_log('info', f"Waiting {self.config['check_interval_minutes']} minutes before next check...")
-                
-                for _ in range(wait_seconds):
-                    if self._stop_event.is_set():
-                        break
-                    time.sleep(1)
-                
+            self._total_checks += 1
+            self._last_check_time = datetime.now()
+            self._record_cycle(success, cycle_started)
+            self._last_results = {'success': success, 'snapshots': list(self._cycle_snapshots),
+                                  'round_trips': self._cycle_round_trips}
+        except Exception as e:
+            self._emit_log('error', f"Unexpected error: {e}")
+            self._last_failure = ('cycle', e)
+            success = False
+        finally:
+            self._in_cycle = False
+        
+        if success:
+            self._retry_count = 0  # Reset retry count on success
+            recovery = self._breaker.record_success()
+            if recovery is not None:
+                self._emit_log('info', f"✅ Recovered after {recovery:.0f}s of failures")
+            self._emit_status_update({
+                'is_running': True,
+                'last_check': self._last_check_time.isoformat(),
+                'total_checks': self._total_checks,
+                'error_count': self._error_count,
+                'status': 'Check completed successfully'
+            })
+            self._emit_log('info', f"Waiting {self.config['check_interval_minutes']} minutes before next check...")
+            delay = max(self.config['check_interval_minutes'] * 60, self._throttle_backoff())
+        else:
+            delay = self._handle_cycle_failure()
+        
+        self._schedule_liveness_probe(delay)
+        self._next_check_at = time.time() + delay
+        return delay
+    
+    def _failure_class(self) -> str:
+        """Class of the current cycle's failure"""
+        phase, error = self._last_failure or ('cycle', None)
+        return classify_failure(phase, error)
+    
+    def _handle_cycle_failure(self) -> float:
+        """Apply the recovery action for the failure's class and return the delay before the next cycle"""
+        self._retry_count += 1
+        self._error_count += 1
+        phase = self._last_failure[0] if self._last_failure else 'cycle'
+        failure_class = self._failure_class()
+        action = ACTIONS[failure_class]
+        self._emit_log('warning', f"Check cycle failed in {phase} ({failure_class}) - action: {action}")
+        
+        delay = self.config.get("failure_policy", {}).get("retry_delay_seconds", 60)
+        if action == 'rebuild_driver' and not self._pool:
+            # Drop the dead browser now; swap in the standby, or let the liveness timer rebuild during the wait
+            self._quit_browser()
+            self._cleanup_temp_data()
+            with self._rebuild_lock:
+                if self._take_over_standby():
+                    delay = 5  # Standby browser is already running (and logged in unless single_session)
+        elif action == 'relogin' and not self._pool and self.browser:
+            # Drop the rejected session so the next cycle logs in from scratch (leased browsers are reset on release)
+            self._warm_session = False
+            try:
+                self.browser.reset()
+                self._emit_log('info', "🔑 Cleared the session - logging in again on the next cycle")
+            except Exception as e:
+                self._emit_log('warning', f"Could not clear the session before logging in again: {e}")
+        
+        open_backoff = self._breaker.record_failure(failure_class)
+        if open_backoff is not None:
+            self._emit_log('error', f"⛔ Circuit open after {self._breaker.consecutive_failures} failed cycles - "
+                                    f"next probe in {int(open_backoff)}s")
+            delay = open_backoff
+        delay = max(delay, self._throttle_backoff())
+        
+        self._emit_status_update({
+            'is_running': True,
+            'last_check': self._last_check_time.isoformat() if self._last_check_time else None,
+            'total_checks': self._total_checks,
+            'error_count': self._error_count,
+            'status': f'Check failed ({failure_class}) - circuit {self._breaker.state}, next attempt in {int(delay)}s'
+        })
+        return delay
+    
+    def get_failure_stats(self) -> Dict:
+        """Get circuit breaker state, failures by class, recovery times and liveness probe counters"""
+        return dict(self._breaker.get_stats(), liveness=dict(self._liveness_stats),
+                    hot_standby=self._hot_standby.get_stats() if self._hot_standby else None)
+    
+    def _probe_browser(self) -> bool:
+        """Cheap liveness check: process alive and a trivial script answered within the probe timeout"""
+        browser = self.browser
+        if not browser:
+            return False
+        timeout = self.config.get("liveness", {}).get("probe_timeout_seconds", 5)
+        started = time.monotonic()
+        alive = browser.is_alive(timeout=timeout)
+        self._liveness_stats['probes'] += 1
+        self._liveness_stats['last_probe_ms'] = round((time.monotonic() - started) * 1000, 1)
+        if not alive:
+            self._liveness_stats['failures'] += 1
+        return alive
+    
+    def _rebuild_browser(self, counter: str):
+        """Replace a dead or missing browser (serialized so timer and cycle never rebuild twice)"""
+        with self._rebuild_lock:
+            if self._stop_event.is_set() or self._probe_browser():
+                return
+            self._emit_log('warning', "🩺 Browser failed liveness probe - rebuilding")
+            self._quit_browser()
+            self._cleanup_temp_data()
+            if self._take_over_standby():
+                return
+            self._setup_driver()
+            self._liveness_stats[counter] += 1
+            if self._stop_event.is_set():
+                self._quit_browser()  # Stopped while we were launching
+    
+    def _take_over_standby(self) -> bool:
+        """Adopt the hot standby's browser, resuming on its booking page if it is logged in (caller holds the rebuild lock)"""
+        standby = self._hot_standby.take() if self._hot_standby else None
+        if not standby:
+            return False
+        self.browser, self.driver = standby.browser, standby.driver
+        self._temp_user_data_dir = standby._temp_user_data_dir
+        self._is_seleniumbase = standby._is_seleniumbase
+        self._browser_port = standby._browser_port
+        self._browser_tree, self._launch_baseline = standby._browser_tree, standby._launch_baseline
+        # The standby must not reach the adopted browser any more (its __del__ force-quits whatever it holds)
+        standby.browser = standby.driver = standby._temp_user_data_dir = standby._browser_tree = None
+        # A single-session standby was parked logged out; the next cycle logs in on it
+        self._parked_on_booking = not self._hot_standby.single_session
+        self._calendar_month = 0
+        self._emit_log('info', "🛟 Switched to hot standby browser")
+        return True
+    
+    def _ensure_live_browser(self):
+        """Before a cycle: wait for any background rebuild, then rebuild inline only if still dead"""
+        timer = self._liveness_timer
+        if timer:
+            timer.cancel()
+            timer.join()
+        self._rebuild_browser('inline_rebuilds')
+    
+    def _schedule_liveness_probe(self, delay: float):
+        """Probe (and if needed rebuild) the browser shortly before the next cycle, off the cycle's thread"""
+        if self._pool or self._stop_event.is_set() or self._draining:
+            return  # Pooled browsers are health-checked by the pool
+        lead = self.config.get("liveness", {}).get("lead_seconds", 60)
+        
+        def probe_and_heal():
+            try:
+                self._rebuild_browser('background_rebuilds')
             except Exception as e:
-                self._emit_log('error', f"Unexpected error: {e}")
-                self._error_count += 1
-                retry_count += 1
-                if retry_count >= max_retries:
-                    break
-                time.sleep(30)  # Wait 30 seconds before retry
+                self._emit_log('warning', f"Background browser rebuild failed (will retry before the cycle): {e}")
         
+        self._liveness_timer = threading.Timer(max(0.0, delay - lead), probe_and_heal)
+        self._liveness_timer.daemon = True
+        self._liveness_timer.start()
+    
+    def end_monitoring(self):
+        """Mark monitoring as stopped and publish the final status"""
         self._running = False
         self._emit_status_update({
             'is_running': False,
@@ -766,6 +1196,86 @@ This is an automated notification from your TLS Visa Slot Checker.
             'status': 'Monitoring stopped'
         })
     
+    def is_stop_requested(self) -> bool:
+        """Check if a stop has been signalled"""
+        return self._stop_event.is_set()
+    
+    def is_draining(self) -> bool:
+        """Check if a shutdown drain has been requested"""
+        return self._draining
+    
+    def start_monitoring(self):
+        """Start continuous monitoring for available slots"""
+        if not self.begin_monitoring():
+            return
+        
+        # Resumed from a checkpoint: keep the previous schedule position
+        if self._resume_delay:
+            self._emit_log('info', f"Resuming schedule - next check in {int(self._resume_delay)}s")
+            self._stop_event.wait(self._resume_delay)
+            self._resume_delay = 0
+        
+        while not self._stop_event.is_set() and not self._draining:
+            wait_seconds = self.run_monitoring_step()
+            if wait_seconds is None or self._draining:
+                break
+            
+            # Wait before next check (interruptible)
+            self._stop_event.wait(wait_seconds)
+        
+        self.end_monitoring()
+    
+    def is_cycle_running(self) -> bool:
+        """Whether a check cycle is in progress right now"""
+        return self._in_cycle
+    
+    def request_drain(self):
+        """Schedule no further cycles; an in-flight one finishes and the browser stays up for export_state"""
+        self._draining = True
+        if self._liveness_timer:
+            self._liveness_timer.cancel()
+    
+    def export_state(self) -> Dict:
+        """Counters, last results, schedule position and session cookies for a shutdown checkpoint"""
+        cookies = []
+        if self.browser and not self._lease:
+            try:
+                cookies = self.browser.get_cookies()
+            except Exception as e:
+                self._emit_log('warning', f"Could not save session cookies: {e}")
+        return {
+            'running': self.is_running(),
+            'total_checks': self._total_checks,
+            'error_count': self._error_count,
+            'last_check': self._last_check_time.isoformat() if self._last_check_time else None,
+            'next_check_at': self._next_check_at,
+            'last_results': self._last_results,
+            'cookies': cookies
+        }
+    
+    def restore_state(self, state: Dict):
+        """Continue from a checkpoint written by export_state (call before starting)"""
+        self._total_checks = state.get('total_checks', 0)
+        self._error_count = state.get('error_count', 0)
+        if state.get('last_check'):
+            self._last_check_time = datetime.fromisoformat(state['last_check'])
+        self._last_results = state.get('last_results')
+        self._restored_cookies = state.get('cookies') or None
+        if state.get('next_check_at'):
+            self._resume_delay = max(0, state['next_check_at'] - time.time())
+    
+    def _apply_restored_cookies(self):
+        """Load checkpointed session cookies into the fresh browser"""
+        cookies, self._restored_cookies = self._restored_cookies, None
+        if not cookies or not self.browser:
+            return
+        try:
+            self.browser.set_cookies(cookies)
+            self._warm_session = True
+            self._emit_log('info', f"🍪 Restored {len(cookies)} session cookies from checkpoint")
+        except Exception as e:
+            self._emit_log('warning', f"Could not restore session cookies: {e}")
+    
     def _cleanup_temp_data(self):
         """Clean up temporary user data directory"""
         if self._temp_user_data_dir and os.path.exists(self._temp_user_data_dir):
@@ -776,19 +1286,70 @@ This is an automated notification from your TLS Visa Slot Checker.
             except Exception as e:
                 self._emit_log('warning', f"Failed to clean up temp directory: {e}")
     
+    def _launch_pooled_browser(self) -> PooledBrowser:
+        """Pool factory: launch a browser with the normal setup and hand ownership to the pool"""
+        self._setup_driver()
+        pooled = PooledBrowser(self.browser, self._temp_user_data_dir, self._is_seleniumbase, self._browser_port,
+                               process_tree=self._browser_tree)
+        self.browser = None
+        self.driver = None
+        self._temp_user_data_dir = None
+        self._browser_tree = None
+        self._emit_log('info', "🏊 Launched a new pooled browser")
+        return pooled
+    
+    def _acquire_pooled_browser(self):
+        """Lease a browser from the shared pool for one check cycle"""
+        timeout = self.config.get("browser_pool", {}).get("lease_timeout_seconds", 120)
+        lease = self._pool.acquire(self._launch_pooled_browser, timeout=timeout)
+        with self._lease_lock:
+            self._lease = lease
+            self.browser = lease.backend
+            self.driver = getattr(lease.backend, 'driver', None)
+            self._is_seleniumbase = lease.is_seleniumbase
+            self._browser_port = lease.port
+    
+    def _release_pooled_browser(self, discard: bool = False):
+        """Return the leased browser to the pool (at most once per lease)"""
+        with self._lease_lock:
+            lease = self._lease
+            self._lease = None
+            if lease:
+                self.browser = None
+                self.driver = None
+        if lease:
+            self._pool.release(lease, discard=discard)
+    
+    def _quit_browser(self, force: bool = False):
+        """Quit the active browser backend (or a bare driver left by a failed setup)"""
+        if self._lease:
+            # A leased browser belongs to the pool; the cycle returns it unless we are forcing
+            if force:
+                self._release_pooled_browser(discard=True)
+            return
+        target = self.browser or self.driver
+        if target and not (force and self._browser_tree):
+            try:
+                target.quit()
+            except:
+                pass
+        self.browser = None
+        self.driver = None
+        # Whatever the graceful quit left behind (or everything, when forcing)
+        self._kill_browser_tree(timeout=2 if force else 5)
+    
     def stop_monitoring(self):
         """Stop the monitoring process"""
         self._emit_log('info', "Stopping monitoring...")
         self._running = False
         self._stop_event.set()
+        if self._liveness_timer:
+            self._liveness_timer.cancel()
+        if self._hot_standby:
+            self._hot_standby.stop()
         
         # Clean up driver if it exists
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
-        self.driver = None
+        self._quit_browser()
         
         # Clean up temporary user data directory
         self._cleanup_temp_data()
@@ -798,18 +1359,21 @@ This is an automated notification from your TLS Visa Slot Checker.
         self._emit_log('warning', "Force stopping monitoring...")
         self._running = False
         self._stop_event.set()
+        if self._liveness_timer:
+            self._liveness_timer.cancel()
+        if self._hot_standby:
+            self._hot_standby.stop()
         
         # Force quit driver
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
-        self.driver = None
+        self._quit_browser(force=True)
         
         # Clean up temporary user data directory
         self._cleanup_temp_data()
     
+    def update_config(self, config: Dict):
+        """Apply a new configuration; takes effect from the next check cycle"""
+        self.config.update(config)
+    
     def is_running(self) -> bool:
         """Check if monitoring is currently running or initializing"""
         return self._running or self._initializing
@@ -832,11 +1396,8 @@ This is an automated notification from your TLS Visa Slot Checker.
     
     def __del__(self):
         """Cleanup when object is destroyed"""
-        if hasattr(self, 'driver') and self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        if hasattr(self, '_lease'):
+            self._quit_browser(force=True)
         
         # Clean up temporary user data directory
         if hasattr(self, '_temp_user_data_dir'):
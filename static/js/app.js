@@ -47,6 +47,14 @@ class TLSMonitorDashboard {
         this.socket.on('connect', () => {
             console.log('Socket.IO connected successfully');
             this.addLogEntry('info', 'Socket.IO connection established');
+            // Let the server drop unimportant log lines and send compact payloads
+            this.socket.emit('subscribe_events', {
+                monitor_ids: ['default'],
+                kinds: ['log', 'status', 'other'],
+                min_level: 'info',
+                important_only: true,
+                compact: true
+            });
         });
         
         this.socket.on('disconnect', (reason) => {
@@ -71,13 +79,13 @@ class TLSMonitorDashboard {
         
         // Socket.IO event listeners for monitoring
         this.socket.on('log_message', (data) => {
-            // Only show important messages to the user
-            if (this.shouldShowLogMessage(data.message, data.level)) {
-                this.addLogEntry(data.level, data.message, data.timestamp);
-            }
+            // Already filtered to important messages on the server
+            data = this.expandCompactEvent(data);
+            this.addLogEntry(data.level, data.message, data.timestamp);
         });
         
         this.socket.on('status_update', (data) => {
+            data = this.expandCompactEvent(data);
             // Debug: Always log status updates for debugging
             console.log('Received status_update event:', data);
             this.updateMonitoringStatus(data);
@@ -852,42 +860,27 @@ class TLSMonitorDashboard {
         return div.innerHTML;
     }
     
-    shouldShowLogMessage(message, level) {
-        // Filter out technical UC mode messages
-        const filteredMessages = [
-            'UC mode opens in separate window (cannot be embedded due to anti-detection features)'
-        ];
-        
-        if (filteredMessages.some(filtered => message.includes(filtered))) {
-            return false;
+    expandCompactEvent(data) {
+        // Compact payloads use short keys, numeric levels and epoch-millisecond timestamps
+        if (!data || !('t' in data || 'l' in data || 's' in data || 'r' in data)) {
+            return data;
         }
-        
-        // Always show errors and warnings (except filtered ones above)
-        if (level === 'error' || level === 'warning') {
-            return true;
+        const keys = {
+            t: 'timestamp', l: 'level', m: 'message', i: 'monitor_id',
+            r: 'is_running', c: 'last_check', n: 'total_checks', e: 'error_count', s: 'status'
+        };
+        const levels = ['debug', 'info', 'warning', 'error'];
+        const expanded = {};
+        for (const [key, value] of Object.entries(data)) {
+            expanded[keys[key] || key] = value;
         }
-        
-        // Show important success messages and status updates
-        const importantKeywords = [
-            // Check results
-            'CHECK #', 'completed', 'SLOTS FOUND', 'No slots found', 'No appointment slots found',
-            // Major status changes
-            'Starting TLS', 'Monitoring started', 'Monitoring stopped', 'Stop signal sent',
-            // Success states
-            'Login successful', 'Navigation successful', 'Check complete',
-            // Important notifications
-            'notification sent', 'Email notification', 'Desktop notification',
-            // Connection status
-            'Socket.IO connection established', 'Dashboard initialized successfully',
-            // Configuration
-            'Configuration updated', 'Using TLS account'
-        ];
-        
-        // Check if message contains any important keywords
-        const messageUpper = message.toUpperCase();
-        return importantKeywords.some(keyword => 
-            messageUpper.includes(keyword.toUpperCase())
-        );
+        if (typeof expanded.level === 'number') {
+            expanded.level = levels[expanded.level] || 'info';
+        }
+        if (typeof expanded.last_check === 'number') {
+            expanded.last_check = new Date(expanded.last_check).toISOString();
+        }
+        return expanded;
     }
     
     showPopupNotification(data) {
@@ -0,0 +1,152 @@
+"""Process ownership of browser launches: failed-launch cleanup and hot-standby takeover"""
+
+import gc
+import subprocess
+import sys
+
+import pytest
+
+psutil = pytest.importorskip('psutil')
+
+from services.hot_standby import HotStandby
+from services.process_tree import ProcessTree, child_processes
+from services.tls_monitor import TLSWebMonitor
+
+
+@pytest.fixture
+def fake_chrome(tmp_path):
+    """Start processes named 'chrome' (a symlink to the interpreter) that sleep until killed"""
+    executable = tmp_path / 'chrome'
+    executable.symlink_to(sys.executable)
+    processes = []
+
+    def start(profile_dir=None):
+        args = [str(executable), '-c', 'import time; time.sleep(60)']
+        if profile_dir:
+            args.append(f'--user-data-dir={profile_dir}')
+        process = subprocess.Popen(args)
+        processes.append(process)
+        return process
+
+    yield start
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+@pytest.fixture
+def monitor_factory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The monitor writes its log file to the working directory
+    config = {'capture_store': {'enabled': False}, 'evidence': {'enabled': False}, 'rate_limit': {'enabled': False},
+              'tls_url': 'https://tls.test/'}
+    return lambda: TLSWebMonitor(dict(config))
+
+
+def alive(process) -> bool:
+    return process.poll() is None
+
+
+def test_spawned_since_without_profile_is_empty(fake_chrome):
+    baseline = child_processes()
+    fake_chrome('/tmp/someone_else')
+    assert not ProcessTree.spawned_since(baseline, None)
+
+
+def test_spawned_since_matches_only_the_launch_profile(fake_chrome, tmp_path):
+    baseline = child_processes()
+    ours = fake_chrome(str(tmp_path / 'chrome_user_data_1'))
+    fake_chrome(str(tmp_path / 'chrome_user_data_12'))  # Shares a prefix, but another launch
+    fake_chrome()
+    assert ProcessTree.spawned_since(baseline, str(tmp_path / 'chrome_user_data_1')).pids() == {ours.pid}
+
+
+def test_failed_launch_without_profile_kills_nothing(monitor_factory, fake_chrome):
+    monitor = monitor_factory()
+    monitor._launch_baseline = child_processes()
+    concurrent_launch = fake_chrome('/tmp/chrome_shared_1_x')  # Another worker, the standby or the shared Chrome
+    monitor._temp_user_data_dir = None
+    monitor._cleanup_failed_chrome_attempt()
+    assert alive(concurrent_launch)
+
+
+def test_failed_launch_kills_its_own_profile_processes(monitor_factory, fake_chrome, tmp_path):
+    monitor = monitor_factory()
+    monitor._launch_baseline = child_processes()
+    profile = tmp_path / 'chrome_user_data_1'
+    profile.mkdir()
+    ours = fake_chrome(str(profile))
+    other = fake_chrome(str(tmp_path / 'chrome_user_data_2'))
+    monitor._temp_user_data_dir = str(profile)
+    monitor._cleanup_failed_chrome_attempt()
+    ours.wait(timeout=5)
+    assert alive(other)
+    assert not profile.exists()
+
+
+class FakeBrowser:
+    name = 'selenium'
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.quit_calls = 0
+
+    def is_alive(self, timeout=5):
+        return True
+
+    def root_pid(self):
+        return self.pid
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_standby_takeover_hands_over_the_process_tree(monitor_factory, fake_chrome, tmp_path):
+    owner = monitor_factory()
+    standby = monitor_factory()
+    process = fake_chrome(str(tmp_path / 'standby_profile'))
+    browser = FakeBrowser(process.pid)
+    standby.browser = browser
+    standby._browser_tree = ProcessTree.capture(process.pid)
+    standby._launch_baseline = {(1, 1.0)}
+    standby._temp_user_data_dir = str(tmp_path / 'standby_profile')
+
+    owner._hot_standby = HotStandby(owner)
+    owner._hot_standby._standby = standby
+    with owner._rebuild_lock:
+        assert owner._take_over_standby()
+
+    assert owner.browser is browser
+    assert owner._browser_tree.pids() == {process.pid}
+    assert owner._launch_baseline == {(1, 1.0)}
+    assert owner._temp_user_data_dir == str(tmp_path / 'standby_profile')
+    assert (standby.browser, standby.driver, standby._browser_tree, standby._temp_user_data_dir) == (None,) * 4
+    assert owner._parked_on_booking  # Logged-in standby: the next cycle skips login
+
+    # Dropping the standby must not touch the adopted browser
+    del standby
+    gc.collect()
+    assert alive(process) and browser.quit_calls == 0
+
+    owner._kill_browser_tree(timeout=2)
+    process.wait(timeout=5)
+
+
+@pytest.mark.parametrize('single_session', [False, True])
+def test_standby_build_shares_the_owner_logger_and_parks_per_mode(monitor_factory, monkeypatch, single_session):
+    owner = monitor_factory()
+    handlers = list(owner.logger.handlers)
+    parked = []
+    monkeypatch.setattr(TLSWebMonitor, '_setup_driver', lambda self: setattr(self, 'browser', FakeBrowser(None)))
+    monkeypatch.setattr(TLSWebMonitor, 'login', lambda self: parked.append('login') or True)
+    monkeypatch.setattr(TLSWebMonitor, 'navigate_to_appointment_booking', lambda self: parked.append('booking') or True)
+
+    owner._hot_standby = HotStandby(owner, single_session=single_session)
+    owner._hot_standby._build()
+    standby = owner._hot_standby._standby
+
+    assert standby.logger is owner.logger and owner.logger.handlers == handlers
+    assert standby._log_label == 'STANDBY' and standby.socketio is None
+    assert parked == ([] if single_session else ['login', 'booking'])  # Single-session: no navigation at all
+    with owner._rebuild_lock:
+        assert owner._take_over_standby()
+    assert owner._parked_on_booking is not single_session
@@ -0,0 +1,139 @@
+import json
+import multiprocessing
+import os
+
+from services import capture_store
+from services.capture_store import CaptureStore, get_capture_store
+
+
+PAGE_BYTES = 2300  # Stored (compressed) size of a random_page(), within a few bytes
+
+
+def random_page(size=4000):
+    return os.urandom(size // 2).hex()  # Random hex gzips to a predictable size
+
+
+def test_identical_pages_are_stored_once(tmp_path):
+    store = CaptureStore(str(tmp_path))
+    first = store.put('<html>no slots</html>')
+    assert store.put('<html>no slots</html>') == first
+    assert store.get(first) == '<html>no slots</html>'
+    stats = store.get_stats()
+    assert stats['objects'] == 1 and stats['dedup_hits'] == 1
+
+
+def test_eviction_removes_least_recently_seen_first(tmp_path):
+    store = CaptureStore(str(tmp_path), max_bytes=int(PAGE_BYTES * 3.5))
+    pages = [random_page() for _ in range(3)]
+    hashes = [store.put(page) for page in pages]
+    store.put(pages[0])  # Seen again: now the most recent
+    newest = store.put(random_page())
+
+    stats = store.get_stats()
+    assert stats['total_bytes'] <= PAGE_BYTES * 3.5
+    assert stats['evictions'] == 1
+    assert not store.contains(hashes[1]) and store.get(hashes[1]) is None
+    assert store.contains(hashes[0]) and store.contains(hashes[2]) and store.contains(newest)
+
+
+def test_an_entry_larger_than_the_budget_is_kept(tmp_path):
+    store = CaptureStore(str(tmp_path), max_bytes=PAGE_BYTES // 2)
+    old = store.put(random_page(100))
+    big = store.put(random_page())
+    assert store.contains(big) and not store.contains(old)
+
+
+def test_waterfalls_are_a_separate_kind_and_evicted_first(tmp_path):
+    store = CaptureStore(str(tmp_path), max_bytes=int(PAGE_BYTES * 3.5))
+    page = store.put(random_page())
+    waterfall = store.put(json.dumps({'entries': [random_page()]}), kind='waterfall')
+
+    assert store.get(waterfall) is None and store.get(page, kind='waterfall') is None
+    assert json.loads(store.get(waterfall, kind='waterfall'))['entries']
+    assert os.listdir(tmp_path / 'waterfalls') and all(
+        name.endswith('.html.gz') for _, _, names in os.walk(tmp_path / 'objects') for name in names)
+
+    # The waterfall is older than this page but still goes first
+    store.put(random_page())
+    store.put(random_page())
+    assert not store.contains(waterfall, kind='waterfall')
+    assert store.contains(page)
+    kinds = store.get_stats()['kinds']
+    assert kinds['waterfall']['objects'] == 0 and kinds['page']['objects'] == 3
+
+
+def test_reload_from_disk(tmp_path):
+    store = CaptureStore(str(tmp_path), max_cycles=2)
+    digest = store.put('<html>a</html>')
+    for cycle in range(3):
+        store.record_cycle({'cycle': cycle, 'snapshots': [{'hash': digest}]})
+
+    reopened = CaptureStore(str(tmp_path), max_cycles=2)
+    assert reopened.contains(digest)
+    cycles = reopened.get_cycles()
+    assert [cycle['cycle'] for cycle in cycles] == [2, 1]
+    assert cycles[0]['snapshots'][0]['stored'] is True
+
+
+def test_dedup_hits_and_cycle_appends_do_not_force_a_reload_elsewhere(tmp_path, monkeypatch):
+    writer = CaptureStore(str(tmp_path))
+    reader = CaptureStore(str(tmp_path))
+    digest = writer.put('<html>no slots</html>')
+    assert reader.contains(digest)
+
+    loads = []
+    original_load = CaptureStore._load
+    monkeypatch.setattr(CaptureStore, '_load', lambda self: loads.append(self) or original_load(self))
+    for cycle in range(3):
+        writer.put('<html>no slots</html>')
+        writer.record_cycle({'cycle': cycle, 'snapshots': [{'hash': digest}]})
+    assert [cycle['cycle'] for cycle in reader.get_cycles()] == [2, 1, 0]
+    assert reader.contains(digest) and loads == []
+
+
+def test_eviction_sees_recency_refreshed_by_another_instance(tmp_path):
+    evicting = CaptureStore(str(tmp_path), max_bytes=int(PAGE_BYTES * 2.5))
+    other = CaptureStore(str(tmp_path), max_bytes=int(PAGE_BYTES * 2.5))
+    old, newer = random_page(), random_page()
+    old_hash = evicting.put(old)
+    newer_hash = evicting.put(newer)
+    other.put(old)  # Dedup hit elsewhere: only the file's mtime changes
+    evicting.put(random_page())
+    assert evicting.contains(old_hash) and not evicting.contains(newer_hash)
+
+
+def test_shrinking_the_budget_evicts_right_away(tmp_path, monkeypatch):
+    monkeypatch.setattr(capture_store, '_stores', {})
+    store = get_capture_store(str(tmp_path), max_bytes=PAGE_BYTES * 10)
+    for _ in range(4):
+        store.put(random_page())
+    assert get_capture_store(str(tmp_path), max_bytes=int(PAGE_BYTES * 2.5)) is store
+    stats = store.get_stats()
+    assert stats['total_bytes'] <= PAGE_BYTES * 2.5 and stats['evictions'] == 2
+
+
+def _write_from_other_process(directory, count):
+    store = CaptureStore(directory, max_bytes=PAGE_BYTES * 10)
+    for index in range(count):
+        digest = store.put(random_page())
+        store.record_cycle({'writer': os.getpid(), 'cycle': index, 'snapshots': [{'hash': digest}]})
+
+
+def test_processes_sharing_a_directory_see_each_other_and_respect_the_budget(tmp_path):
+    directory = str(tmp_path)
+    parent = CaptureStore(directory, max_bytes=PAGE_BYTES * 10)
+    parent.put(random_page())
+
+    context = multiprocessing.get_context('fork')
+    writers = [context.Process(target=_write_from_other_process, args=(directory, 30)) for _ in range(2)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(30)
+        assert writer.exitcode == 0
+
+    stats = parent.get_stats()
+    assert stats['cycles'] == 60  # Written by the workers, visible without a restart
+    on_disk = sum(os.path.getsize(os.path.join(root, name))
+                  for root, _, names in os.walk(tmp_path / 'objects') for name in names)
+    assert on_disk == stats['total_bytes'] <= PAGE_BYTES * 10
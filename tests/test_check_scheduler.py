@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from services.check_scheduler import CheckScheduler, GOLDEN_RATIO_FRACTION
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = CheckScheduler(max_workers=2)
+    scheduler.start()
+    yield scheduler
+    scheduler.shutdown()
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_phase_offsets_spread_across_interval():
+    scheduler = CheckScheduler()
+    offsets = [scheduler.phase_offset(100) for _ in range(4)]
+    assert offsets[0] == 0
+    assert offsets[1] == pytest.approx(GOLDEN_RATIO_FRACTION * 100)
+    assert len({round(offset) for offset in offsets}) == 4
+    assert all(0 <= offset < 100 for offset in offsets)
+
+
+def test_job_reschedules_with_returned_delay_until_none(scheduler):
+    runs = []
+
+    def job():
+        runs.append(time.monotonic())
+        return 0.05 if len(runs) < 3 else None
+
+    assert scheduler.add('a', job, interval_seconds=60, first_delay=0) == 0
+    assert wait_until(lambda: not scheduler.contains('a'))
+    assert len(runs) == 3
+    assert runs[2] - runs[1] >= 0.05
+    assert scheduler.get_stats()['completed'] == 3
+
+
+def test_failing_job_is_retried_after_its_interval(scheduler):
+    calls = []
+
+    def job():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return None
+
+    scheduler.add('a', job, interval_seconds=0.05, first_delay=0)
+    assert wait_until(lambda: len(calls) == 2)
+    assert wait_until(lambda: not scheduler.contains('a'))
+    assert scheduler.get_stats()['failed'] == 1
+
+
+def test_target_never_runs_concurrently_with_itself(scheduler):
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            active.append(1)
+            overlaps.append(len(active) > 1)
+        time.sleep(0.03)
+        with lock:
+            active.pop()
+        return 0
+
+    scheduler.add('a', job, interval_seconds=60, first_delay=0)
+    assert wait_until(lambda: len(overlaps) >= 5)
+    scheduler.remove('a', wait_timeout=1)
+    assert not any(overlaps)
+
+
+def test_remove_waits_for_in_flight_run_and_stops_rescheduling(scheduler):
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def job():
+        runs.append(1)
+        started.set()
+        release.wait(1)
+        return 0
+
+    scheduler.add('a', job, interval_seconds=60, first_delay=0)
+    assert started.wait(1)
+    assert scheduler.remove('a', wait_timeout=0.05) is False  # Still running
+    release.set()
+    assert scheduler.remove('a', wait_timeout=1) is True
+    time.sleep(0.05)
+    assert runs == [1]
+
+
+def test_readded_target_replaces_stale_heap_entry(scheduler):
+    old_runs, new_runs = [], []
+    scheduler.add('a', lambda: old_runs.append(1), interval_seconds=60, first_delay=0.1)
+    scheduler.add('a', lambda: new_runs.append(1), interval_seconds=60, first_delay=0)
+    assert wait_until(lambda: new_runs)
+    time.sleep(0.2)
+    assert old_runs == []
+
+
+def test_removed_then_readded_target_runs_on_one_chain(scheduler):
+    active = []
+    overlaps = []
+    runs = []
+    lock = threading.Lock()
+
+    def job():
+        with lock:
+            active.append(1)
+            overlaps.append(len(active) > 1)
+            runs.append(time.monotonic())
+        time.sleep(0.03)
+        with lock:
+            active.pop()
+        return 0.1
+
+    scheduler.add('a', job, interval_seconds=60, first_delay=0)
+    assert wait_until(lambda: runs)
+    scheduler.remove('a')  # Re-added within the interval while the first run is in flight
+    scheduler.add('a', job, interval_seconds=60, first_delay=0)
+    time.sleep(0.35)
+    scheduler.remove('a', wait_timeout=1)
+    assert not any(overlaps)
+    gaps = [later - earlier for earlier, later in zip(runs[1:], runs[2:])]
+    assert all(gap >= 0.1 for gap in gaps)  # One chain: every rerun waits out the returned delay
+    assert 2 <= len(runs) <= 4
@@ -0,0 +1,17 @@
+import os
+import stat
+
+from services.checkpoint import load_checkpoint, save_checkpoint
+
+
+def test_checkpoint_is_owner_only_and_round_trips(tmp_path, monkeypatch):
+    path = tmp_path / 'state' / 'checkpoint.json'
+    monkeypatch.setenv('CHECKPOINT_FILE', str(path))
+    (tmp_path / 'state').mkdir()
+    (tmp_path / 'state' / 'checkpoint.json.tmp').write_text('left over')
+    os.chmod(tmp_path / 'state' / 'checkpoint.json.tmp', 0o644)
+
+    monitors = {'default': {'running': True, 'cookies': [{'name': 'session', 'value': 'secret'}]}}
+    assert save_checkpoint(monitors) == str(path)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert load_checkpoint() == monitors
@@ -0,0 +1,91 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException, WebDriverException
+
+from services import failure_policy
+from services.browser_backends import BrowserBackendError
+from services.rate_governor import ThrottledError
+from services.failure_policy import (
+    AUTH, SESSION, THROTTLED, TRANSIENT, UNKNOWN, CLOSED, OPEN, HALF_OPEN, CircuitBreaker, classify_failure
+)
+
+
+@pytest.mark.parametrize('phase, error, expected', [
+    ('navigation', ThrottledError('429'), THROTTLED),
+    ('navigation', RuntimeError("Throttled by site (429)"), UNKNOWN),  # Only the exception type counts
+    ('month', InvalidSessionIdException("invalid session id"), SESSION),
+    ('month', WebDriverException("chrome not reachable"), SESSION),
+    ('month', BrowserBackendError("DevTools connection closed"), SESSION),
+    ('month', ConnectionError("refused"), SESSION),
+    ('login', TimeoutException("login button"), AUTH),
+    ('login', InvalidSessionIdException("invalid session id"), SESSION),  # A dead browser is not a login problem
+    ('month', TimeoutException("next month"), TRANSIENT),
+    ('navigation', TimeoutError("page load"), TRANSIENT),
+    ('month', WebDriverException("element click intercepted"), TRANSIENT),
+    ('cycle', ValueError("unexpected"), UNKNOWN),
+    ('cycle', None, UNKNOWN),
+])
+def test_classify_failure(phase, error, expected):
+    assert classify_failure(phase, error) == expected
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(failure_policy.time, 'monotonic', fake)
+    return fake
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, backoff_base_seconds=60)
+    assert breaker.record_failure(TRANSIENT) is None
+    assert breaker.record_failure(TRANSIENT) is None
+    assert breaker.record_failure(SESSION) == 60
+    assert breaker.state == OPEN
+    assert breaker.before_cycle() == 60
+
+    clock.now += 45
+    assert breaker.before_cycle() == 15
+    assert breaker.get_stats()['failures_by_class'] == {TRANSIENT: 2, SESSION: 1}
+
+
+def test_half_open_probe_failure_doubles_backoff_up_to_max(clock):
+    breaker = CircuitBreaker(failure_threshold=1, backoff_base_seconds=60, backoff_max_seconds=200)
+    assert breaker.record_failure(TRANSIENT) == 60
+
+    clock.now += 60
+    assert breaker.before_cycle() == 0
+    assert breaker.state == HALF_OPEN
+    assert breaker.record_failure(TRANSIENT) == 120
+
+    clock.now += 120
+    breaker.before_cycle()
+    assert breaker.record_failure(TRANSIENT) == 200  # Capped
+    assert breaker.opened_count == 3
+
+
+def test_success_closes_and_reports_recovery_time(clock):
+    breaker = CircuitBreaker(failure_threshold=2, backoff_base_seconds=60)
+    breaker.record_failure(TRANSIENT)
+    breaker.record_failure(TRANSIENT)
+    clock.now += 60
+    breaker.before_cycle()
+
+    assert breaker.record_success() == 60
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.record_success() is None  # No streak to recover from
+
+    # The next streak starts again from the base backoff
+    breaker.record_failure(TRANSIENT)
+    assert breaker.record_failure(TRANSIENT) == 60
+    stats = breaker.get_stats()
+    assert stats['recoveries'] == 1
+    assert stats['mean_recovery_seconds'] == 60
@@ -0,0 +1,85 @@
+import io
+import json
+import threading
+
+from services import monitor_worker
+from services.monitor_worker import WorkerMonitor, _EventChannel, _command_loop
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.draining = False
+        self.stopped = False
+
+    def request_drain(self):
+        self.draining = True
+
+    def is_draining(self):
+        return self.draining
+
+    def is_cycle_running(self):
+        return False
+
+    def export_state(self):
+        return {'total_checks': 7, 'next_check_at': 123.0, 'cookies': [{'name': 'session', 'value': 'x'}]}
+
+    def stop_monitoring(self):
+        self.stopped = True
+
+    force_stop = stop_monitoring
+
+    def is_running(self):
+        return not self.stopped
+
+    def get_last_check_time(self):
+        return ''
+
+    def get_total_checks(self):
+        return 7
+
+    def get_error_count(self):
+        return 0
+
+    def get_browser_port(self):
+        return None
+
+
+def run_commands(monkeypatch, *commands):
+    monkeypatch.setattr(monitor_worker.sys, 'stdin', io.StringIO(''.join(json.dumps(c) + '\n' for c in commands)))
+    monitor, stream, released = FakeMonitor(), io.StringIO(), threading.Event()
+    _command_loop(monitor, _EventChannel(stream), released)
+    return monitor, [json.loads(line) for line in stream.getvalue().splitlines()], released
+
+
+def test_worker_drains_and_exports_state_over_the_channel(monkeypatch):
+    monitor, events, released = run_commands(monkeypatch, {'cmd': 'drain'}, {'cmd': 'export_state'})
+    assert monitor.draining
+    assert events[0] == {'type': 'state', 'state': dict(events[0]['state'], draining=True, in_cycle=False)}
+    assert {'type': 'exported_state', 'state': FakeMonitor().export_state()} in events
+    assert released.is_set()  # EOF: the parent is gone
+
+
+def test_parent_waits_for_drain_ack_and_reads_exported_state():
+    worker = WorkerMonitor({})
+    worker._process = type('Process', (), {'poll': lambda self: None})()
+    worker._drain_pending = True
+    assert worker.is_cycle_running()  # Not acknowledged yet
+    worker._handle_line(json.dumps({'type': 'state', 'state': {'draining': True, 'in_cycle': False}}))
+    assert not worker.is_cycle_running()
+
+    exported = {'total_checks': 7, 'cookies': []}
+
+    def send(command):
+        # The worker answers on the event channel, read by the relay thread
+        reply = json.dumps({'type': 'exported_state', 'state': exported})
+        threading.Timer(0.05, worker._handle_line, [reply]).start()
+        return True
+
+    worker._send = send
+    assert worker.export_state(timeout=2) == exported
+
+
+def test_export_state_falls_back_to_counters_when_the_worker_is_gone():
+    worker = WorkerMonitor({})
+    worker._state.update(total_checks=3, error_count=1, last_check='2026-01-01T00:00:00')
+    assert worker.export_state(timeout=0.1) == {'total_checks': 3, 'error_count': 1, 'last_check': '2026-01-01T00:00:00'}
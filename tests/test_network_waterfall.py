@@ -0,0 +1,101 @@
+from services.network_waterfall import PHASES, build_entries, summarize, to_har
+
+TIMING = {
+    'requestTime': 100.0, 'dnsStart': 1.0, 'dnsEnd': 11.0, 'connectStart': 11.0, 'connectEnd': 51.0,
+    'sslStart': 21.0, 'sslEnd': 51.0, 'sendStart': 52.0, 'sendEnd': 53.0, 'receiveHeadersEnd': 153.0
+}
+
+
+def request(request_id, url, timestamp, method='GET', redirect_response=None, resource_type='Document'):
+    params = {'requestId': request_id, 'request': {'url': url, 'method': method}, 'type': resource_type,
+              'timestamp': timestamp, 'wallTime': 1700000000 + timestamp}
+    if redirect_response:
+        params['redirectResponse'] = redirect_response
+    return {'method': 'Network.requestWillBeSent', 'params': params}
+
+
+def response(request_id, status, timing=None, mime='text/html'):
+    return {'method': 'Network.responseReceived', 'params': {
+        'requestId': request_id, 'response': {'status': status, 'mimeType': mime, 'protocol': 'h2', 'timing': timing}}}
+
+
+def finished(request_id, timestamp, size):
+    return {'method': 'Network.loadingFinished',
+            'params': {'requestId': request_id, 'timestamp': timestamp, 'encodedDataLength': size}}
+
+
+def test_build_entries_computes_phases_from_resource_timing():
+    entries = build_entries([request('1', 'https://tls.test/', 100.0), response('1', 200, TIMING),
+                             finished('1', 100.2, 5000)])
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry['status'] == 200 and entry['bytes'] == 5000 and entry['protocol'] == 'h2'
+    assert entry['time'] == 200.0
+    assert entry['timings'] == {'blocked': 1.0, 'dns': 10.0, 'connect': 40.0, 'ssl': 30.0,
+                                'send': 1.0, 'wait': 100.0, 'receive': 47.0}
+    assert not any(key.startswith('_') for key in entry)
+
+
+def test_redirects_become_separate_hops():
+    events = [
+        request('1', 'http://tls.test/', 100.0),
+        request('1', 'https://tls.test/', 100.05,
+                redirect_response={'status': 301, 'mimeType': '', 'encodedDataLength': 120}),
+        response('1', 200),
+        finished('1', 100.15, 800),
+    ]
+    entries = build_entries(events)
+    assert [(entry['url'], entry['status']) for entry in entries] == [('http://tls.test/', 301),
+                                                                       ('https://tls.test/', 200)]
+    assert entries[0]['time'] == 50.0
+    assert entries[0]['bytes'] == 120
+    # Without ResourceTiming the whole duration counts as wait
+    assert entries[1]['timings']['wait'] == 100.0 and entries[1]['timings']['dns'] == -1
+
+
+def test_failed_and_unfinished_requests():
+    events = [
+        request('1', 'https://tls.test/app.js', 100.0, resource_type='Script'),
+        {'method': 'Network.loadingFailed', 'params': {'requestId': '1', 'timestamp': 100.3, 'errorText': 'net::ERR_ABORTED'}},
+        request('2', 'https://tls.test/never', 100.1),  # No loadingFinished: not an entry
+        finished('3', 100.2, 10),  # Unknown request: ignored
+    ]
+    entries = build_entries(events)
+    assert len(entries) == 1
+    assert entries[0]['error'] == 'net::ERR_ABORTED' and entries[0]['time'] == 300.0
+
+
+def test_summarize_totals_and_rankings():
+    events = [request('1', 'https://tls.test/', 100.0), response('1', 200, TIMING), finished('1', 100.2, 5000),
+              request('2', 'https://tls.test/a.js', 100.1, resource_type='Script'), response('2', 404),
+              finished('2', 100.15, 300)]
+    summary = summarize(build_entries(events), top_n=1)
+    assert summary['requests'] == 2
+    assert summary['failed'] == 1
+    assert summary['total_bytes'] == 5300
+    assert summary['bytes_by_type'] == {'Document': 5000, 'Script': 300}
+    assert set(summary['phases_ms']) == set(PHASES)
+    assert summary['phases_ms']['dns'] == 10.0
+    assert [item['url'] for item in summary['slowest']] == ['https://tls.test/']
+    assert len(summary['largest']) == 1
+
+
+def test_to_har_is_valid_and_carries_no_headers():
+    entries = build_entries([request('1', 'https://tls.test/login', 100.0, method='POST'),
+                             response('1', 302, TIMING), finished('1', 100.2, 50)])
+    har = to_har(entries, title='cycle 1')
+    log = har['log']
+    assert log['version'] == '1.2'
+    assert log['pages'][0]['title'] == 'cycle 1'
+    (entry,) = log['entries']
+    assert entry['request']['method'] == 'POST'
+    assert entry['request']['headers'] == [] and entry['request']['cookies'] == []
+    assert entry['response']['headers'] == [] and entry['response']['cookies'] == []
+    assert entry['response']['status'] == 302
+    assert entry['timings'] == entries[0]['timings']
+    assert entry['startedDateTime'] == entries[0]['started']
+
+
+def test_to_har_without_entries():
+    log = to_har([])['log']
+    assert log['entries'] == [] and log['pages'][0]['startedDateTime']
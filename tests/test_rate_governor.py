@@ -0,0 +1,26 @@
+import pytest
+
+from services.rate_governor import THROTTLE_PROBE_JS, ThrottledError, classify_throttle
+
+
+@pytest.mark.parametrize('probe_text, expected', [
+    ('Book an appointment\n\nThis site is protected by reCAPTCHA and the Google Privacy Policy', None),
+    ('Book an appointment\ncaptcha challenge shown\nPlease continue', 'captcha'),
+    ('Just a moment...\n\nChecking your browser before accessing', 'captcha'),
+    ('429 Too Many Requests\n\n', '429'),
+    ('Access Denied\n\nYou do not have permission', '403'),
+    ('', None),
+])
+def test_classify_throttle(probe_text, expected):
+    assert classify_throttle(probe_text) == expected
+
+
+def test_probe_ignores_invisible_recaptcha_frames():
+    # The badge ('anchor') iframe is never a challenge; the challenge frame must also be shown at a real size
+    assert "iframe[src*='captcha']" not in THROTTLE_PROBE_JS
+    assert "/recaptcha/api2/bframe" in THROTTLE_PROBE_JS and 'getBoundingClientRect' in THROTTLE_PROBE_JS
+
+
+def test_throttled_error_keeps_the_signal():
+    error = ThrottledError('429')
+    assert error.signal == '429' and str(error) == "Throttled by site (429)"
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from services import temp_janitor
+from services.temp_janitor import TempJanitor
+
+DEAD_PID = 2 ** 22 + 12345  # Above the default pid_max, so never a live process
+
+
+def make_artifact(directory, name, size=1000, age_seconds=3600):
+    path = os.path.join(directory, name)
+    os.makedirs(path)
+    with open(os.path.join(path, 'Preferences'), 'wb') as f:
+        f.write(b'x' * size)
+    old = time.time() - age_seconds
+    os.utime(path, (old, old))
+    return path
+
+
+@pytest.fixture
+def temp_dir(tmp_path):
+    directory = tmp_path / 'tmp'
+    directory.mkdir()
+    return str(directory)
+
+
+def janitor_for(temp_dir, budget_bytes=0):
+    return TempJanitor(budget_bytes=budget_bytes, min_age_seconds=600, temp_dirs=[temp_dir], downloads_dir=None)
+
+
+def test_orphans_are_removed_oldest_first_until_under_budget(temp_dir):
+    oldest = make_artifact(temp_dir, f'chrome_user_data_1_{DEAD_PID}_aaaa', age_seconds=7200)
+    newer = make_artifact(temp_dir, f'chrome_user_data_2_{DEAD_PID}_bbbb', age_seconds=3600)
+    report = janitor_for(temp_dir, budget_bytes=1500).sweep()
+
+    assert [item['path'] for item in report['reclaimed']] == [oldest]
+    assert not os.path.exists(oldest) and os.path.exists(newer)
+    assert report['remaining_bytes'] <= 1500
+
+
+def test_young_artifacts_and_unrelated_files_are_left_alone(temp_dir):
+    young = make_artifact(temp_dir, f'chrome_user_data_1_{DEAD_PID}_aaaa', age_seconds=10)
+    unrelated = make_artifact(temp_dir, 'something_else')
+    report = janitor_for(temp_dir).sweep()
+    assert report['reclaimed'] == []
+    assert os.path.exists(young) and os.path.exists(unrelated)
+
+
+def test_profile_of_a_live_process_is_kept(temp_dir):
+    profile = make_artifact(temp_dir, f'chrome_user_data_1_{DEAD_PID}_aaaa')
+    owner = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', f'--user-data-dir={profile}'])
+    try:
+        report = janitor_for(temp_dir).sweep()
+    finally:
+        owner.kill()
+        owner.wait()
+    assert report['reclaimed'] == [] and os.path.exists(profile)
+
+
+def test_singleton_lock_of_a_live_process_keeps_the_profile(temp_dir):
+    profile = make_artifact(temp_dir, f'chrome_user_data_1_{DEAD_PID}_aaaa')
+    os.symlink(f'host-{os.getpid()}', os.path.join(profile, 'SingletonLock'))
+    assert janitor_for(temp_dir).sweep()['reclaimed'] == []
+
+
+class TestWithoutPsutil:
+    @pytest.fixture(autouse=True)
+    def no_psutil(self, monkeypatch):
+        monkeypatch.setattr(temp_janitor, 'PSUTIL_AVAILABLE', False)
+
+    def test_owner_pid_in_the_name_decides(self, temp_dir):
+        live = make_artifact(temp_dir, f'chrome_user_data_1_{os.getpid()}_aaaa')
+        live_shared = make_artifact(temp_dir, f'chrome_shared_{os.getpid()}_x_y')
+        dead = make_artifact(temp_dir, f'chrome_user_data_1_{DEAD_PID}_bbbb')
+        dead_shared = make_artifact(temp_dir, f'chrome_shared_{DEAD_PID}_zz')
+        report = janitor_for(temp_dir).sweep()
+
+        assert sorted(item['path'] for item in report['reclaimed']) == sorted([dead, dead_shared])
+        assert os.path.exists(live) and os.path.exists(live_shared)
+
+    def test_profiles_without_an_owner_pid_and_scratch_dirs_are_kept(self, temp_dir):
+        legacy_shared = make_artifact(temp_dir, 'chrome_shared_abc123')
+        scratch = make_artifact(temp_dir, '.com.google.Chrome.XyZ')
+        assert janitor_for(temp_dir).sweep()['reclaimed'] == []
+        assert os.path.exists(legacy_shared) and os.path.exists(scratch)
@@ -0,0 +1,202 @@
+"""
+Slot Detector Backtester
+Replays saved calendar pages through the detection rules in a process pool
+
+The baseline verdict for each page comes from, in order: a labels file,
+the verdict recorded by the live monitor in the capture store, or the
+current production rules. The candidate verdict uses the rules under test.
+
+Usage:
+    python -m tools.backtest_detector --capture-store captures --text "no slots are currently available"
+    python -m tools.backtest_detector --corpus pages/ --labels labels.json --rules candidate.json
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.slot_detection import classify_page, NO_APPOINTMENT_TEXTS
+
+PAGE_EXTENSIONS = ('.html', '.htm', '.html.gz', '.htm.gz')
+
+# Candidate rules for the current worker process (set by the pool initializer)
+_candidate_texts = None
+
+
+def _init_worker(candidate_texts: List[str]):
+    global _candidate_texts
+    _candidate_texts = candidate_texts
+
+
+def _page_key(path: str, root: str) -> str:
+    """Key a page by its path relative to the corpus root"""
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def _strip_extension(name: str) -> str:
+    for extension in PAGE_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+
+def load_page(path: str) -> str:
+    """Read a saved page, transparently decompressing .gz files"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def classify_file(path: str) -> Tuple[str, str, Optional[str]]:
+    """Classify one page with the production and candidate rules (runs in a pool worker)"""
+    try:
+        html = load_page(path)
+    except OSError as e:
+        return path, 'error', str(e)
+    production, _ = classify_page(html)
+    candidate, _ = classify_page(html, _candidate_texts)
+    return path, production, candidate
+
+
+def find_pages(root: str) -> List[str]:
+    """Recursively collect saved pages under a directory"""
+    pages = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(PAGE_EXTENSIONS):
+                pages.append(os.path.join(directory, name))
+    pages.sort()
+    return pages
+
+
+def _cycle_records(store_dir: str):
+    cycles_path = os.path.join(store_dir, 'cycles.jsonl')
+    if not os.path.exists(cycles_path):
+        return
+    with open(cycles_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def load_capture_labels(store_dir: str) -> Dict[str, str]:
+    """Use the verdicts the live monitor recorded for each snapshot hash"""
+    labels = {}
+    for record in _cycle_records(store_dir):
+        for snapshot in record.get('snapshots', []):
+            if snapshot.get('hash') and snapshot.get('verdict'):
+                labels[snapshot['hash']] = snapshot['verdict']
+    return labels
+
+
+def load_waterfall_hashes(store_dir: str) -> Set[str]:
+    """Hashes of recorded network waterfalls (older stores kept them among the page snapshots)"""
+    return {record['network']['waterfall_hash'] for record in _cycle_records(store_dir)
+            if (record.get('network') or {}).get('waterfall_hash')}
+
+
+def run_backtest(pages: List[str], root: str, candidate_texts: List[str], labels: Dict[str, str],
+                 jobs: int = None, max_changes: int = 100) -> Dict:
+    """Classify all pages in parallel and compare candidate verdicts with the baseline"""
+    jobs = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(pages) // (jobs * 8))
+
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(candidate_texts,)) as executor:
+        results = list(executor.map(classify_file, pages, chunksize=chunksize))
+    elapsed = time.monotonic() - started
+
+    baseline_counts = Counter()
+    candidate_counts = Counter()
+    baseline_sources = Counter()
+    changes = []
+    errors = []
+
+    for path, production, candidate in results:
+        key = _page_key(path, root)
+        if production == 'error':
+            errors.append({'page': key, 'error': candidate})
+            continue
+
+        label = labels.get(key) or labels.get(_strip_extension(os.path.basename(key)))
+        baseline = label or production
+        baseline_sources['labels' if label else 'production_rules'] += 1
+
+        baseline_counts[baseline] += 1
+        candidate_counts[candidate] += 1
+        if baseline != candidate:
+            changes.append({'page': key, 'baseline': baseline, 'candidate': candidate})
+
+    classified = len(results) - len(errors)
+    return {
+        'pages': len(results),
+        'classified': classified,
+        'errors': errors,
+        'jobs': jobs,
+        'elapsed_seconds': round(elapsed, 3),
+        'pages_per_second': round(classified / elapsed, 1) if elapsed > 0 else None,
+        'candidate_rules': {'no_appointment_texts': candidate_texts},
+        'baseline_sources': dict(baseline_sources),
+        'verdict_counts': {'baseline': dict(baseline_counts), 'candidate': dict(candidate_counts)},
+        'changed': len(changes),
+        'changes': changes[:max_changes]
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backtest slot detection rules against saved pages")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--corpus', help="Directory of saved .html/.htm(.gz) pages")
+    source.add_argument('--capture-store', help="Capture store directory (uses its recorded verdicts as labels)")
+    parser.add_argument('--labels', help="JSON file mapping page path or hash to its expected verdict")
+    parser.add_argument('--rules', help="JSON file with the candidate {\"no_appointment_texts\": [...]}")
+    parser.add_argument('--text', action='append', help="Candidate no-appointment text (repeatable; replaces the list)")
+    parser.add_argument('--jobs', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--max-changes', type=int, default=100, help="Verdict changes to list in the report")
+    parser.add_argument('--fail-on-change', action='store_true', help="Exit with status 1 if any verdict changes")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    candidate_texts = list(NO_APPOINTMENT_TEXTS)
+    if args.rules:
+        with open(args.rules, 'r', encoding='utf-8') as f:
+            candidate_texts = json.load(f).get('no_appointment_texts', candidate_texts)
+    if args.text:
+        candidate_texts = args.text
+
+    root = args.corpus or os.path.join(args.capture_store, 'objects')
+    labels = load_capture_labels(args.capture_store) if args.capture_store else {}
+    if args.labels:
+        with open(args.labels, 'r', encoding='utf-8') as f:
+            labels.update(json.load(f))
+
+    pages = find_pages(root)
+    if args.capture_store:
+        waterfalls = load_waterfall_hashes(args.capture_store)
+        pages = [page for page in pages if _strip_extension(os.path.basename(page)) not in waterfalls]
+    if not pages:
+        print(f"No pages found under {root}", file=sys.stderr)
+        return 2
+
+    report = run_backtest(pages, root, candidate_texts, labels, args.jobs, args.max_changes)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return 1 if args.fail_on_change and report['changed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Browser Backend Benchmark
+Runs real check cycles on each browser backend and compares cycle latency and memory
+
+Usage:
+    python -m tools.benchmark_backends --backends selenium cdp --cycles 3
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import Dict, List
+
+from services.config_manager import ConfigManager
+from services.browser_backends import BACKEND_NAMES
+from services.tls_monitor import TLSWebMonitor
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def browser_tree_rss() -> int:
+    """Total RSS of all Chrome/chromedriver processes spawned by this process"""
+    if not PSUTIL_AVAILABLE:
+        return 0
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if 'chrome' in child.name().lower():
+                total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total
+
+
+def benchmark_backend(config: Dict, backend: str, cycles: int) -> Dict:
+    """Set up one backend, run `cycles` check cycles and collect timings"""
+    monitor = TLSWebMonitor(dict(config, browser_backend=backend))
+    result = {'backend': backend, 'cycles': [], 'error': None}
+
+    try:
+        started = time.monotonic()
+        monitor._setup_driver()
+        result['setup_seconds'] = round(time.monotonic() - started, 3)
+        result['resolved_backend'] = monitor.browser.name
+
+        for _ in range(cycles):
+            started = time.monotonic()
+            success = monitor.run_check_cycle()
+            result['cycles'].append({
+                'success': success,
+                'seconds': round(time.monotonic() - started, 3),
+                'browser_rss_bytes': browser_tree_rss()
+            })
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        monitor.force_stop()
+
+    durations = [c['seconds'] for c in result['cycles']]
+    memory = [c['browser_rss_bytes'] for c in result['cycles']]
+    if durations:
+        result['summary'] = {
+            'mean_seconds': round(statistics.mean(durations), 3),
+            'median_seconds': round(statistics.median(durations), 3),
+            'max_seconds': max(durations),
+            'peak_browser_rss_bytes': max(memory),
+            'success_rate': sum(1 for c in result['cycles'] if c['success']) / len(durations)
+        }
+    return result
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare browser backends by check cycle latency and memory")
+    parser.add_argument('--backends', nargs='+', default=['selenium', 'cdp'], choices=BACKEND_NAMES)
+    parser.add_argument('--cycles', type=int, default=3, help="Check cycles per backend")
+    parser.add_argument('--config', default='config.json', help="Config file with TLS credentials")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager(args.config).get_config()
+    is_valid, error_message = ConfigManager(args.config).validate_config(config)
+    if not is_valid:
+        print(f"Invalid configuration: {error_message}", file=sys.stderr)
+        return 2
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'cycles_per_backend': args.cycles,
+        'results': [benchmark_backend(config, backend, args.cycles) for backend in args.backends]
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Dashboard Load Test
+Opens N Socket.IO clients against a local dashboard server driven by a synthetic monitor
+
+The server (tools.loadtest_server) is started as a subprocess so its CPU and
+memory can be sampled separately. Once every client is connected it emits
+log and status events at the requested rate; each event carries a sequence
+number and its send time, so the clients measure end-to-end latency and
+count missing and late deliveries. The JSON report can be compared across
+changes, and --max-p99-ms / --max-drop-rate turn it into a pass/fail check.
+
+Usage:
+    python -m tools.loadtest_dashboard --clients 200 --rate 20 --duration 30
+    python -m tools.loadtest_dashboard --clients 50 --mode legacy --output report.json --max-p99-ms 250
+"""
+
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+from typing import Dict, List
+
+import socketio
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def percentile(values: List[float], fraction: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class LoadClient:
+    """One dashboard client that records the sequence numbers and latency of what it receives"""
+
+    def __init__(self, url: str, mode: str, transport: str):
+        self.url = url
+        self.mode = mode
+        self.transports = ['websocket'] if transport == 'websocket' else ['polling']
+        self.client = socketio.Client(reconnection=False)
+        self.received = {}  # seq -> latency in ms
+        self.duplicates = 0
+        self.connect_ms = None
+        self.error = None
+        self.subscribed = threading.Event()
+        self.done = threading.Event()
+        self.sent = None
+
+        self.client.on('log_message', self._on_event)
+        self.client.on('status_update', self._on_event)
+        self.client.on('events_subscribed', lambda data: self.subscribed.set())
+        self.client.on('loadtest_done', self._on_done)
+
+    def _on_event(self, data):
+        received_at = time.time()
+        if not isinstance(data, dict) or 'seq' not in data:
+            return  # Real events (initial status etc.), not part of the load
+        if data['seq'] in self.received:
+            self.duplicates += 1
+            return
+        self.received[data['seq']] = (received_at - data['sent_at']) * 1000
+
+    def _on_done(self, data):
+        self.sent = data['sent']
+        self.done.set()
+
+    def connect(self, timeout: float):
+        started = time.monotonic()
+        try:
+            self.client.connect(self.url, transports=self.transports, wait_timeout=timeout)
+            if self.mode == 'feed':
+                self.client.emit('subscribe_events', {
+                    'monitor_ids': ['default'], 'kinds': ['log', 'status', 'other'],
+                    'min_level': 'info', 'important_only': True, 'compact': True
+                })
+                if not self.subscribed.wait(timeout):
+                    raise TimeoutError("no events_subscribed acknowledgement")
+            self.connect_ms = (time.monotonic() - started) * 1000
+        except Exception as e:
+            self.error = str(e)
+
+    def close(self):
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+
+
+class ProcessSampler:
+    """Samples a process's CPU and RSS in the background"""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.samples = []
+        self._stop = threading.Event()
+        self._process = psutil.Process(pid) if PSUTIL_AVAILABLE else None
+        self._interval = interval
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def start(self):
+        if self._process:
+            self._process.cpu_percent(None)
+            self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self._interval):
+            try:
+                self.samples.append((self._process.cpu_percent(None), self._process.memory_info().rss))
+            except psutil.Error:
+                return
+
+    def stop(self) -> Dict:
+        self._stop.set()
+        if not self.samples:
+            return {'available': PSUTIL_AVAILABLE}
+        cpu = [sample[0] for sample in self.samples]
+        rss = [sample[1] for sample in self.samples]
+        return {
+            'available': True,
+            'cpu_percent_mean': round(sum(cpu) / len(cpu), 1),
+            'cpu_percent_max': max(cpu),
+            'rss_bytes_start': rss[0],
+            'rss_bytes_max': max(rss)
+        }
+
+
+def wait_for_server(port: int, process: subprocess.Popen, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server did not listen on port {port} within {timeout}s")
+
+
+def run_load_test(args) -> Dict:
+    port = args.port or free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen([
+        sys.executable, '-m', 'tools.loadtest_server', '--port', str(port), '--rate', str(args.rate),
+        '--duration', str(args.duration), '--status-every', str(args.status_every)
+    ], stdout=subprocess.DEVNULL if not args.server_output else None, stderr=subprocess.STDOUT)
+
+    clients = []
+    sampler = None
+    try:
+        wait_for_server(port, server, args.startup_timeout)
+        sampler = ProcessSampler(server.pid)
+        sampler.start()
+
+        # Connect in batches so the connect burst itself does not dominate the measurement
+        clients = [LoadClient(url, args.mode, args.transport) for _ in range(args.clients)]
+        for start in range(0, len(clients), args.connect_batch):
+            batch = clients[start:start + args.connect_batch]
+            threads = [threading.Thread(target=client.connect, args=(args.connect_timeout,)) for client in batch]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        connected = [client for client in clients if client.error is None]
+        if not connected:
+            raise RuntimeError(f"No client could connect: {clients[0].error if clients else 'no clients'}")
+
+        started = time.monotonic()
+        connected[0].client.emit('loadtest_start', {})
+        for client in connected:
+            client.done.wait(timeout=max(0.0, args.duration + args.drain_timeout - (time.monotonic() - started)))
+        time.sleep(args.late_ms / 1000)  # Let in-flight deliveries land
+        server_stats = sampler.stop()
+    finally:
+        for client in clients:
+            client.close()
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    sent = next((client.sent for client in connected if client.sent is not None), int(args.rate * args.duration))
+    latencies = [latency for client in connected for latency in client.received.values()]
+    received = sum(len(client.received) for client in connected)
+    expected = sent * len(connected)
+    connect_times = [client.connect_ms for client in connected]
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'parameters': {
+            'clients': args.clients, 'mode': args.mode, 'transport': args.transport,
+            'rate_per_second': args.rate, 'duration_seconds': args.duration, 'late_ms': args.late_ms
+        },
+        'clients': {
+            'connected': len(connected),
+            'failed': len(clients) - len(connected),
+            'errors': sorted({client.error for client in clients if client.error})[:5],
+            'connect_ms_p50': percentile(connect_times, 0.5),
+            'connect_ms_p99': percentile(connect_times, 0.99)
+        },
+        'events': {
+            'sent': sent,
+            'expected_deliveries': expected,
+            'received': received,
+            'dropped': expected - received,
+            'drop_rate': round((expected - received) / expected, 4) if expected else 0,
+            'late': sum(1 for latency in latencies if latency > args.late_ms),
+            'duplicates': sum(client.duplicates for client in connected),
+            'clients_incomplete': sum(1 for client in connected if len(client.received) < sent)
+        },
+        'latency_ms': {
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': round(max(latencies), 2) if latencies else None
+        },
+        'server': server_stats
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test dashboard event fan-out with N Socket.IO clients")
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--mode', choices=['feed', 'legacy'], default='feed',
+                        help="feed: subscribe_events with compact encoding; legacy: plain broadcast room")
+    parser.add_argument('--transport', choices=['websocket', 'polling'], default='websocket')
+    parser.add_argument('--rate', type=float, default=20, help="Synthetic events per second")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of emission")
+    parser.add_argument('--status-every', type=int, default=5, help="Every Nth event is a status update (0 = never)")
+    parser.add_argument('--late-ms', type=float, default=500, help="Deliveries slower than this count as late")
+    parser.add_argument('--port', type=int, default=0, help="Server port (default: a free port)")
+    parser.add_argument('--connect-batch', type=int, default=25)
+    parser.add_argument('--connect-timeout', type=float, default=15)
+    parser.add_argument('--startup-timeout', type=float, default=60)
+    parser.add_argument('--drain-timeout', type=float, default=15)
+    parser.add_argument('--server-output', action='store_true', help="Show the server's console output")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--max-p99-ms', type=float, help="Exit 1 if p99 latency exceeds this")
+    parser.add_argument('--max-drop-rate', type=float, help="Exit 1 if the drop rate exceeds this (0-1)")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args)
+    failures = []
+    if args.max_p99_ms is not None and (report['latency_ms']['p99'] or 0) > args.max_p99_ms:
+        failures.append(f"p99 latency {report['latency_ms']['p99']}ms > {args.max_p99_ms}ms")
+    if args.max_drop_rate is not None and report['events']['drop_rate'] > args.max_drop_rate:
+        failures.append(f"drop rate {report['events']['drop_rate']} > {args.max_drop_rate}")
+    report['failures'] = failures
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
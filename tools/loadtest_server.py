@@ -0,0 +1,71 @@
+"""
+Dashboard Load-Test Server
+Runs the real dashboard server with a synthetic monitor that emits events at a fixed rate
+
+Started by tools.loadtest_dashboard; not meant to be run on its own.
+Importing app first applies the eventlet monkey patch exactly as in production.
+
+Usage:
+    python -m tools.loadtest_server --port 5055 --rate 20 --duration 30
+"""
+
+import os
+os.environ.setdefault('PORT', '5055')  # app.py picks eventlet when PORT is set, as in production
+
+import app as dashboard  # noqa: E402  (must be imported before anything else uses threads or sockets)
+
+import time  # noqa: E402
+import argparse  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+from services.monitor_registry import MonitorEmitter, DEFAULT_MONITOR_ID  # noqa: E402
+
+socketio = dashboard.socketio
+
+
+def synthetic_monitor(rate: float, duration: float, status_every: int):
+    """Emit `rate` events per second for `duration` seconds through the monitor emission path"""
+    emitter = MonitorEmitter(socketio, DEFAULT_MONITOR_ID)
+    interval = 1.0 / rate
+    total = int(rate * duration)
+    started = time.monotonic()
+
+    for seq in range(total):
+        # Pace against the start time so slow emits do not silently lower the rate
+        delay = started + seq * interval - time.monotonic()
+        if delay > 0:
+            socketio.sleep(delay)
+        if status_every and seq % status_every == status_every - 1:
+            emitter.emit('status_update', {
+                'is_running': True, 'last_check': datetime.now().isoformat(),
+                'total_checks': seq, 'error_count': 0, 'seq': seq, 'sent_at': time.time()
+            })
+        else:
+            emitter.emit('log_message', {
+                'timestamp': datetime.now().isoformat(), 'level': 'info',
+                'message': f"🔍 CHECK #{seq} COMPLETED - synthetic load", 'seq': seq, 'sent_at': time.time()
+            })
+
+    socketio.emit('loadtest_done', {'sent': total, 'seconds': round(time.monotonic() - started, 3)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard server with a synthetic event source")
+    parser.add_argument('--port', type=int, default=int(os.environ['PORT']))
+    parser.add_argument('--rate', type=float, default=20, help="Events per second")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of emission")
+    parser.add_argument('--status-every', type=int, default=5, help="Every Nth event is a status update (0 = never)")
+    args = parser.parse_args()
+
+    @socketio.on('loadtest_start')
+    def handle_loadtest_start(data=None):
+        """The harness starts emission once all of its clients are connected"""
+        socketio.start_background_task(synthetic_monitor, args.rate, args.duration, args.status_every)
+
+    print(f"[LOADTEST] Server listening on port {args.port}")
+    socketio.run(dashboard.app, host='127.0.0.1', port=args.port, debug=False,
+                 use_reloader=False, log_output=False, allow_unsafe_werkzeug=True)
+
+
+if __name__ == '__main__':
+    main()